@@ -63,6 +63,8 @@ setup(
         "full": [
             "pyyaml>=6.0",
             "anthropic>=0.18.0",
+            "orjson>=3.8.0",     # Schnellere JSON-Serialisierung (optional)
+            "rapidfuzz>=3.0.0",  # C-beschleunigte Levenshtein-Distanz (optional)
         ],
         "minimal": [
             # Ohne aiofiles - funktioniert mit sync fallback
@@ -71,6 +73,8 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.0.0",
+            "pytest-benchmark>=4.0.0",
             "mypy>=1.0.0",
             "black>=23.0.0",
             "ruff>=0.1.0",
@@ -13,12 +13,22 @@ See LICENSE file in the project root for full license information.
 import sys
 import json
 import hashlib
+import sqlite3
 import time
 import os
+import re
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 
+# Optional: orjson für schnelleres JSON-Parsen (Fallback: stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # CHAINGUARD Home
 CHAINGUARD_HOME = Path.home() / ".chainguard"
 MEMORY_HOME = CHAINGUARD_HOME / "memory"
@@ -29,13 +39,29 @@ CACHE_TTL = 300     # Cache results for 5 minutes
 MAX_RESULTS = 5     # Max memory results to inject
 MIN_RELEVANCE = 0.5 # Minimum relevance score
 
-# Simple file-based cache
-CACHE_FILE = CHAINGUARD_HOME / "memory_inject_cache.json"
+# SQLite cache (one row per key, no full-file rewrite per write)
+CACHE_FILE = CHAINGUARD_HOME / "memory_inject_cache.db"
+CACHE_MAX_ENTRIES = 100  # Prune down to half when exceeded
+# JSON-Cache früherer Versionen, wird beim Anlegen der DB gelöscht
+LEGACY_CACHE_FILE = CHAINGUARD_HOME / "memory_inject_cache.json"
+
+# Keyword extraction: words of 3+ chars, stop words (minimal set for speed)
+KEYWORD_PATTERN = re.compile(r'[a-zäöüß0-9]{3,}')
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'or',
+    'is', 'are', 'was', 'were', 'be', 'been', 'this', 'that', 'it',
+    'with', 'from', 'by', 'den', 'die', 'das', 'der', 'ein', 'eine',
+    'und', 'oder', 'für', 'mit', 'ich', 'du', 'bitte', 'kannst', 'can',
+    'you', 'please', 'help', 'me', 'want', 'need', 'would', 'like'
+})
 
 
 def get_project_id(working_dir: str) -> str:
     """
     Berechnet die Project ID (identisch mit MCP Server).
+
+    SHA-256 muss bleiben: die ID benennt das Memory-Verzeichnis, das der
+    Server anlegt. Ein anderer Hash würde bestehende Memories verwaisen.
     """
     import subprocess
 
@@ -68,79 +94,80 @@ def get_project_id(working_dir: str) -> str:
 
 def memory_exists(project_id: str) -> bool:
     """Prüft ob Memory für dieses Projekt existiert."""
-    memory_path = MEMORY_HOME / project_id
-    return memory_path.exists() and (memory_path / "chroma.sqlite3").exists()
-
+    # Ein stat() genügt: fehlt das Verzeichnis, fehlt auch die Datei
+    return (MEMORY_HOME / project_id / "chroma.sqlite3").is_file()
 
-def load_cache() -> Dict[str, Any]:
-    """Lädt den Cache."""
-    if not CACHE_FILE.exists():
-        return {}
-    try:
-        with open(CACHE_FILE) as f:
-            return json.load(f)
-    except Exception:
-        return {}
 
+def open_cache() -> sqlite3.Connection:
+    """
+    Öffnet die Cache-Datenbank zum Schreiben (Tabelle wird bei Bedarf angelegt).
 
-def save_cache(cache: Dict[str, Any]):
-    """Speichert den Cache."""
-    try:
+    Schema und PRAGMAs nur hier: der WAL-Wechsel braucht einen Schreib-Lock,
+    Lesezugriffe sollen nicht daran hängen bleiben.
+    """
+    created = not CACHE_FILE.exists()
+    if created:
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache, f)
-    except Exception:
-        pass
+    conn = sqlite3.connect(str(CACHE_FILE), timeout=1.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache ("
+        "key TEXT PRIMARY KEY, context TEXT NOT NULL, ts REAL NOT NULL)"
+    )
+    if created:
+        try:
+            LEGACY_CACHE_FILE.unlink()
+        except OSError:
+            pass
+    return conn
 
 
 def get_cached_context(cache_key: str) -> Optional[str]:
     """Holt gecachten Kontext wenn noch gültig."""
-    cache = load_cache()
-    entry = cache.get(cache_key)
-    if entry:
-        cached_at = entry.get("timestamp", 0)
-        if time.time() - cached_at < CACHE_TTL:
-            return entry.get("context")
-    return None
+    if not CACHE_FILE.exists():
+        return None
+    try:
+        # Einfache Verbindung: kein Setup, das einen Schreib-Lock braucht
+        with closing(sqlite3.connect(str(CACHE_FILE), timeout=1.0)) as conn:
+            row = conn.execute(
+                "SELECT context FROM cache WHERE key = ? AND ts > ?",
+                (cache_key, time.time() - CACHE_TTL)
+            ).fetchone()
+        return row[0] if row else None
+    except (sqlite3.Error, OSError):
+        return None
 
 
 def set_cached_context(cache_key: str, context: str):
     """Speichert Kontext im Cache."""
-    cache = load_cache()
-    # Limit cache size
-    if len(cache) > 100:
-        # Remove oldest entries
-        sorted_entries = sorted(cache.items(), key=lambda x: x[1].get("timestamp", 0))
-        cache = dict(sorted_entries[-50:])
-
-    cache[cache_key] = {
-        "context": context,
-        "timestamp": time.time()
-    }
-    save_cache(cache)
+    now = time.time()
+    try:
+        with closing(open_cache()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, context, ts) VALUES (?, ?, ?)",
+                (cache_key, context, now)
+            )
+            # Abgelaufene Einträge entfernen, Größe begrenzen
+            conn.execute("DELETE FROM cache WHERE ts <= ?", (now - CACHE_TTL,))
+            (count,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            if count > CACHE_MAX_ENTRIES:
+                conn.execute(
+                    "DELETE FROM cache WHERE key NOT IN "
+                    "(SELECT key FROM cache ORDER BY ts DESC LIMIT ?)",
+                    (CACHE_MAX_ENTRIES // 2,)
+                )
+    except (sqlite3.Error, OSError):
+        pass
 
 
 def extract_keywords(text: str) -> List[str]:
     """Extrahiert Keywords aus dem Prompt (lightweight Version)."""
-    import re
-
-    # Normalize
-    text = text.lower()
-    text = re.sub(r'[^a-zäöüß0-9\s]', ' ', text)
-
-    # Stop words (minimal set for speed)
-    stop_words = {
-        'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'or',
-        'is', 'are', 'was', 'were', 'be', 'been', 'this', 'that', 'it',
-        'with', 'from', 'by', 'den', 'die', 'das', 'der', 'ein', 'eine',
-        'und', 'oder', 'für', 'mit', 'ich', 'du', 'bitte', 'kannst', 'can',
-        'you', 'please', 'help', 'me', 'want', 'need', 'would', 'like'
-    }
+    tokens = KEYWORD_PATTERN.findall(text.lower())
+    # dict.fromkeys: Duplikate entfernen, Reihenfolge behalten
+    keywords = [w for w in dict.fromkeys(tokens) if w not in STOP_WORDS]
 
-    words = text.split()
-    keywords = [w for w in words if w not in stop_words and len(w) > 2]
-
-    return list(set(keywords))[:10]  # Max 10 keywords
+    return keywords[:10]  # Max 10 keywords
 
 
 def query_memory_sync(project_id: str, query_text: str) -> List[Dict[str, Any]]:
@@ -257,6 +284,20 @@ def format_context(results: List[Dict[str, Any]], prompt_preview: str) -> str:
     return "\n".join(lines)
 
 
+def parse_hook_input(raw_input: str) -> Dict[str, Any]:
+    """Parst den Hook-Input (JSON von stdin), {} bei ungültigem Input."""
+    if not raw_input.strip():
+        return {}
+    try:
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(raw_input)
+        else:
+            data = json.loads(raw_input)
+    except json.JSONDecodeError:  # orjson.JSONDecodeError ist Subklasse
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 def main():
     """Hauptfunktion - Memory Injection Hook."""
     start_time = time.time()
@@ -264,12 +305,7 @@ def main():
     # Hook-Input von stdin lesen
     hook_input = {}
     if not sys.stdin.isatty():
-        try:
-            raw_input = sys.stdin.read()
-            if raw_input.strip():
-                hook_input = json.loads(raw_input)
-        except json.JSONDecodeError:
-            pass
+        hook_input = parse_hook_input(sys.stdin.read())
 
     # Extrahiere relevante Daten
     prompt = hook_input.get("prompt", "")
@@ -120,6 +120,7 @@ from .toon import (
     toon_criteria,
     toon_alerts,
     compare_formats,
+    compare_formats_many,
 )
 
 # XML Response System (v6.0)
@@ -172,7 +173,8 @@ from .symbol_patterns import (
 from .package_validator import (
     PackageValidator, PackageIssue, PackageValidationResult,
     ImportExtractor, PackageRegistry,
-    levenshtein_distance, find_similar_packages, format_package_report,
+    levenshtein_distance, typo_distance, weighted_typo_distance,
+    find_similar_packages, format_package_report,
     PYTHON_STDLIB, NODE_BUILTINS, PHP_BUILTINS
 )
 
@@ -323,6 +325,7 @@ __all__ = [
     "toon_criteria",
     "toon_alerts",
     "compare_formats",
+    "compare_formats_many",
 
     # XML Response System (v6.0)
     "XMLResponse",
@@ -458,6 +461,8 @@ __all__ = [
     "ImportExtractor",
     "PackageRegistry",
     "levenshtein_distance",
+    "typo_distance",
+    "weighted_typo_distance",
     "find_similar_packages",
     "format_package_report",
     "PYTHON_STDLIB",
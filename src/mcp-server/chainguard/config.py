@@ -9,13 +9,16 @@ See LICENSE file in the project root for full license information.
 """
 
 import os
+import sys
 import json
 import logging
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
 from enum import Enum
-from typing import Dict, Set, Union, List, Any
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Union, List, Any
 
 
 # =============================================================================
@@ -115,20 +118,30 @@ class TaskMode(str, Enum):
     @classmethod
     def from_string(cls, value: str) -> "TaskMode":
         """Safe conversion from string, defaults to PROGRAMMING."""
-        try:
-            return cls(value.lower())
-        except ValueError:
-            return cls.PROGRAMMING
+        mode = _TASK_MODES_BY_VALUE.get(value)
+        if mode is None:
+            mode = _TASK_MODES_BY_VALUE.get(value.lower(), cls.PROGRAMMING)
+        return mode
 
 
-@dataclass
+# Value -> member table for from_string(); stored modes are already lowercase,
+# so the common case is a single dict hit without Enum construction
+_TASK_MODES_BY_VALUE: Dict[str, TaskMode] = {mode.value: mode for mode in TaskMode}
+
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ModeFeatures:
     """
     Feature flags per task mode.
     Controls which validations and features are active.
+    Instances are shared through TASK_MODE_CONFIG, hence frozen.
     """
     # Core features
-    syntax_validation: Union[bool, Set[str]] = True  # True, False, or Set of extensions
+    syntax_validation: Union[bool, FrozenSet[str]] = True  # True, False, or set of extensions
     db_inspection: bool = True
     http_testing: bool = True
     code_analysis: bool = True
@@ -150,8 +163,8 @@ class ModeFeatures:
     fact_indexing: bool = False
 
 
-# Task Mode Configuration
-TASK_MODE_CONFIG: Dict[TaskMode, ModeFeatures] = {
+# Task Mode Configuration (read-only view)
+TASK_MODE_CONFIG: Mapping[TaskMode, ModeFeatures] = MappingProxyType({
     TaskMode.PROGRAMMING: ModeFeatures(
         syntax_validation=True,
         db_inspection=True,
@@ -173,7 +186,7 @@ TASK_MODE_CONFIG: Dict[TaskMode, ModeFeatures] = {
         chapter_tracking=True,
     ),
     TaskMode.DEVOPS: ModeFeatures(
-        syntax_validation={".yaml", ".yml", ".json", ".conf", ".ini", ".toml", ".env"},
+        syntax_validation=frozenset({".yaml", ".yml", ".json", ".conf", ".ini", ".toml", ".env"}),
         db_inspection=False,
         http_testing=True,  # For health checks
         code_analysis=False,
@@ -204,11 +217,11 @@ TASK_MODE_CONFIG: Dict[TaskMode, ModeFeatures] = {
         scope_enforcement=False,
         file_tracking=True,
     ),
-}
+})
 
 
 # Context Injection Templates per Mode
-TASK_MODE_CONTEXT: Dict[TaskMode, str] = {
+TASK_MODE_CONTEXT: Mapping[TaskMode, str] = MappingProxyType({
     TaskMode.PROGRAMMING: """
 ────────────────────────────────────────
 📋 **PROGRAMMING-MODUS - Pflicht-Aktionen:**
@@ -289,7 +302,7 @@ chainguard_index_fact(fact="GPT-4 hat 1.7T Parameter", confidence="verified")
 - `chainguard_finish()` zum Abschluss
 ────────────────────────────────────────
 """,
-}
+})
 
 
 # XML Context Templates (v6.0)
@@ -388,6 +401,56 @@ MODE_DETECTION_KEYWORDS: Dict[TaskMode, Set[str]] = {
 }
 
 
+def _detect_mode_from_keywords(description: str) -> Optional[TaskMode]:
+    """Keyword-based detection from a description, None without a hit."""
+    desc_lower = description.lower()
+
+    # Plain substring checks in a loop beat both any(<genexpr>) and a fused
+    # regex alternation for descriptions of this length (re has no
+    # multi-literal search).
+    for mode, keywords in MODE_DETECTION_KEYWORDS.items():
+        for kw in keywords:
+            if kw in desc_lower:
+                return mode
+    return None
+
+
+def _detect_mode_from_directory(working_dir: str) -> TaskMode:
+    """File-based detection from a working directory."""
+    if not working_dir:
+        return TaskMode.PROGRAMMING
+
+    path = Path(working_dir)
+
+    try:
+        # WordPress project?
+        if (path / "wp-config.php").exists() or (path / "wp-content").exists():
+            return TaskMode.DEVOPS
+
+        # Server config directory?
+        path_str = str(path).lower()
+        if any(p in path_str for p in ["/etc/nginx", "/etc/apache", "/var/www/html"]):
+            return TaskMode.DEVOPS
+
+        # Documentation/book project? Globs are consumed lazily and only
+        # as far as the thresholds need: the top-level code check is
+        # cheap, the recursive markdown walk only runs without code
+        # and stops at the sixth hit.
+        code_files = chain(path.glob("*.py"), path.glob("*.js"),
+                           path.glob("*.php"), path.glob("*.ts"))
+        if sum(1 for _ in islice(code_files, 3)) < 3:
+            md_files = chain(path.glob("*.md"), path.glob("**/*.md"))
+            # If mostly markdown files, likely content project
+            if sum(1 for _ in islice(md_files, 6)) > 5:
+                return TaskMode.CONTENT
+
+        # Code project with package manager (or no signal at all)
+        return TaskMode.PROGRAMMING
+
+    except (OSError, PermissionError):
+        return TaskMode.PROGRAMMING  # Ignore file system errors
+
+
 def detect_task_mode(description: str, working_dir: str = "") -> TaskMode:
     """
     Auto-detect task mode from description and working directory.
@@ -398,53 +461,34 @@ def detect_task_mode(description: str, working_dir: str = "") -> TaskMode:
 
     Returns: TaskMode (defaults to PROGRAMMING if uncertain)
     """
-    desc_lower = description.lower()
-
     # 1. Keyword-based detection from description
-    for mode, keywords in MODE_DETECTION_KEYWORDS.items():
-        if any(kw in desc_lower for kw in keywords):
-            return mode
+    mode = _detect_mode_from_keywords(description)
+    if mode is not None:
+        return mode
 
-    # 2. File-based detection from working directory
-    if working_dir:
-        path = Path(working_dir)
-
-        try:
-            # WordPress project?
-            if (path / "wp-config.php").exists() or (path / "wp-content").exists():
-                return TaskMode.DEVOPS
-
-            # Server config directory?
-            path_str = str(path).lower()
-            if any(p in path_str for p in ["/etc/nginx", "/etc/apache", "/var/www/html"]):
-                return TaskMode.DEVOPS
-
-            # Documentation/book project?
-            md_files = list(path.glob("*.md")) + list(path.glob("**/*.md"))
-            code_files = (list(path.glob("*.py")) + list(path.glob("*.js")) +
-                         list(path.glob("*.php")) + list(path.glob("*.ts")))
-
-            # If mostly markdown files, likely content project
-            if len(md_files) > 5 and len(code_files) < 3:
-                return TaskMode.CONTENT
+    # 2. File-based detection from working directory,
+    # 3. default to programming (most common use case)
+    return _detect_mode_from_directory(working_dir)
 
-            # Code project with package manager
-            if ((path / "package.json").exists() or
-                (path / "composer.json").exists() or
-                (path / "requirements.txt").exists() or
-                (path / "Cargo.toml").exists()):
-                return TaskMode.PROGRAMMING
 
-        except (OSError, PermissionError):
-            pass  # Ignore file system errors
+def detect_task_mode_batch(descriptions: Iterable[str], working_dir: str = "") -> List[TaskMode]:
+    """
+    detect_task_mode() for many descriptions in the same working directory.
 
-    # 3. Default to programming (most common use case)
-    return TaskMode.PROGRAMMING
+    The directory is inspected at most once and only if some description
+    has no keyword hit, instead of re-globbing it per description.
+    """
+    modes = [_detect_mode_from_keywords(d) for d in descriptions]
+    if None in modes:
+        fallback = _detect_mode_from_directory(working_dir)
+        modes = [fallback if mode is None else mode for mode in modes]
+    return modes
 
 
 def get_mode_features(mode: TaskMode) -> ModeFeatures:
-    """Get feature flags for a given task mode."""
-    return TASK_MODE_CONFIG.get(mode, TASK_MODE_CONFIG[TaskMode.PROGRAMMING])
+    """Get feature flags for a given task mode (shared, frozen instances)."""
+    features = TASK_MODE_CONFIG.get(mode)
+    return features if features is not None else TASK_MODE_CONFIG[TaskMode.PROGRAMMING]
 
 
 def get_mode_context(mode: TaskMode) -> str:
@@ -452,6 +496,25 @@ def get_mode_context(mode: TaskMode) -> str:
     return TASK_MODE_CONTEXT.get(mode, TASK_MODE_CONTEXT[TaskMode.PROGRAMMING])
 
 
+# Status-line emoji per mode (legacy plain-text responses)
+TASK_MODE_EMOJI: Mapping[TaskMode, str] = MappingProxyType({
+    TaskMode.PROGRAMMING: "💻",
+    TaskMode.CONTENT: "📝",
+    TaskMode.DEVOPS: "🖥️",
+    TaskMode.RESEARCH: "🔬",
+    TaskMode.GENERIC: "⚡",
+})
+
+
+# Per-mode syntax validation, precomputed from TASK_MODE_CONFIG (which is
+# read-only): None validates every file, otherwise only these extensions
+_SYNTAX_EXTENSIONS: Mapping[TaskMode, Optional[FrozenSet[str]]] = MappingProxyType({
+    mode: None if features.syntax_validation is True
+    else frozenset(features.syntax_validation or ())
+    for mode, features in TASK_MODE_CONFIG.items()
+})
+
+
 def should_validate_syntax(mode: TaskMode, file_path: str) -> bool:
     """
     Check if syntax validation should run for a file in the given mode.
@@ -460,17 +523,11 @@ def should_validate_syntax(mode: TaskMode, file_path: str) -> bool:
     - Mode has syntax_validation=True (validate all)
     - Mode has syntax_validation as Set and file extension matches
     """
-    features = get_mode_features(mode)
-
-    if features.syntax_validation is True:
+    extensions = _SYNTAX_EXTENSIONS.get(mode, _SYNTAX_EXTENSIONS[TaskMode.PROGRAMMING])
+    if extensions is None:
         return True
-    elif features.syntax_validation is False:
-        return False
-    elif isinstance(features.syntax_validation, set):
-        ext = Path(file_path).suffix.lower()
-        return ext in features.syntax_validation
-
-    return False
+    # splitext matches Path.suffix without building a Path
+    return bool(extensions) and os.path.splitext(file_path)[1].lower() in extensions
 
 
 # =============================================================================
@@ -490,6 +547,7 @@ MAX_PROJECTS_IN_CACHE = 20
 DEBOUNCE_DELAY_SECONDS = 0.5
 GIT_CACHE_TTL_SECONDS = 300
 SYNTAX_CHECK_TIMEOUT_SECONDS = 10
+SYNTAX_CHECK_MAX_FILE_BYTES = 2 * 1024 * 1024  # Larger (generated) files are not validated
 HTTP_REQUEST_TIMEOUT_SECONDS = 10
 
 # Batch Limits
@@ -25,7 +25,7 @@ from .config import (
     MAX_CHANGED_FILES, MAX_BATCH_FILES, DESCRIPTION_PREVIEW_LENGTH,
     SCOPE_REQUIRED_TOOLS, SCOPE_BLOCKED_TEXT,
     TaskMode, detect_task_mode, get_mode_context, get_mode_features,
-    get_mode_context_xml,
+    get_mode_context_xml, TASK_MODE_EMOJI,
     should_validate_syntax,
     XML_RESPONSES_ENABLED,
     TOON_ENABLED,
@@ -327,13 +327,7 @@ async def handle_set_scope(args: Dict[str, Any]) -> List[TextContent]:
         ))
 
     # Legacy plain text response
-    mode_emoji = {
-        TaskMode.PROGRAMMING: "💻",
-        TaskMode.CONTENT: "📝",
-        TaskMode.DEVOPS: "🖥️",
-        TaskMode.RESEARCH: "🔬",
-        TaskMode.GENERIC: "⚡"
-    }.get(task_mode, "📋")
+    mode_emoji = TASK_MODE_EMOJI.get(task_mode, "📋")
 
     lines = [f"✓ Scope: {desc_preview}"]
     lines.append(f"{mode_emoji} **Mode: {task_mode}** ({mode_source})")
@@ -504,7 +498,7 @@ async def handle_track(args: Dict[str, Any]) -> List[TextContent]:
         SYMBOL_VALIDATION_AUTO and
         file and
         action != "delete" and
-        task_mode == TaskMode.PROGRAMMING and
+        task_mode is TaskMode.PROGRAMMING and
         SymbolValidator.get_mode() != SymbolValidationMode.OFF
     )
 
@@ -692,6 +686,14 @@ async def handle_track_batch(args: Dict[str, Any]) -> List[TextContent]:
             errors.append("   → Nutze: chainguard_db_connect() + chainguard_db_schema()")
             errors.append("")
 
+    # Validate the whole batch up front (one `php -l` call for all PHP files)
+    validations = {}
+    if not skip_validation and action != "delete":
+        validations = await SyntaxValidator.validate_files(
+            [f for f in files if f and is_path_safe(f, state.project_path)],
+            state.project_path
+        )
+
     for file in files:
         if file and not is_path_safe(file, state.project_path):
             errors.append(f"⚠ Invalid path: {Path(file).name}")
@@ -704,7 +706,7 @@ async def handle_track_batch(args: Dict[str, Any]) -> List[TextContent]:
             state.add_changed_file(Path(file).name)
 
         if file and not skip_validation and action != "delete":
-            validation = await SyntaxValidator.validate_file(file, state.project_path)
+            validation = validations[file]
             if not validation["valid"]:
                 for err in validation["errors"]:
                     errors.append(f"✗ {Path(file).name}: {err['type']} - {err['message'][:40]}")
@@ -2903,10 +2905,13 @@ async def handle_sources(args: Dict[str, Any]) -> List[TextContent]:
             ))
         return _text("📚 No sources tracked yet.\n\nUse: chainguard_add_source(url=\"...\")")
 
-    # Group by relevance
-    high = [s for s in state.sources if s.get("relevance") == "high"]
-    medium = [s for s in state.sources if s.get("relevance") == "medium"]
-    low = [s for s in state.sources if s.get("relevance") == "low"]
+    # Group by relevance in one pass over the sources
+    by_relevance = {"high": [], "medium": [], "low": []}
+    for s in state.sources:
+        group = by_relevance.get(s.get("relevance"))
+        if group is not None:
+            group.append(s)
+    high, medium, low = by_relevance["high"], by_relevance["medium"], by_relevance["low"]
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -2962,10 +2967,15 @@ async def handle_facts(args: Dict[str, Any]) -> List[TextContent]:
             ))
         return _text("🔬 No facts indexed yet.\n\nUse: chainguard_index_fact(fact=\"...\")")
 
-    # Group by confidence
-    verified = [f for f in state.facts if f.get("confidence") == "verified"]
-    likely = [f for f in state.facts if f.get("confidence") == "likely"]
-    uncertain = [f for f in state.facts if f.get("confidence") == "uncertain"]
+    # Group by confidence in one pass over the facts
+    by_confidence = {"verified": [], "likely": [], "uncertain": []}
+    for f in state.facts:
+        group = by_confidence.get(f.get("confidence"))
+        if group is not None:
+            group.append(f)
+    verified, likely, uncertain = (
+        by_confidence["verified"], by_confidence["likely"], by_confidence["uncertain"]
+    )
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -4542,6 +4552,7 @@ async def handle_memory_export(args: Dict[str, Any]) -> List[TextContent]:
     export_format = args.get("format", "json")
     collections = args.get("collections")
     include_embeddings = args.get("include_embeddings", False)
+    quantize_embeddings = args.get("quantize_embeddings", False)
     compress = args.get("compress", False)
 
     state = await pm.get_async(working_dir)
@@ -4577,6 +4588,7 @@ async def handle_memory_export(args: Dict[str, Any]) -> List[TextContent]:
             collections=collections,
             include_embeddings=include_embeddings,
             compress=compress,
+            quantize_embeddings=quantize_embeddings,
         )
     else:
         result = await memory_exporter.export_json(
@@ -4584,6 +4596,7 @@ async def handle_memory_export(args: Dict[str, Any]) -> List[TextContent]:
             collections=collections,
             include_embeddings=include_embeddings,
             compress=compress,
+            quantize_embeddings=quantize_embeddings,
         )
 
     if result.success:
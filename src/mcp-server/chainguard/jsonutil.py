@@ -0,0 +1,41 @@
+"""
+CHAINGUARD MCP Server - JSON Utilities Module
+
+Contains: JSON (de)serialization via orjson with stdlib json fallback
+
+Copyright (c) 2026 Provimedia GmbH
+Licensed under the Polyform Noncommercial License 1.0.0
+See LICENSE file in the project root for full license information.
+"""
+
+import json
+from typing import Any
+
+# Optional: orjson for faster JSON (fallback: stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson if available."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: Any) -> Any:
+    """
+    Deserialize JSON from str or bytes, using orjson if available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the same exceptions with either backend.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -21,9 +21,9 @@ Usage:
 
 import asyncio
 import hashlib
-import json
 import logging
 import subprocess
+import sys
 import time
 
 try:
@@ -31,15 +31,18 @@ try:
     AIOFILES_AVAILABLE = True
 except ImportError:
     AIOFILES_AVAILABLE = False
+
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Set
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Set
 from concurrent.futures import ThreadPoolExecutor
 
 from .config import CHAINGUARD_HOME
 from .cache import TTLLRUCache, git_cache  # v5.3.1: Bounded cache + git cache
+from .jsonutil import json_dumps, json_loads
 from .embeddings import embedding_engine, KeywordExtractor, detect_task_type
 
 logger = logging.getLogger("chainguard.memory")
@@ -48,22 +51,23 @@ logger = logging.getLogger("chainguard.memory")
 MEMORY_HOME = CHAINGUARD_HOME / "memory"
 MEMORY_HOME.mkdir(parents=True, exist_ok=True)
 
-# Collection names
-COLLECTIONS = [
+# Collection names (immutable - iterated on every query fan-out)
+# Interned so equality checks against incoming names hit the identity fast path
+COLLECTIONS: Tuple[str, ...] = tuple(sys.intern(name) for name in (
     "code_structure",      # Files, modules, directories
     "functions",           # Functions, methods, classes
     "database_schema",     # Tables, columns, relations
     "architecture",        # Patterns, frameworks, conventions
     "learnings",           # Insights from work sessions
     "code_summaries",      # Deep logic summaries extracted from code (v5.4)
-]
+))
 
-# Scoring weights
-SCORING_WEIGHTS = {
+# Scoring weights (read-only view, safe to share at module level)
+SCORING_WEIGHTS: Mapping[str, float] = MappingProxyType({
     "semantic": 0.60,      # Semantic similarity (main factor)
     "keyword": 0.25,       # Keyword match
     "recency": 0.15,       # Recency bonus
-}
+})
 
 # Type bonuses for different task types
 TYPE_BONUSES = {
@@ -128,6 +132,21 @@ class MemoryStats:
     storage_size_mb: float
 
 
+def _validate_memory_path(project_id: str) -> None:
+    """
+    Ensure the memory path for a project stays inside MEMORY_HOME.
+
+    Deliberately not memoized: a symlink created after an earlier check
+    must still be caught.
+    """
+    memory_path = MEMORY_HOME / project_id
+    try:
+        resolved = memory_path.resolve()
+        resolved.relative_to(MEMORY_HOME)
+    except ValueError:
+        raise SecurityError(f"Invalid memory path: {memory_path}")
+
+
 def get_project_id(working_dir: str) -> str:
     """
     Calculate a unique, stable project ID (v5.3.1: with caching).
@@ -141,7 +160,8 @@ def get_project_id(working_dir: str) -> str:
         16-character hex hash (e.g., "a1b2c3d4e5f6g7h8")
 
     Note: Uses git_cache to minimize blocking subprocess calls.
-    After first call, subsequent calls are instant.
+    After first call, subsequent calls are instant. The path is resolved
+    on every call so a retargeted symlink maps to its new project.
     """
     resolved_path = str(Path(working_dir).resolve())
 
@@ -209,12 +229,7 @@ def validate_project_isolation(requested_project_id: str, working_dir: str) -> b
         )
 
     # 3. Validate memory path (no path traversal)
-    memory_path = MEMORY_HOME / requested_project_id
-    try:
-        resolved = memory_path.resolve()
-        resolved.relative_to(MEMORY_HOME)
-    except ValueError:
-        raise SecurityError(f"Invalid memory path: {memory_path}")
+    _validate_memory_path(requested_project_id)
 
     return True
 
@@ -316,7 +331,9 @@ class ProjectMemory:
 
         # Prepare metadata
         meta = metadata or {}
-        meta["updated_at"] = datetime.now().isoformat()
+        now = datetime.now()
+        meta["updated_at"] = now.isoformat()
+        meta["updated_at_ts"] = int(now.timestamp())  # Epoch for fast scoring
         meta["collection"] = collection
 
         # Generate embedding
@@ -363,7 +380,9 @@ class ProjectMemory:
 
         # Prepare metadata
         meta = metadata or {}
-        meta["updated_at"] = datetime.now().isoformat()
+        now = datetime.now()
+        meta["updated_at"] = now.isoformat()
+        meta["updated_at_ts"] = int(now.timestamp())  # Epoch for fast scoring
         meta["collection"] = collection
 
         # Generate embedding
@@ -658,7 +677,9 @@ class ProjectMemory:
 
         # Prepare metadata
         meta = metadata or {}
-        meta["updated_at"] = datetime.now().isoformat()
+        now = datetime.now()
+        meta["updated_at"] = now.isoformat()
+        meta["updated_at_ts"] = int(now.timestamp())  # Epoch for fast scoring
         meta["collection"] = collection
 
         coll = self._collections.get(collection)
@@ -692,6 +713,58 @@ class ProjectMemory:
 
         return doc_id
 
+    async def add_many_with_embeddings(
+        self,
+        batch: List[Tuple[str, str, str, Optional[Dict[str, Any]], List[float]]]
+    ) -> int:
+        """
+        Add many documents with pre-computed embeddings in one go.
+
+        Documents are grouped by collection and written with a single
+        ChromaDB add() call per collection instead of one call per document.
+        Not atomic across collections: if one add() fails, the collections
+        before it are already written.
+
+        Args:
+            batch: List of (doc_id, content, collection, metadata, embedding) tuples
+
+        Returns:
+            Number of added documents
+        """
+        await self._ensure_initialized()
+        self.last_access = time.time()
+
+        now = datetime.now()
+        updated_at, updated_at_ts = now.isoformat(), int(now.timestamp())
+        grouped: Dict[str, Dict[str, list]] = defaultdict(
+            lambda: {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+        )
+
+        for doc_id, content, collection, metadata, embedding in batch:
+            if collection not in self._collections:
+                raise ValueError(f"Unknown collection: {collection}")
+
+            meta = metadata or {}
+            meta["updated_at"] = updated_at
+            meta["updated_at_ts"] = updated_at_ts
+            meta["collection"] = collection
+
+            group = grouped[collection]
+            group["ids"].append(doc_id)
+            group["documents"].append(content)
+            group["metadatas"].append(meta)
+            group["embeddings"].append(embedding)
+
+        loop = asyncio.get_event_loop()
+        for collection, group in grouped.items():
+            coll = self._collections[collection]
+            await loop.run_in_executor(
+                self._executor,
+                lambda c=coll, g=group: c.add(**g)
+            )
+
+        return sum(len(g["ids"]) for g in grouped.values())
+
     async def get_stats(self) -> MemoryStats:
         """Get statistics about this project's memory."""
         await self._ensure_initialized()
@@ -715,10 +788,10 @@ class ProjectMemory:
                 if AIOFILES_AVAILABLE:
                     async with aiofiles.open(self._metadata_path, 'r') as f:
                         content = await f.read()
-                        meta = json.loads(content)
+                        meta = json_loads(content)
                 else:
                     with open(self._metadata_path) as f:
-                        meta = json.load(f)
+                        meta = json_loads(f.read())
                 initialized_at = meta.get("initialized_at")
                 last_update = meta.get("last_update")
             except Exception:
@@ -751,22 +824,23 @@ class ProjectMemory:
                 if AIOFILES_AVAILABLE:
                     async with aiofiles.open(self._metadata_path, 'r') as f:
                         content = await f.read()
-                        existing = json.loads(content)
+                        existing = json_loads(content)
                 else:
                     with open(self._metadata_path) as f:
-                        existing = json.load(f)
+                        existing = json_loads(f.read())
             except Exception:
                 pass
 
         existing.update(kwargs)
         existing["last_update"] = datetime.now().isoformat()
 
+        content = json_dumps(existing, indent=True)
         if AIOFILES_AVAILABLE:
-            async with aiofiles.open(self._metadata_path, 'w') as f:
-                await f.write(json.dumps(existing, indent=2))
+            async with aiofiles.open(self._metadata_path, 'wb') as f:
+                await f.write(content)
         else:
-            with open(self._metadata_path, "w") as f:
-                json.dump(existing, f, indent=2)
+            with open(self._metadata_path, "wb") as f:
+                f.write(content)
 
     async def close(self):
         """Release resources properly (v5.3 fix)."""
@@ -789,6 +863,32 @@ class ProjectMemory:
                 logger.warning(f"Error shutting down executor: {e}")
 
 
+def _get_age_days(updated_at: str, updated_at_ts: Optional[int] = None) -> Optional[int]:
+    """
+    Get the age of a document in whole days.
+
+    Prefers the epoch timestamp (updated_at_ts); ISO strings are only
+    parsed for documents stored without it.
+
+    Returns:
+        Age in days or None if unknown
+    """
+    if updated_at_ts is not None:
+        try:
+            return int((time.time() - updated_at_ts) // 86400)
+        except (TypeError, ValueError):
+            pass
+
+    if not updated_at:
+        return None
+
+    try:
+        updated = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+        return (datetime.now() - updated.replace(tzinfo=None)).days
+    except Exception:
+        return None
+
+
 class RelevanceScorer:
     """Calculates relevance scores for memory results."""
 
@@ -811,6 +911,9 @@ class RelevanceScorer:
             task_type: Type of task (bug, feature, database, etc.)
             collection: Source collection name
         """
+        # Callers may pass freshly built names (e.g. from stored metadata)
+        collection = sys.intern(collection)
+
         # 1. Semantic score (convert distance to similarity)
         # ChromaDB cosine distance: 0 = same, 2 = opposite
         semantic_score = 1.0 - (semantic_distance / 2.0)
@@ -820,9 +923,11 @@ class RelevanceScorer:
         matched = sum(1 for kw in keywords if kw in doc_text)
         keyword_score = matched / max(len(keywords), 1)
 
-        # 3. Recency score
+        # 3. Recency score (epoch timestamp avoids ISO parsing)
         updated_at = document.metadata.get("updated_at", "")
-        recency_score = cls._calculate_recency(updated_at)
+        recency_score = cls._calculate_recency(
+            updated_at, document.metadata.get("updated_at_ts")
+        )
 
         # 4. Type bonus
         doc_type = document.metadata.get("type", "")
@@ -849,32 +954,30 @@ class RelevanceScorer:
         )
 
     @staticmethod
-    def _calculate_recency(updated_at: str) -> float:
+    def _calculate_recency(updated_at: str, updated_at_ts: Optional[int] = None) -> float:
         """
         Calculate recency score based on timestamp.
 
+        Uses the epoch timestamp (updated_at_ts) if present and only
+        falls back to parsing the ISO string for older documents.
+
         Last 24h: 1.0
         Last week: 0.8
         Last month: 0.5
         Older: 0.2
         """
-        if not updated_at:
+        age_days = _get_age_days(updated_at, updated_at_ts)
+        if age_days is None:
             return 0.5  # Default for unknown
 
-        try:
-            updated = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-            age = datetime.now() - updated.replace(tzinfo=None)
-
-            if age.days < 1:
-                return 1.0
-            elif age.days < 7:
-                return 0.8
-            elif age.days < 30:
-                return 0.5
-            else:
-                return 0.2
-        except Exception:
+        if age_days < 1:
+            return 1.0
+        elif age_days < 7:
+            return 0.8
+        elif age_days < 30:
             return 0.5
+        else:
+            return 0.2
 
 
 class ContextFormatter:
@@ -1009,11 +1112,12 @@ class ContextFormatter:
             if functions:
                 return f"Functions: {', '.join(functions)}"
 
-        # Fallback: First sentence
+        # Fallback: First sentence (partition stops at the first match)
         content = doc.content
-        if ". " in content:
-            return content.split(". ")[0] + "."
-        return content[:80] + "..." if len(content) > 80 else content
+        first, sep, _ = content.partition(". ")
+        if sep:
+            return f"{first}."
+        return f"{content[:80]}..." if len(content) > 80 else content
 
     @classmethod
     def _get_recent_changes(cls, results: List[ScoredResult]) -> List[str]:
@@ -1021,17 +1125,16 @@ class ContextFormatter:
         recent = []
 
         for result in results:
-            updated = result.document.metadata.get("updated_at", "")
-            if result.recency_score >= 0.8 and updated:
-                try:
-                    dt = datetime.fromisoformat(updated.replace("Z", "+00:00"))
-                    age = datetime.now() - dt.replace(tzinfo=None)
-                    if age.days < 7:
-                        path = result.document.metadata.get("path", "?")
-                        ago = f"{age.days}d ago" if age.days > 0 else "today"
-                        recent.append(f"{ago}: {path}")
-                except Exception:
-                    pass
+            if result.recency_score < 0.8:
+                continue
+            metadata = result.document.metadata
+            age_days = _get_age_days(
+                metadata.get("updated_at", ""), metadata.get("updated_at_ts")
+            )
+            if age_days is not None and age_days < 7:
+                path = metadata.get("path", "?")
+                ago = f"{age_days}d ago" if age_days > 0 else "today"
+                recent.append(f"{ago}: {path}")
 
         return recent
 
@@ -1049,6 +1152,8 @@ class ProjectMemoryManager:
     def __init__(self):
         self._instances: Dict[str, ProjectMemory] = {}
         self._lock = asyncio.Lock()
+        # Projects known to have a memory DB (never removed at runtime)
+        self._known_existing: Set[str] = set()
 
     async def get_memory(self, project_id: str, working_dir: Optional[str] = None) -> ProjectMemory:
         """
@@ -1081,9 +1186,20 @@ class ProjectMemoryManager:
             return self._instances[project_id]
 
     async def memory_exists(self, project_id: str) -> bool:
-        """Check if memory exists for a project."""
-        memory_path = MEMORY_HOME / project_id
-        return memory_path.exists() and (memory_path / "chroma.sqlite3").exists()
+        """
+        Check if memory exists for a project.
+
+        Positive results are cached. Negative results are always re-checked,
+        since a memory can be initialized by another process at any time.
+        """
+        if project_id in self._known_existing:
+            return True
+
+        # The DB file implies the project directory - one stat instead of two
+        if (MEMORY_HOME / project_id / "chroma.sqlite3").exists():
+            self._known_existing.add(project_id)
+            return True
+        return False
 
     async def cleanup_inactive(self, max_age_seconds: int = 3600):
         """Remove inactive memory instances from RAM (v5.3.1: safe iteration)."""
@@ -1099,6 +1215,13 @@ class ProjectMemoryManager:
                 del self._instances[pid]
                 logger.info(f"Cleaned up inactive memory: {pid}")
 
+    async def close_all(self):
+        """Close all open memory instances (e.g. on shutdown)."""
+        async with self._lock:
+            for pid, mem in list(self._instances.items()):
+                await mem.close()
+                del self._instances[pid]
+
     async def list_projects(self) -> List[str]:
         """List all projects with memory."""
         projects = []
@@ -11,12 +11,13 @@ See LICENSE file in the project root for full license information.
 import json
 import gzip
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable, AsyncIterator
+from typing import Dict, List, Optional, Any, Callable, AsyncIterator, Tuple
 from pathlib import Path
 from datetime import datetime
 import asyncio
 
-from .config import logger, CHAINGUARD_HOME
+from .config import logger, CHAINGUARD_HOME, DATACLASS_SLOTS
+from .jsonutil import json_dumps, json_loads
 
 
 # =============================================================================
@@ -30,12 +31,44 @@ EXPORT_DIR.mkdir(exist_ok=True)
 # Maximum documents per export file (to prevent huge files)
 MAX_DOCS_PER_FILE = 10000
 
+# Write buffer for streamed JSONL exports (one syscall per ~1 MB)
+JSONL_WRITE_BUFFER = 1 << 20
+
+# Documents with embeddings per batch write during import_json
+IMPORT_BATCH_SIZE = 1000
+
+
+# =============================================================================
+# Embedding Quantization
+# =============================================================================
+
+def quantize_embedding(embedding: List[float]) -> Tuple[List[int], float]:
+    """
+    Quantize an embedding to int8 values with a per-vector scale.
+
+    Shrinks exported embeddings roughly 4x; cosine similarity is
+    preserved up to ~1% since the scale is shared by all components.
+
+    Returns:
+        (int8 values in [-127, 127], scale)
+    """
+    max_abs = max((abs(v) for v in embedding), default=0.0)
+    if max_abs == 0.0:
+        return [0] * len(embedding), 0.0
+    scale = max_abs / 127.0
+    return [int(round(v / scale)) for v in embedding], scale
+
+
+def dequantize_embedding(values: List[int], scale: float) -> List[float]:
+    """Restore float values from an int8-quantized embedding."""
+    return [v * scale for v in values]
+
 
 # =============================================================================
 # Data Classes
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ExportMetadata:
     """Metadata for an export file."""
     format_version: str = EXPORT_FORMAT_VERSION
@@ -70,7 +103,7 @@ class ExportMetadata:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ExportDocument:
     """A single document for export."""
     id: str
@@ -79,7 +112,7 @@ class ExportDocument:
     metadata: Dict[str, Any] = field(default_factory=dict)
     embedding: Optional[List[float]] = None
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, quantize: bool = False) -> Dict[str, Any]:
         result = {
             "id": self.id,
             "content": self.content,
@@ -87,21 +120,31 @@ class ExportDocument:
             "metadata": self.metadata,
         }
         if self.embedding is not None:
-            result["embedding"] = self.embedding
+            if quantize:
+                values, scale = quantize_embedding(self.embedding)
+                result["embedding_q8"] = values
+                result["embedding_scale"] = scale
+            else:
+                result["embedding"] = self.embedding
         return result
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ExportDocument":
+        embedding = data.get("embedding")
+        if embedding is None and "embedding_q8" in data:
+            embedding = dequantize_embedding(
+                data["embedding_q8"], data.get("embedding_scale", 0.0)
+            )
         return cls(
             id=data.get("id", ""),
             content=data.get("content", ""),
             collection=data.get("collection", ""),
             metadata=data.get("metadata", {}),
-            embedding=data.get("embedding"),
+            embedding=embedding,
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ExportResult:
     """Result of an export operation."""
     success: bool
@@ -120,7 +163,7 @@ class ExportResult:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ImportResult:
     """Result of an import operation."""
     success: bool
@@ -160,6 +203,7 @@ class MemoryExporter:
         include_embeddings: bool = False,
         compress: bool = False,
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        quantize_embeddings: bool = False,
     ) -> ExportResult:
         """
         Export memory to JSON format.
@@ -171,6 +215,7 @@ class MemoryExporter:
             include_embeddings: Whether to include vector embeddings
             compress: Whether to gzip the output
             progress_callback: Optional callback(current, total) for progress
+            quantize_embeddings: Store embeddings as int8 + scale (~4x smaller)
 
         Returns:
             ExportResult with status and file path
@@ -233,18 +278,18 @@ class MemoryExporter:
 
             export_data = {
                 "metadata": metadata.to_dict(),
-                "documents": [d.to_dict() for d in documents],
+                "documents": [d.to_dict(quantize=quantize_embeddings) for d in documents],
             }
 
             # Write to file
-            json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
+            json_bytes = json_dumps(export_data, indent=True)
 
             if compress:
-                with gzip.open(output_path, 'wt', encoding='utf-8') as f:
-                    f.write(json_str)
+                with gzip.open(output_path, 'wb') as f:
+                    f.write(json_bytes)
             else:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(json_str)
+                with open(output_path, 'wb') as f:
+                    f.write(json_bytes)
 
             return ExportResult(
                 success=True,
@@ -268,6 +313,7 @@ class MemoryExporter:
         include_embeddings: bool = False,
         compress: bool = False,
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        quantize_embeddings: bool = False,
     ) -> ExportResult:
         """
         Export memory to JSONL (line-delimited JSON) format.
@@ -280,6 +326,7 @@ class MemoryExporter:
             include_embeddings: Whether to include vector embeddings
             compress: Whether to gzip the output
             progress_callback: Optional callback(current, total) for progress
+            quantize_embeddings: Store embeddings as int8 + scale (~4x smaller)
 
         Returns:
             ExportResult with status and file path
@@ -313,13 +360,13 @@ class MemoryExporter:
 
             # Open file and write
             if compress:
-                f = gzip.open(output_path, 'wt', encoding='utf-8')
+                f = gzip.open(output_path, 'wb')
             else:
-                f = open(output_path, 'w', encoding='utf-8')
+                f = open(output_path, 'wb', buffering=JSONL_WRITE_BUFFER)
 
             try:
                 # Write metadata as first line
-                f.write(json.dumps({"_metadata": metadata.to_dict()}) + "\n")
+                f.write(json_dumps({"_metadata": metadata.to_dict()}) + b"\n")
 
                 for collection in collections:
                     try:
@@ -334,7 +381,9 @@ class MemoryExporter:
                                 metadata=doc.metadata,
                                 embedding=embedding if include_embeddings else None,
                             )
-                            f.write(json.dumps(export_doc.to_dict(), ensure_ascii=False) + "\n")
+                            f.write(json_dumps(
+                                export_doc.to_dict(quantize=quantize_embeddings)
+                            ) + b"\n")
 
                             total_docs += 1
                             collection_docs += 1
@@ -406,11 +455,11 @@ class MemoryImporter:
             # Read file
             path = Path(input_path)
             if path.suffix == '.gz':
-                with gzip.open(path, 'rt', encoding='utf-8') as f:
-                    data = json.load(f)
+                with gzip.open(path, 'rb') as f:
+                    data = json_loads(f.read())
             else:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(path, 'rb') as f:
+                    data = json_loads(f.read())
 
             # Validate format
             if "metadata" not in data or "documents" not in data:
@@ -435,6 +484,9 @@ class MemoryImporter:
             imported = 0
             skipped = 0
             imported_collections: set = set()
+            # Documents with embeddings are written in batches; progress for
+            # them is only reported once their batch is stored
+            pending: List[ExportDocument] = []
 
             for i, doc in enumerate(documents):
                 try:
@@ -447,13 +499,13 @@ class MemoryImporter:
 
                     # Import with or without embedding
                     if doc.embedding is not None:
-                        await memory.add_with_embedding(
-                            doc_id=doc.id,
-                            content=doc.content,
-                            collection=doc.collection,
-                            metadata=doc.metadata,
-                            embedding=doc.embedding,
-                        )
+                        pending.append(doc)
+                        if len(pending) >= IMPORT_BATCH_SIZE:
+                            added = await self._add_embedded_batch(memory, pending)
+                            imported += len(added)
+                            skipped += len(pending) - len(added)
+                            imported_collections.update(d.collection for d in added)
+                            pending = []
                     else:
                         await memory.add(
                             content=doc.content,
@@ -461,17 +513,24 @@ class MemoryImporter:
                             metadata=doc.metadata,
                             doc_id=doc.id,
                         )
+                        imported += 1
+                        imported_collections.add(doc.collection)
 
-                    imported += 1
-                    imported_collections.add(doc.collection)
-
-                    if progress_callback:
+                    if progress_callback and not pending:
                         progress_callback(i + 1, total)
 
                 except Exception as e:
                     logger.warning(f"Failed to import document {doc.id}: {e}")
                     skipped += 1
 
+            if pending:
+                added = await self._add_embedded_batch(memory, pending)
+                imported += len(added)
+                skipped += len(pending) - len(added)
+                imported_collections.update(doc.collection for doc in added)
+                if progress_callback:
+                    progress_callback(total, total)
+
             return ImportResult(
                 success=True,
                 documents_imported=imported,
@@ -486,6 +545,51 @@ class MemoryImporter:
                 error=str(e),
             )
 
+    async def _add_embedded_batch(
+        self,
+        memory,  # ProjectMemory instance
+        documents: List[ExportDocument],
+    ) -> List[ExportDocument]:
+        """
+        Add documents with pre-computed embeddings, one batch per collection.
+
+        A collection whose batch write fails falls back to per-document
+        inserts, so a single bad document does not drop the whole import.
+        Collections that were already written are not added again.
+
+        Returns:
+            List of successfully added documents
+        """
+        by_collection: Dict[str, List[ExportDocument]] = {}
+        for doc in documents:
+            by_collection.setdefault(doc.collection, []).append(doc)
+
+        added: List[ExportDocument] = []
+        for collection, docs in by_collection.items():
+            try:
+                await memory.add_many_with_embeddings([
+                    (doc.id, doc.content, doc.collection, doc.metadata, doc.embedding)
+                    for doc in docs
+                ])
+                added.extend(docs)
+                continue
+            except Exception as e:
+                logger.debug(f"Batch import into {collection} failed, falling back to single inserts: {e}")
+
+            for doc in docs:
+                try:
+                    await memory.add_with_embedding(
+                        doc_id=doc.id,
+                        content=doc.content,
+                        collection=doc.collection,
+                        metadata=doc.metadata,
+                        embedding=doc.embedding,
+                    )
+                    added.append(doc)
+                except Exception as e:
+                    logger.warning(f"Failed to import document {doc.id}: {e}")
+        return added
+
     async def import_jsonl(
         self,
         memory,  # ProjectMemory instance
@@ -526,7 +630,7 @@ class MemoryImporter:
                         continue
 
                     try:
-                        data = json.loads(line)
+                        data = json_loads(line)
 
                         # First line is metadata
                         if "_metadata" in data:
@@ -8,16 +8,17 @@ Licensed under the Polyform Noncommercial License 1.0.0
 See LICENSE file in the project root for full license information.
 """
 
+import sys
 import json
 import fnmatch
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 from .config import (
     CONFIG, MAX_RECENT_ACTIONS, MAX_OUT_OF_SCOPE_FILES,
     MAX_CHANGED_FILES, DB_SCHEMA_CHECK_TTL, DB_SCHEMA_PATTERNS,
-    TaskMode, get_mode_features
+    TaskMode, get_mode_features, DATACLASS_SLOTS
 )
 
 
@@ -33,7 +34,26 @@ class ScopeDefinition:
     created_at: str = ""
 
 
-@dataclass
+# Web file extensions that REQUIRE HTTP testing (a tuple, so a single
+# str.endswith() call checks all of them)
+_WEB_EXTENSIONS = ('.php', '.js', '.ts', '.jsx', '.tsx', '.vue', '.html', '.twig', '.blade.php')
+# Same without the dot, for scope modules given as e.g. "src/*php"
+_WEB_EXTENSION_NAMES = tuple(ext.replace('.', '') for ext in _WEB_EXTENSIONS)
+
+# State keys from older versions that are dropped on load
+_DEPRECATED_STATE_FIELDS = (
+    "progress_log", "files_since_last_test", "validation_history",
+    "todos_completed", "expected_state", "learnings",
+    "file_dependencies", "_log_written_index"
+)
+
+
+def _intern(value: Any) -> Any:
+    """Intern short enum-like strings; other values (e.g. None from a client) pass through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ProjectState:
     """
     Represents the complete state of a tracked project.
@@ -118,12 +138,7 @@ class ProjectState:
             del data["files_modified"]
 
         # Remove deprecated fields
-        deprecated = [
-            "progress_log", "files_since_last_test", "validation_history",
-            "todos_completed", "expected_state", "learnings",
-            "file_dependencies", "_log_written_index"
-        ]
-        for key in deprecated:
+        for key in _DEPRECATED_STATE_FIELDS:
             data.pop(key, None)
 
         # v4.18: Migrate db_schema_checked (bool) → db_schema_checked_at (timestamp)
@@ -135,39 +150,14 @@ class ProjectState:
             else:
                 data["db_schema_checked_at"] = ""
 
-        # Defaults for new fields
-        defaults = {
-            "files_changed": 0, "files_since_validation": 0,
-            "validations_passed": 0, "validations_failed": 0,
-            "recent_actions": [], "criteria_status": {},
-            "out_of_scope_files": [], "checklist_results": {},
-            "http_base_url": "", "http_credentials": {}, "http_tests_performed": 0,
-            "changed_files": [], "impact_check_pending": False,
-            # Test Runner (v4.10)
-            "test_config": {}, "test_results": {},
-            "last_test_run": "", "tests_passed": 0, "tests_failed": 0,
-            # Database Inspector (v4.12, v4.18: timestamp statt bool)
-            "db_config": {},
-            "db_schema_checked_at": "",
-            # Task Mode System (v5.0)
-            "task_mode": "programming",
-            "word_count_total": 0,
-            "chapter_status": {},
-            "command_history": [],
-            "checkpoints": [],
-            "sources": [],
-            "facts": [],
-            # Symbol Validation (v6.4.1)
-            "symbol_warnings": []
-        }
-        for key, value in defaults.items():
-            data.setdefault(key, value)
-
-        # Filter to only known fields
-        known_fields = {f.name for f in cls.__dataclass_fields__.values()}
-        filtered_data = {k: v for k, v in data.items() if k in known_fields}
+        # task_mode comes from a handful of values: share one string per mode
+        if "task_mode" in data:
+            data["task_mode"] = _intern(data["task_mode"])
 
-        return cls(**filtered_data)
+        # Fields added since the state was written fall back to the
+        # dataclass defaults; unknown keys are dropped
+        fields = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in fields})
 
     def needs_validation(self) -> bool:
         return self.files_since_validation >= CONFIG.validation_reminder_threshold
@@ -368,9 +358,6 @@ class ProjectState:
 
         Returns None if no issue (tests were done or no web files changed).
         """
-        # Web file extensions that REQUIRE HTTP testing
-        WEB_EXTENSIONS = {'.php', '.js', '.ts', '.jsx', '.tsx', '.vue', '.html', '.twig', '.blade.php'}
-
         # Skip if HTTP tests were already performed
         if self.http_tests_performed > 0:
             return None
@@ -387,11 +374,8 @@ class ProjectState:
         # Check 2: ANY web file changed - BLOCKING
         web_files_changed = []
         for file_name in self.changed_files:
-            file_lower = file_name.lower()
-            for ext in WEB_EXTENSIONS:
-                if file_lower.endswith(ext):
-                    web_files_changed.append(file_name)
-                    break
+            if file_name.lower().endswith(_WEB_EXTENSIONS):
+                web_files_changed.append(file_name)
 
         if web_files_changed:  # v4.15: ANY web file triggers requirement
             return {
@@ -408,7 +392,7 @@ class ProjectState:
             for action in self.recent_actions:
                 # Actions look like: "14:30 edit: user-edit.php" or "14:30 BATCH(3): edit"
                 action_lower = action.lower()
-                for ext in WEB_EXTENSIONS:
+                for ext in _WEB_EXTENSIONS:
                     if ext in action_lower:
                         # Extract filename from action
                         parts = action.split(': ')
@@ -430,8 +414,11 @@ class ProjectState:
             web_modules = []
             for module in self.scope.modules:
                 module_lower = module.lower()
-                for ext in WEB_EXTENSIONS:
-                    if ext in module_lower or module_lower.endswith(ext.replace('.', '')):
+                if module_lower.endswith(_WEB_EXTENSION_NAMES):
+                    web_modules.append(module)
+                    continue
+                for ext in _WEB_EXTENSIONS:
+                    if ext in module_lower:
                         web_modules.append(module)
                         break
             if web_modules and self.files_changed > 0:
@@ -461,14 +448,14 @@ class ProjectState:
         v5.0: Check if HTTP tests are required based on task mode.
         Only PROGRAMMING mode enforces HTTP tests for web files.
         """
-        features = self.get_features()
-        if not features.http_testing:
-            return False  # HTTP testing not required for this mode
-
-        # Only check web files in programming mode
+        # Only check web files in programming mode (plain string compare
+        # first, so other modes skip the feature lookup and file scan)
         if self.task_mode != "programming":
             return False
 
+        if not self.get_features().http_testing:
+            return False  # HTTP testing not required for this mode
+
         # Delegate to existing logic
         return self._check_http_test_needed() is not None
 
@@ -480,11 +467,11 @@ class ProjectState:
         self.command_history.append({
             "ts": datetime.now().isoformat(),
             "cmd": cmd,
-            "result": result,
+            "result": _intern(result),
             "output": output[:500] if output else ""
         })
         if len(self.command_history) > 50:
-            self.command_history = self.command_history[-50:]
+            del self.command_history[:-50]
 
     def add_checkpoint(self, name: str, files: List[str] = None):
         """
@@ -497,7 +484,7 @@ class ProjectState:
             "files": files or []
         })
         if len(self.checkpoints) > 10:
-            self.checkpoints = self.checkpoints[-10:]
+            del self.checkpoints[:-10]
 
     def add_source(self, url: str, title: str = "", relevance: str = "medium"):
         """
@@ -507,11 +494,11 @@ class ProjectState:
         self.sources.append({
             "url": url,
             "title": title,
-            "relevance": relevance,  # high, medium, low
+            "relevance": _intern(relevance),  # high, medium, low
             "ts": datetime.now().isoformat()
         })
         if len(self.sources) > 100:
-            self.sources = self.sources[-100:]
+            del self.sources[:-100]
 
     def add_fact(self, fact: str, source: str = "", confidence: str = "likely"):
         """
@@ -521,11 +508,11 @@ class ProjectState:
         self.facts.append({
             "fact": fact,
             "source": source,
-            "confidence": confidence,  # verified, likely, uncertain
+            "confidence": _intern(confidence),  # verified, likely, uncertain
             "ts": datetime.now().isoformat()
         })
         if len(self.facts) > 200:
-            self.facts = self.facts[-200:]
+            del self.facts[:-200]
 
     def update_word_count(self, count: int):
         """v5.0: Update total word count (Content mode)."""
@@ -536,30 +523,43 @@ class ProjectState:
         v5.0: Set chapter status (Content mode).
         status: draft, review, done
         """
-        self.chapter_status[chapter] = status
+        self.chapter_status[chapter] = _intern(status)
 
     def get_mode_status_line(self) -> str:
         """
         v5.0: Get mode-specific status information.
         Returns additional info based on task mode.
         """
-        mode = self.get_task_mode()
+        formatter = _MODE_STATUS_LINES.get(self.get_task_mode())
+        # PROGRAMMING mode - default
+        return formatter(self) if formatter else ""
 
-        if mode == TaskMode.CONTENT:
-            chapters_done = sum(1 for s in self.chapter_status.values() if s == "done")
-            chapters_total = len(self.chapter_status) or "?"
-            return f"📝 {self.word_count_total} words | {chapters_done}/{chapters_total} chapters"
 
-        elif mode == TaskMode.DEVOPS:
-            cmds = len(self.command_history)
-            checkpoints = len(self.checkpoints)
-            return f"🖥️ {cmds} cmds | {checkpoints} checkpoints"
+# =============================================================================
+# Mode status lines (dispatched by ProjectState.get_mode_status_line)
+# =============================================================================
 
-        elif mode == TaskMode.RESEARCH:
-            return f"🔬 {len(self.sources)} sources | {len(self.facts)} facts"
+def _content_status_line(state: ProjectState) -> str:
+    chapters_done = sum(1 for s in state.chapter_status.values() if s == "done")
+    chapters_total = len(state.chapter_status) or "?"
+    return f"📝 {state.word_count_total} words | {chapters_done}/{chapters_total} chapters"
 
-        elif mode == TaskMode.GENERIC:
-            return f"⚡ {self.files_changed} tracked"
 
-        # PROGRAMMING mode - default
-        return ""
+def _devops_status_line(state: ProjectState) -> str:
+    return f"🖥️ {len(state.command_history)} cmds | {len(state.checkpoints)} checkpoints"
+
+
+def _research_status_line(state: ProjectState) -> str:
+    return f"🔬 {len(state.sources)} sources | {len(state.facts)} facts"
+
+
+def _generic_status_line(state: ProjectState) -> str:
+    return f"⚡ {state.files_changed} tracked"
+
+
+_MODE_STATUS_LINES: Dict[TaskMode, Callable[[ProjectState], str]] = {
+    TaskMode.CONTENT: _content_status_line,
+    TaskMode.DEVOPS: _devops_status_line,
+    TaskMode.RESEARCH: _research_status_line,
+    TaskMode.GENERIC: _generic_status_line,
+}
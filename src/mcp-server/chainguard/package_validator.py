@@ -16,15 +16,30 @@ Design Principles:
 
 import os
 import re
+import sys
 import json
+import hashlib
 import logging
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Set, Optional, Tuple, Any
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
+from .cache import LRUCache
+from .jsonutil import json_loads
 from .symbol_patterns import Language, detect_language
 
+# Optional: rapidfuzz for C-accelerated Levenshtein (fallback: pure Python DP)
+try:
+    from rapidfuzz import process as _rf_process
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+    from rapidfuzz.distance import OSA as _RFOSA
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,7 +89,7 @@ class PackageValidationResult:
 # STANDARD LIBRARIES - Always valid, never hallucinated
 # =============================================================================
 
-PYTHON_STDLIB: Set[str] = {
+PYTHON_STDLIB: FrozenSet[str] = frozenset({
     # Core
     'abc', 'aifc', 'argparse', 'array', 'ast', 'asynchat', 'asyncio', 'asyncore',
     'atexit', 'audioop', 'base64', 'bdb', 'binascii', 'binhex', 'bisect',
@@ -107,9 +122,9 @@ PYTHON_STDLIB: Set[str] = {
     'wsgiref', 'xdrlib', 'xml', 'xmlrpc', 'zipapp', 'zipfile', 'zipimport', 'zlib',
     # Typing extensions
     'typing_extensions',
-}
+})
 
-NODE_BUILTINS: Set[str] = {
+NODE_BUILTINS: FrozenSet[str] = frozenset({
     'assert', 'async_hooks', 'buffer', 'child_process', 'cluster', 'console',
     'constants', 'crypto', 'dgram', 'diagnostics_channel', 'dns', 'domain',
     'events', 'fs', 'http', 'http2', 'https', 'inspector', 'module', 'net',
@@ -130,9 +145,9 @@ NODE_BUILTINS: Set[str] = {
     'bun', 'bun:test', 'bun:sqlite', 'bun:ffi',
     # Deno
     'Deno',
-}
+})
 
-PHP_BUILTINS: Set[str] = {
+PHP_BUILTINS: FrozenSet[str] = frozenset({
     # Core PHP classes/namespaces
     'Exception', 'Error', 'TypeError', 'ArgumentCountError', 'ArithmeticError',
     'DivisionByZeroError', 'ParseError', 'AssertionError', 'CompileError',
@@ -171,7 +186,7 @@ PHP_BUILTINS: Set[str] = {
     'XMLReader', 'XMLWriter', 'Phar', 'PharException', 'ZipArchive',
     'CurlHandle', 'CurlMultiHandle', 'CurlShareHandle',
     'finfo', 'mysqli', 'mysqli_result', 'mysqli_stmt',
-}
+})
 
 # =============================================================================
 # PHP NAMESPACE TO PACKAGE MAPPING
@@ -263,9 +278,10 @@ PHP_NAMESPACE_MAPPING: Dict[str, List[str]] = {
 # IMPORT PATTERNS
 # =============================================================================
 
-# PHP: use statements
+# PHP: use statements. [^\S\n] is whitespace that stays on one line, so
+# the pattern can scan the whole file in one pass.
 PHP_USE_PATTERN = re.compile(
-    r'^\s*use\s+([A-Z][a-zA-Z0-9_\\]+)(?:\s+as\s+\w+)?;',
+    r'^[^\S\n]*use[^\S\n]+([A-Z][a-zA-Z0-9_\\]+)(?:[^\S\n]+as[^\S\n]+\w+)?;',
     re.MULTILINE
 )
 
@@ -275,21 +291,10 @@ PHP_FQN_PATTERN = re.compile(
     re.MULTILINE
 )
 
-# JS/TS: import statements
-JS_IMPORT_PATTERN = re.compile(
-    r'''(?:^|\s)import\s+(?:(?:[\w*{}\s,]+)\s+from\s+)?['"]([^'"./][^'"]*?)['"]''',
-    re.MULTILINE
-)
-
-# JS/TS: require statements
-JS_REQUIRE_PATTERN = re.compile(
-    r'''require\s*\(\s*['"]([^'"./][^'"]*?)['"]\s*\)''',
-    re.MULTILINE
-)
-
-# JS/TS: dynamic import
-JS_DYNAMIC_IMPORT_PATTERN = re.compile(
-    r'''import\s*\(\s*['"]([^'"./][^'"]*?)['"]\s*\)''',
+# JS/TS: import statements, require() and dynamic import() in one pass
+JS_MODULE_PATTERN = re.compile(
+    r'''(?:^|\s)import\s+(?:(?:[\w*{}\s,]+)\s+from\s+)?['"](?P<static>[^'"./][^'"]*?)['"]'''
+    r'''|(?:require|import)\s*\(\s*['"](?P<call>[^'"./][^'"]*?)['"]\s*\)''',
     re.MULTILINE
 )
 
@@ -306,14 +311,42 @@ PYTHON_FROM_IMPORT_PATTERN = re.compile(
 )
 
 
+# =============================================================================
+# REGISTRY / SCORING PATTERNS
+# =============================================================================
+
+# requirements.txt: package name before any version specifier
+REQUIREMENT_NAME_PATTERN = re.compile(r'^([a-zA-Z0-9_-]+)')
+
+# pyproject.toml: "name = ..." / "name >= ..." dependency lines
+PYPROJECT_DEP_PATTERN = re.compile(r'^\s*([a-zA-Z0-9_-]+)\s*[=<>]', re.MULTILINE)
+
+# setup.py: install_requires=[...] block and the quoted names inside it
+SETUP_INSTALL_REQUIRES_PATTERN = re.compile(r'install_requires\s*=\s*\[(.*?)\]', re.DOTALL)
+SETUP_DEP_NAME_PATTERN = re.compile(r"['\"]([a-zA-Z0-9_-]+)")
+
+# CamelCase words of a PHP vendor namespace (GuzzleHttp -> Guzzle, Http)
+CAMEL_CASE_WORD_PATTERN = re.compile(r'[A-Z][a-z]*')
+
+# Characters that never appear in legitimate package names
+SUSPICIOUS_CHAR_PATTERN = re.compile(r'[^a-zA-Z0-9_\-/@.]')
+
+
 # =============================================================================
 # LEVENSHTEIN DISTANCE - For typo/slopsquatting detection
 # =============================================================================
 
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calculate Levenshtein distance between two strings."""
+    if RAPIDFUZZ_AVAILABLE:
+        return _RFLevenshtein.distance(s1, s2)
+    return _levenshtein_distance_py(s1, s2)
+
+
+def _levenshtein_distance_py(s1: str, s2: str) -> int:
+    """Pure-Python Levenshtein DP (fallback when rapidfuzz is missing)."""
     if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
+        return _levenshtein_distance_py(s2, s1)
 
     if len(s2) == 0:
         return len(s1)
@@ -331,33 +364,230 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     return previous_row[-1]
 
 
+def typo_distance(s1: str, s2: str, score_cutoff: Optional[int] = None) -> int:
+    """Edit distance where swapping two adjacent characters costs 1.
+
+    Optimal string alignment: Levenshtein plus adjacent transpositions,
+    the most common typing slip ("recat" for "react").
+
+    Args:
+        score_cutoff: Stop early once the distance exceeds this value and
+            return score_cutoff + 1 (same contract as rapidfuzz).
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return _RFOSA.distance(s1, s2, score_cutoff=score_cutoff)
+    return _typo_distance_py(s1, s2, score_cutoff)
+
+
+def _typo_distance_py(s1: str, s2: str, score_cutoff: Optional[int] = None) -> int:
+    """Pure-Python OSA DP (fallback when rapidfuzz is missing)."""
+    if score_cutoff is not None and abs(len(s1) - len(s2)) > score_cutoff:
+        return score_cutoff + 1
+
+    if len(s2) == 0:
+        return len(s1)
+
+    before_previous: List[int] = []
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            cost = min(
+                previous_row[j + 1] + 1,
+                current_row[j] + 1,
+                previous_row[j] + (c1 != c2),
+            )
+            if i and j and c1 == s2[j - 1] and s1[i - 1] == c2:
+                cost = min(cost, before_previous[j - 1] + 1)
+            current_row.append(cost)
+        # Row minima never decrease, so the result can't come back under
+        if score_cutoff is not None and min(current_row) > score_cutoff:
+            return score_cutoff + 1
+        before_previous, previous_row = previous_row, current_row
+
+    distance = previous_row[-1]
+    if score_cutoff is not None and distance > score_cutoff:
+        return score_cutoff + 1
+    return distance
+
+
+# Keyboard rows for neighbour lookups (staggered QWERTY layout)
+QWERTY_ROWS = ("1234567890", "qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+# Lookalike characters used in homoglyph squatting (l0dash, reqests)
+HOMOGLYPH_PAIRS = ("o0", "l1", "i1", "il", "s5", "e3", "a4")
+
+KEYBOARD_NEIGHBOUR_COST = 0.5
+HOMOGLYPH_COST = 0.3
+
+
+def _build_substitution_costs() -> Dict[Tuple[str, str], float]:
+    """Substitution costs below 1.0 for likely slips, keyed both ways."""
+    costs: Dict[Tuple[str, str], float] = {}
+    for r, row in enumerate(QWERTY_ROWS):
+        for c, key in enumerate(row):
+            neighbours = [row[c + 1]] if c + 1 < len(row) else []
+            if r + 1 < len(QWERTY_ROWS):
+                below = QWERTY_ROWS[r + 1]
+                neighbours += [below[i] for i in (c - 1, c) if 0 <= i < len(below)]
+            for other in neighbours:
+                costs[key, other] = costs[other, key] = KEYBOARD_NEIGHBOUR_COST
+    for a, b in HOMOGLYPH_PAIRS:
+        costs[a, b] = costs[b, a] = HOMOGLYPH_COST
+    return costs
+
+
+_SUBSTITUTION_COSTS = _build_substitution_costs()
+
+
+def weighted_typo_distance(s1: str, s2: str) -> float:
+    """typo_distance with cheaper keyboard-neighbour and homoglyph swaps.
+
+    Substituting a QWERTY neighbour costs 0.5 and a lookalike character
+    0.3; everything else costs 1. Only used to score the closest match,
+    so the pure-Python DP is fine here.
+    """
+    if len(s2) == 0:
+        return float(len(s1))
+
+    get_cost = _SUBSTITUTION_COSTS.get
+    before_previous: List[float] = []
+    previous_row = [float(j) for j in range(len(s2) + 1)]
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1.0]
+        for j, c2 in enumerate(s2):
+            substitution = 0.0 if c1 == c2 else get_cost((c1, c2), 1.0)
+            cost = min(
+                previous_row[j + 1] + 1,
+                current_row[j] + 1,
+                previous_row[j] + substitution,
+            )
+            if i and j and c1 == s2[j - 1] and s1[i - 1] == c2:
+                cost = min(cost, before_previous[j - 1] + 1)
+            current_row.append(cost)
+        before_previous, previous_row = previous_row, current_row
+
+    return previous_row[-1]
+
+
+def index_by_length(packages: Set[str]) -> Dict[int, List[str]]:
+    """Group package names by length for the similarity prefilter."""
+    index: Dict[int, List[str]] = {}
+    for name in packages:
+        index.setdefault(len(name), []).append(name)
+    return index
+
+
+TRIGRAM_SIZE = 3
+
+
+def _trigrams(name: str) -> List[str]:
+    """Split a lowercased name into its overlapping trigrams."""
+    return [name[i:i + TRIGRAM_SIZE] for i in range(len(name) - TRIGRAM_SIZE + 1)]
+
+
+class SimilarityIndex:
+    """Length buckets and trigram postings over a set of package names.
+
+    Used to narrow the typo search before any edit distance is computed.
+    The trigram filter uses the q-gram lemma: two names within typo
+    distance k share at least (trigrams in query - k * 4) trigrams (an
+    adjacent swap touches one trigram more than a plain edit), so pruning
+    on that count never drops a real match. Short names get no
+    usable bound and fall back to the length buckets alone.
+    """
+
+    def __init__(self, packages: Set[str]):
+        self.by_length = index_by_length(packages)
+        self.trigrams: Dict[str, List[str]] = {}
+        for name in packages:
+            for gram in set(_trigrams(name.lower())):
+                self.trigrams.setdefault(gram, []).append(name)
+
+    def candidates(self, package: str, max_distance: int) -> List[str]:
+        """Get names that can be within max_distance of package."""
+        # Names that differ in length by more than max_distance can't match
+        length = len(package)
+        pool = [
+            name
+            for n in range(max(0, length - max_distance), length + max_distance + 1)
+            for name in self.by_length.get(n, ())
+        ]
+
+        grams = _trigrams(package.lower())
+        required = len(grams) - max_distance * (TRIGRAM_SIZE + 1)
+        # Repeated trigrams would need multiset counts; not worth it here
+        if required <= 0 or len(set(grams)) != len(grams):
+            return pool
+
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for name in self.trigrams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        return [name for name in pool if shared.get(name, 0) >= required]
+
+
 def find_similar_packages(
     package: str,
     known_packages: Set[str],
-    max_distance: int = 2
+    max_distance: int = 2,
+    index: Optional[SimilarityIndex] = None
 ) -> List[Tuple[str, int]]:
     """Find packages with similar names (potential typos or slopsquatting).
 
+    Args:
+        index: Optional SimilarityIndex of known_packages. Only its
+            candidates are scored.
+
     Returns list of (package_name, distance) sorted by distance.
     """
+    if index is None:
+        index = SimilarityIndex(known_packages)
+
+    candidates = index.candidates(package, max_distance)
+
+    if RAPIDFUZZ_AVAILABLE:
+        # Bit-parallel scoring inside rapidfuzz
+        matches = _rf_process.extract(
+            package,
+            candidates,
+            scorer=_RFOSA.distance,
+            processor=str.lower,
+            score_cutoff=max_distance,
+            limit=None,
+        )
+        return _rank_similar(
+            package, [(known, distance) for known, distance, _ in matches if distance > 0]
+        )
+
     similar = []
     package_lower = package.lower()
 
-    for known in known_packages:
-        known_lower = known.lower()
-
-        # Skip if too different in length
-        if abs(len(package) - len(known)) > max_distance:
-            continue
-
-        distance = levenshtein_distance(package_lower, known_lower)
+    for known in candidates:
+        distance = typo_distance(package_lower, known.lower(), score_cutoff=max_distance)
 
         if 0 < distance <= max_distance:
             similar.append((known, distance))
 
-    # Sort by distance
-    similar.sort(key=lambda x: x[1])
-    return similar
+    return _rank_similar(package, similar)
+
+
+def _rank_similar(package: str, similar: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """Order matches by distance, then trigram Jaccard with package, then name.
+
+    Ties on distance are common ("expres" is 1 from both express and exprs),
+    and the tie-break keeps suggestions stable across set iteration orders.
+    """
+    grams = set(_trigrams(package.lower()))
+
+    def rank(item: Tuple[str, int]) -> Tuple[int, float, str]:
+        known, distance = item
+        other = set(_trigrams(known.lower()))
+        union = len(grams | other)
+        jaccard = len(grams & other) / union if union else 0.0
+        return (distance, -jaccard, known)
+
+    return sorted(similar, key=rank)
 
 
 # =============================================================================
@@ -373,21 +603,23 @@ class ImportExtractor:
         Returns: List of (package_namespace, line_number)
         """
         imports = []
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Check use statements
-            match = PHP_USE_PATTERN.match(line)
-            if match:
-                namespace = match.group(1)
-                # Get the vendor/package part (first two segments)
-                parts = namespace.split('\\')
-                if len(parts) >= 2:
-                    package = f"{parts[0]}\\{parts[1]}"
-                    imports.append((package, line_num))
-                # Skip single-word imports without namespace - these are local classes/traits
-                # or PHP builtins already covered elsewhere
-                # e.g., "use CreatesApplication;" is a local trait, not an external package
+        line_num = 1
+        pos = 0
+
+        # One regex pass over the whole file; line numbers are counted
+        # incrementally between matches instead of splitting every line
+        for match in PHP_USE_PATTERN.finditer(content):
+            line_num += content.count('\n', pos, match.start())
+            pos = match.start()
+            namespace = match.group(1)
+            # Get the vendor/package part (first two segments)
+            parts = namespace.split('\\')
+            if len(parts) >= 2:
+                package = f"{parts[0]}\\{parts[1]}"
+                imports.append((package, line_num))
+            # Skip single-word imports without namespace - these are local classes/traits
+            # or PHP builtins already covered elsewhere
+            # e.g., "use CreatesApplication;" is a local trait, not an external package
 
         return imports
 
@@ -400,36 +632,19 @@ class ImportExtractor:
         lines = content.split('\n')
 
         for line_num, line in enumerate(lines, 1):
-            # Import statements
-            for match in JS_IMPORT_PATTERN.finditer(line):
-                package = match.group(1)
-                # Get base package name (before any /)
-                base_package = package.split('/')[0]
-                # Handle scoped packages (@org/package)
-                if package.startswith('@') and '/' in package:
-                    parts = package.split('/')
-                    if len(parts) >= 2:
-                        base_package = f"{parts[0]}/{parts[1]}"
-                imports.append((base_package, line_num))
-
-            # Require statements
-            for match in JS_REQUIRE_PATTERN.finditer(line):
-                package = match.group(1)
-                base_package = package.split('/')[0]
-                if package.startswith('@') and '/' in package:
-                    parts = package.split('/')
-                    if len(parts) >= 2:
-                        base_package = f"{parts[0]}/{parts[1]}"
-                imports.append((base_package, line_num))
+            # Cheap substring check skips the regex on most lines
+            if 'import' not in line and 'require' not in line:
+                continue
 
-            # Dynamic imports
-            for match in JS_DYNAMIC_IMPORT_PATTERN.finditer(line):
-                package = match.group(1)
-                base_package = package.split('/')[0]
-                if package.startswith('@') and '/' in package:
-                    parts = package.split('/')
-                    if len(parts) >= 2:
-                        base_package = f"{parts[0]}/{parts[1]}"
+            for match in JS_MODULE_PATTERN.finditer(line):
+                package = match.group('static') or match.group('call')
+                # Base package name: before the first / ("lodash/fp"),
+                # or the first two segments when scoped ("@org/pkg/sub")
+                parts = package.split('/', 2)
+                if package[0] == '@':
+                    base_package = '/'.join(parts[:2])
+                else:
+                    base_package = parts[0]
                 imports.append((base_package, line_num))
 
         return imports
@@ -479,28 +694,96 @@ class ImportExtractor:
         """Extract imports based on language.
 
         Returns: List of (package_name, line_number)
+
+        Names are interned so lookups against the builtin sets and the
+        registry caches hit the identity fast path on comparison.
         """
-        if lang == Language.PHP:
-            return self.extract_php_imports(content)
-        elif lang in (Language.JAVASCRIPT, Language.TYPESCRIPT):
-            return self.extract_js_imports(content)
-        elif lang == Language.PYTHON:
-            return self.extract_python_imports(content)
-        return []
+        extract = _IMPORT_EXTRACTORS.get(lang)
+        if extract is None:
+            return []
+        return [(sys.intern(name), line) for name, line in extract(self, content)]
+
+
+# Language -> extractor, one dict lookup instead of an if/elif chain
+_IMPORT_EXTRACTORS: Dict[Language, Callable[[ImportExtractor, str], List[Tuple[str, int]]]] = {
+    Language.PHP: ImportExtractor.extract_php_imports,
+    Language.JAVASCRIPT: ImportExtractor.extract_js_imports,
+    Language.TYPESCRIPT: ImportExtractor.extract_js_imports,
+    Language.PYTHON: ImportExtractor.extract_python_imports,
+}
+
+# Every import the extractor can find contains one of these substrings
+_IMPORT_KEYWORDS: Dict[Language, Tuple[str, ...]] = {
+    Language.PHP: ('use',),
+    Language.JAVASCRIPT: ('import', 'require'),
+    Language.TYPESCRIPT: ('import', 'require'),
+    Language.PYTHON: ('import',),
+}
 
 
 # =============================================================================
 # PACKAGE REGISTRY
 # =============================================================================
 
+def _load_json(path: Path) -> Any:
+    """Parse a JSON manifest (composer.json, package.json, lock files)."""
+    return json_loads(path.read_bytes())
+
+
+# Files and directories a PackageRegistry reads; a change to any of them
+# invalidates the shared registry for that project
+REGISTRY_SOURCES = (
+    'composer.json', 'composer.lock', 'vendor', 'vendor/composer/installed.json',
+    'package.json', 'node_modules',
+    'requirements.txt', 'requirements-dev.txt', 'requirements-test.txt',
+    'pyproject.toml', 'setup.py',
+)
+
+
+def _registry_fingerprint(working_dir: Path) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """(mtime_ns, size) of each registry source, None if missing."""
+    fingerprint = []
+    for name in REGISTRY_SOURCES:
+        try:
+            st = os.stat(working_dir / name)
+            fingerprint.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
+
 class PackageRegistry:
     """Reads and caches package registry information."""
 
+    # Resolved project path -> (fingerprint, registry), see for_project()
+    _shared: LRUCache = LRUCache()
+
     def __init__(self, working_dir: str):
         self.working_dir = Path(working_dir)
-        self._cache: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, Tuple[Set[str], bool]] = {}
+        self._similarity_index: Dict[Language, SimilarityIndex] = {}
+        self._lower_cache: Dict[Language, FrozenSet[str]] = {}
+        self._prefix_index: Dict[Language, Tuple[FrozenSet[str], List[str]]] = {}
         self._namespace_cache: Dict[str, Set[str]] = {}
 
+    @classmethod
+    def for_project(cls, working_dir: str) -> 'PackageRegistry':
+        """Get a registry for working_dir, shared until its manifests change.
+
+        The server builds a PackageValidator per tool call; reusing the
+        registry skips re-parsing manifests and re-scanning vendor/ and
+        node_modules/ while their mtimes and sizes stay the same.
+        """
+        key = os.path.abspath(working_dir)
+        fingerprint = _registry_fingerprint(Path(key))
+        if key in cls._shared:
+            cached_fingerprint, registry = cls._shared[key]
+            if cached_fingerprint == fingerprint:
+                return registry
+        registry = cls(working_dir)
+        cls._shared[key] = (fingerprint, registry)
+        return registry
+
     def get_installed_namespaces(self) -> Set[str]:
         """Get all installed namespaces by checking vendor directory structure.
 
@@ -521,8 +804,7 @@ class PackageRegistry:
         installed_json = self.working_dir / 'vendor' / 'composer' / 'installed.json'
         if installed_json.exists():
             try:
-                with open(installed_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json(installed_json)
 
                 # Composer 2.x format
                 packages = data.get('packages', data) if isinstance(data, dict) else data
@@ -572,8 +854,7 @@ class PackageRegistry:
         composer_lock = self.working_dir / 'composer.lock'
         if composer_lock.exists():
             try:
-                with open(composer_lock, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json(composer_lock)
 
                 for pkg_list in ['packages', 'packages-dev']:
                     if pkg_list not in data:
@@ -649,7 +930,7 @@ class PackageRegistry:
             vendor_variants = [
                 vendor_name,
                 vendor_name.replace('http', '-http'),  # GuzzleHttp → guzzlehttp
-                '-'.join(re.findall(r'[A-Z][a-z]*', parts[0])).lower(),  # CamelCase → kebab-case
+                '-'.join(CAMEL_CASE_WORD_PATTERN.findall(parts[0])).lower(),  # CamelCase → kebab-case
             ]
 
             for vendor in vendor_variants:
@@ -733,7 +1014,7 @@ class PackageRegistry:
         """
         cache_key = 'composer'
         if cache_key in self._cache:
-            return self._cache[cache_key], True
+            return self._cache[cache_key]
 
         packages: Set[str] = set()
         composer_json = self.working_dir / 'composer.json'
@@ -745,8 +1026,7 @@ class PackageRegistry:
         if composer_json.exists():
             found = True
             try:
-                with open(composer_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json(composer_json)
 
                 # require and require-dev
                 for section in ['require', 'require-dev']:
@@ -772,8 +1052,7 @@ class PackageRegistry:
         # Also check composer.lock for more accurate package list
         if composer_lock.exists():
             try:
-                with open(composer_lock, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json(composer_lock)
 
                 for pkg_list in ['packages', 'packages-dev']:
                     if pkg_list in data:
@@ -798,8 +1077,7 @@ class PackageRegistry:
                         if package.is_dir() and not package.name.startswith('.'):
                             packages.add(f"{vendor.name}/{package.name}")
 
-        self._cache[cache_key] = packages
-        return packages, found
+        return self._store(cache_key, packages, found)
 
     def get_npm_packages(self) -> Tuple[Set[str], bool]:
         """Get packages from package.json.
@@ -808,7 +1086,7 @@ class PackageRegistry:
         """
         cache_key = 'npm'
         if cache_key in self._cache:
-            return self._cache[cache_key], True
+            return self._cache[cache_key]
 
         packages: Set[str] = set()
         package_json = self.working_dir / 'package.json'
@@ -817,8 +1095,7 @@ class PackageRegistry:
             return packages, False
 
         try:
-            with open(package_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json(package_json)
 
             for section in ['dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies']:
                 if section in data:
@@ -845,8 +1122,7 @@ class PackageRegistry:
                     elif not item.name.startswith('.'):
                         packages.add(item.name)
 
-        self._cache[cache_key] = packages
-        return packages, True
+        return self._store(cache_key, packages, True)
 
     def get_pip_packages(self) -> Tuple[Set[str], bool]:
         """Get packages from requirements.txt, pyproject.toml, or setup.py.
@@ -855,7 +1131,7 @@ class PackageRegistry:
         """
         cache_key = 'pip'
         if cache_key in self._cache:
-            return self._cache[cache_key], True
+            return self._cache[cache_key]
 
         packages: Set[str] = set()
         found = False
@@ -869,9 +1145,10 @@ class PackageRegistry:
                     with open(req_path, 'r', encoding='utf-8') as f:
                         for line in f:
                             line = line.strip()
-                            if line and not line.startswith('#') and not line.startswith('-'):
+                            # Skip comments and pip options (-r, -e, --index-url)
+                            if line and not line.startswith(('#', '-')):
                                 # Extract package name (before version specifier)
-                                match = re.match(r'^([a-zA-Z0-9_-]+)', line)
+                                match = REQUIREMENT_NAME_PATTERN.match(line)
                                 if match:
                                     packages.add(match.group(1).lower())
                 except IOError as e:
@@ -887,8 +1164,7 @@ class PackageRegistry:
 
                 # Simple regex extraction (not a full TOML parser)
                 # Match dependencies in [project.dependencies] or [tool.poetry.dependencies]
-                dep_pattern = re.compile(r'^\s*([a-zA-Z0-9_-]+)\s*[=<>]', re.MULTILINE)
-                for match in dep_pattern.finditer(content):
+                for match in PYPROJECT_DEP_PATTERN.finditer(content):
                     packages.add(match.group(1).lower())
 
             except IOError as e:
@@ -903,16 +1179,26 @@ class PackageRegistry:
                     content = f.read()
 
                 # Extract from install_requires
-                match = re.search(r'install_requires\s*=\s*\[(.*?)\]', content, re.DOTALL)
+                match = SETUP_INSTALL_REQUIRES_PATTERN.search(content)
                 if match:
                     deps = match.group(1)
-                    for dep_match in re.finditer(r"['\"]([a-zA-Z0-9_-]+)", deps):
+                    for dep_match in SETUP_DEP_NAME_PATTERN.finditer(deps):
                         packages.add(dep_match.group(1).lower())
 
             except IOError as e:
                 logger.warning(f"Failed to read setup.py: {e}")
 
-        self._cache[cache_key] = packages
+        return self._store(cache_key, packages, found)
+
+    def _store(self, cache_key: str, packages: Set[str], found: bool) -> Tuple[Set[str], bool]:
+        """Cache a parsed registry with interned names.
+
+        Interned names match the interned import names from ImportExtractor
+        by identity, and the lowercase and similarity indexes built on top
+        share these objects instead of holding copies.
+        """
+        packages = {sys.intern(name) for name in packages}
+        self._cache[cache_key] = (packages, found)
         return packages, found
 
     def get_packages(self, lang: Language) -> Tuple[Set[str], bool]:
@@ -928,22 +1214,113 @@ class PackageRegistry:
             return self.get_pip_packages()
         return set(), False
 
+    def get_similarity_index(self, lang: Language) -> SimilarityIndex:
+        """Get the typo search index over known packages for a language."""
+        if lang not in self._similarity_index:
+            packages, _ = self.get_packages(lang)
+            self._similarity_index[lang] = SimilarityIndex(packages)
+        return self._similarity_index[lang]
+
+    def get_packages_lower(self, lang: Language) -> FrozenSet[str]:
+        """Get lowercased known packages for case-insensitive lookups."""
+        if lang not in self._lower_cache:
+            packages, _ = self.get_packages(lang)
+            # Already-lowercase names (most npm/pip ones) reuse the same object
+            self._lower_cache[lang] = frozenset(
+                p if p.islower() else sys.intern(p.lower()) for p in packages
+            )
+        return self._lower_cache[lang]
+
+    def matches_known_prefix(self, lang: Language, package: str) -> bool:
+        """Check if package and a known name (or its namespace form) prefix each other.
+
+        Known names are kept both as a set and sorted, so "package starts
+        with a known name" is one set probe per prefix of package, and
+        "a known name starts with package" is one bisect.
+        """
+        if lang not in self._prefix_index:
+            packages, _ = self.get_packages(lang)
+            names = set(packages)
+            names.update(known.replace('/', '\\') for known in packages)
+            self._prefix_index[lang] = (frozenset(names), sorted(names))
+        names, ordered = self._prefix_index[lang]
+
+        if any(package[:end] in names for end in range(len(package) + 1)):
+            return True
+        pos = bisect_left(ordered, package)
+        return pos < len(ordered) and ordered[pos].startswith(package)
+
     def clear_cache(self):
         """Clear the package cache."""
         self._cache.clear()
+        self._similarity_index.clear()
+        self._lower_cache.clear()
+        self._prefix_index.clear()
+
+
+# =============================================================================
+# STANDARD LIBRARY LOOKUP
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def _lowercase_stdlib(lang: Language) -> FrozenSet[str]:
+    """Lowercased standard library names, built once per language."""
+    return frozenset(s.lower() for s in _stdlib_for(lang))
+
+
+def _stdlib_for(lang: Language) -> FrozenSet[str]:
+    """Get the standard library / builtin names for a language."""
+    if lang == Language.PYTHON:
+        return PYTHON_STDLIB
+    elif lang in (Language.JAVASCRIPT, Language.TYPESCRIPT):
+        return NODE_BUILTINS
+    elif lang == Language.PHP:
+        return PHP_BUILTINS
+    return frozenset()
 
 
 # =============================================================================
 # PACKAGE VALIDATOR
 # =============================================================================
 
+# Max memoized validate_content() results, shared by all validators
+VALIDATION_CACHE_SIZE = 1024
+
+
+def _copy_result(result: PackageValidationResult) -> PackageValidationResult:
+    """Copy a memoized result so callers can't mutate the cached one."""
+    return replace(result, issues=[
+        replace(issue, suggestions=list(issue.suggestions)) for issue in result.issues
+    ])
+
+
 class PackageValidator:
     """Main validator for detecting hallucinated package imports."""
 
+    # (project path, content digest, file path, lang) -> (registry, result).
+    # Shared because the server builds a validator per tool call; an entry
+    # only counts while its project still has the same registry, i.e.
+    # until for_project() sees changed manifests.
+    _shared_results: LRUCache = LRUCache(maxsize=VALIDATION_CACHE_SIZE)
+
     def __init__(self, working_dir: str):
         self.working_dir = Path(working_dir)
         self.extractor = ImportExtractor()
-        self.registry = PackageRegistry(working_dir)
+        self.registry = PackageRegistry.for_project(working_dir)
+        self._project_key = os.path.abspath(working_dir)
+        # (lang, package) -> known?  Misses are cached too, so repeated
+        # unknown imports skip the namespace and prefix scans.
+        self._known_cache: Dict[Tuple[Language, str], bool] = {}
+
+    def clear_cache(self):
+        """Clear memoized results and the package registry cache."""
+        self.clear_results()
+        self._known_cache.clear()
+        self.registry.clear_cache()
+
+    def clear_results(self):
+        """Drop memoized validation results but keep the loaded registry."""
+        PackageValidator._shared_results.clear()
 
     def validate_file(self, file_path: str) -> PackageValidationResult:
         """Validate a file for hallucinated package imports.
@@ -954,16 +1331,15 @@ class PackageValidator:
         if not path.is_absolute():
             path = self.working_dir / path
 
-        if not path.exists():
-            return PackageValidationResult(issues=[], validated_count=0, registry_found=False)
-
+        # Language comes from the suffix, so check it before touching disk
         lang = detect_language(str(path))
         if not lang:
             return PackageValidationResult(issues=[], validated_count=0, registry_found=False)
 
+        # One open+read; a missing file raises FileNotFoundError (an OSError)
         try:
-            content = path.read_text(encoding='utf-8', errors='ignore')
-        except IOError:
+            content = path.read_bytes().decode('utf-8', errors='ignore')
+        except OSError:
             return PackageValidationResult(issues=[], validated_count=0, registry_found=False)
 
         return self.validate_content(content, str(path), lang)
@@ -974,7 +1350,36 @@ class PackageValidator:
         file_path: str,
         lang: Language
     ) -> PackageValidationResult:
-        """Validate content for hallucinated package imports."""
+        """Validate content for hallucinated package imports.
+
+        Results are memoized per (project, content digest, file path,
+        language) across validators until the project's manifests change
+        or clear_results() is called. Callers get a copy.
+        """
+        # Empty, comment-only and import-free files skip hashing and regexes
+        if not any(keyword in content for keyword in _IMPORT_KEYWORDS.get(lang, ())):
+            return PackageValidationResult(issues=[], validated_count=0, registry_found=True)
+
+        digest = hashlib.blake2b(
+            content.encode('utf-8', 'surrogatepass'), digest_size=16
+        ).digest()
+        key = (self._project_key, digest, file_path, lang)
+        if key in self._shared_results:
+            registry, result = self._shared_results[key]
+            if registry is self.registry:
+                return _copy_result(result)
+
+        result = self._validate_content(content, file_path, lang)
+        self._shared_results[key] = (self.registry, result)
+        return _copy_result(result)
+
+    def _validate_content(
+        self,
+        content: str,
+        file_path: str,
+        lang: Language
+    ) -> PackageValidationResult:
+        """Validate content without consulting the memo cache."""
 
         # Extract imports
         imports = self.extractor.extract_imports(content, lang)
@@ -987,18 +1392,31 @@ class PackageValidator:
         # Get standard library for filtering
         stdlib = self._get_stdlib(lang)
 
-        issues = []
-        validated_count = 0
+        # Classify each distinct name once; files often repeat an import
+        # (one vendor namespace per `use` line, several `from x import`)
+        unknown = [
+            package
+            for package in dict.fromkeys(package for package, _ in imports)
+            if not self._is_stdlib(package, lang, stdlib)
+            and not self._is_known_package(package, lang, known_packages)
+        ]
+        if not unknown:
+            return PackageValidationResult(
+                issues=[], validated_count=len(imports), registry_found=registry_found
+            )
 
-        for package, line in imports:
-            validated_count += 1
+        # One typo search per unknown name, shared by all its occurrences
+        index = self.registry.get_similarity_index(lang)
+        similar_by_package = {
+            package: find_similar_packages(package, known_packages, index=index)
+            for package in unknown
+        }
 
-            # Skip standard library
-            if self._is_stdlib(package, lang, stdlib):
-                continue
+        issues = []
+        validated_count = len(imports)
 
-            # Check if package is known
-            if self._is_known_package(package, lang, known_packages):
+        for package, line in imports:
+            if package not in similar_by_package:
                 continue
 
             # Package not found - create issue
@@ -1008,7 +1426,8 @@ class PackageValidator:
                 file_path=file_path,
                 lang=lang,
                 known_packages=known_packages,
-                registry_found=registry_found
+                registry_found=registry_found,
+                similar=similar_by_package[package]
             )
             if issue:
                 issues.append(issue)
@@ -1019,17 +1438,11 @@ class PackageValidator:
             registry_found=registry_found
         )
 
-    def _get_stdlib(self, lang: Language) -> Set[str]:
+    def _get_stdlib(self, lang: Language) -> FrozenSet[str]:
         """Get standard library for a language."""
-        if lang == Language.PYTHON:
-            return PYTHON_STDLIB
-        elif lang in (Language.JAVASCRIPT, Language.TYPESCRIPT):
-            return NODE_BUILTINS
-        elif lang == Language.PHP:
-            return PHP_BUILTINS
-        return set()
+        return _stdlib_for(lang)
 
-    def _is_stdlib(self, package: str, lang: Language, stdlib: Set[str]) -> bool:
+    def _is_stdlib(self, package: str, lang: Language, stdlib: FrozenSet[str]) -> bool:
         """Check if package is a standard library module."""
         # Direct match
         if package in stdlib:
@@ -1037,7 +1450,7 @@ class PackageValidator:
 
         # Case-insensitive for Python
         if lang == Language.PYTHON:
-            if package.lower() in {s.lower() for s in stdlib}:
+            if package.lower() in _lowercase_stdlib(lang):
                 return True
 
         # PHP: Check if it's a built-in class
@@ -1060,10 +1473,23 @@ class PackageValidator:
         if package in known_packages:
             return True
 
+        key = (lang, package)
+        if key not in self._known_cache:
+            self._known_cache[key] = self._lookup_package(package, lang, known_packages)
+        return self._known_cache[key]
+
+    def _lookup_package(
+        self,
+        package: str,
+        lang: Language,
+        known_packages: Set[str]
+    ) -> bool:
+        """Slow path of _is_known_package (case-insensitive and PHP namespaces)."""
+        known_lower = self.registry.get_packages_lower(lang)
+
         # Case-insensitive match for npm/pip
         if lang in (Language.JAVASCRIPT, Language.TYPESCRIPT, Language.PYTHON):
-            package_lower = package.lower()
-            if any(p.lower() == package_lower for p in known_packages):
+            if package.lower() in known_lower:
                 return True
 
         # PHP: Check namespace against installed packages
@@ -1073,21 +1499,16 @@ class PackageValidator:
                 return True
 
             # PRIORITY 2: Static namespace mapping (fallback for projects without vendor/)
-            package_with_slash = package + '\\'
             for composer_pkg, namespaces in PHP_NAMESPACE_MAPPING.items():
-                if composer_pkg in known_packages or composer_pkg.lower() in {p.lower() for p in known_packages}:
+                if composer_pkg in known_packages or composer_pkg.lower() in known_lower:
                     for ns in namespaces:
                         ns_clean = ns.rstrip('\\')
                         if package == ns_clean or package.startswith(ns_clean + '\\'):
                             return True
 
             # PRIORITY 3: Direct namespace/package matching (PSR-4 from composer.json)
-            for known in known_packages:
-                if known.startswith(package) or package.startswith(known):
-                    return True
-                known_ns = known.replace('/', '\\')
-                if package.startswith(known_ns) or known_ns.startswith(package):
-                    return True
+            if self.registry.matches_known_prefix(lang, package):
+                return True
 
         return False
 
@@ -1098,12 +1519,22 @@ class PackageValidator:
         file_path: str,
         lang: Language,
         known_packages: Set[str],
-        registry_found: bool
+        registry_found: bool,
+        similar: Optional[List[Tuple[str, int]]] = None
     ) -> Optional[PackageIssue]:
-        """Create a PackageIssue for an unknown package."""
+        """Create a PackageIssue for an unknown package.
+
+        Args:
+            similar: Precomputed find_similar_packages() result, if any.
+        """
 
         # Find similar packages (potential typos/slopsquatting)
-        similar = find_similar_packages(package, known_packages)
+        if similar is None:
+            similar = find_similar_packages(
+                package,
+                known_packages,
+                index=self.registry.get_similarity_index(lang)
+            )
 
         # Calculate confidence
         confidence = self._calculate_confidence(
@@ -1164,12 +1595,17 @@ class PackageValidator:
 
         # Similar package exists -> HIGHER confidence (likely typo/slopsquatting!)
         if similar:
-            closest_distance = similar[0][1]
+            closest, closest_distance = similar[0]
             if closest_distance == 1:
                 confidence = 0.95  # Very likely typo
             elif closest_distance == 2:
                 confidence = 0.85
 
+            # Neighbouring keys or lookalike characters -> classic squatting
+            weighted = weighted_typo_distance(package.lower(), closest.lower())
+            if weighted < closest_distance:
+                confidence = min(confidence + 0.03, 0.98)
+
         # Very common package names -> lower confidence
         common_packages = {
             'utils', 'helpers', 'common', 'shared', 'lib', 'core',
@@ -1187,7 +1623,7 @@ class PackageValidator:
             confidence *= 1.2
 
         # Package with weird characters (potential attack)
-        if re.search(r'[^a-zA-Z0-9_\-/@.]', package):
+        if SUSPICIOUS_CHAR_PATTERN.search(package):
             confidence = 0.98
 
         return min(1.0, max(0.0, confidence))
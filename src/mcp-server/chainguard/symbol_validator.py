@@ -29,6 +29,47 @@ from .symbol_patterns import (
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# HEURISTIC PATTERNS (compiled once, used per call / per line)
+# =============================================================================
+
+# String literal contents; interpolated strings ({, ${) are left alone
+DOUBLE_QUOTED_PATTERN = re.compile(r'(?<![f$])"([^"{\\]|\\.)*"')
+SINGLE_QUOTED_PATTERN = re.compile(r"'([^'\\]|\\.)*'")
+SINGLE_QUOTED_PY_PATTERN = re.compile(r"(?<!f)'([^'{\\]|\\.)*'")
+TEMPLATE_LITERAL_PATTERN = re.compile(r'`[^`$]*`')
+
+# Import statements counted by _has_many_imports
+IMPORT_COUNT_PATTERNS: Dict[Language, "re.Pattern[str]"] = {
+    Language.PHP: re.compile(r'use\s+\w+'),
+    Language.JAVASCRIPT: re.compile(r'(?:import|require)\s*\(?'),
+    Language.TYPESCRIPT: re.compile(r'(?:import|require)\s*\(?'),
+    Language.PYTHON: re.compile(r'(?:import|from)\s+\w+'),
+    Language.CSHARP: re.compile(r'using\s+\w+'),
+    Language.GO: re.compile(r'import\s+'),
+    Language.RUST: re.compile(r'use\s+\w+'),
+}
+
+# Names that look like external library methods (getX, onX, ... or exactly
+# Async/Sync/Callback/Handler), one alternation instead of a pattern list
+EXTERNAL_NAME_PATTERN = re.compile(
+    r'(?:get|set|is|has|on|handle|fetch)[A-Z]|(?:Async|Sync|Callback|Handler)$'
+)
+
+# Common method name prefixes
+COMMON_METHOD_PATTERN = re.compile(
+    r'get|set|is|has|can|should|will|did|on|before|after'
+    r'|create|update|delete|find|fetch|load|save|store'
+    r'|handle|process|execute|perform|run|start|stop'
+    r'|init|setup|configure|validate|transform|convert'
+    r'|add|remove|clear|reset|enable|disable',
+    re.IGNORECASE
+)
+
+# camelCase name (for snake_case languages)
+CAMEL_CASE_NAME_PATTERN = re.compile(r'[a-z]+[A-Z]')
+
+
 # =============================================================================
 # DATA CLASSES
 # =============================================================================
@@ -143,22 +184,22 @@ class SymbolExtractor:
         # - Python f-strings: f"...{...}..."
         # - C# interpolated: $"...{...}..."
         # Pattern: "..." that don't contain { (interpolation marker)
-        line = re.sub(r'(?<![f$])"([^"{\\]|\\.)*"', '""', line)
+        line = DOUBLE_QUOTED_PATTERN.sub('""', line)
 
         # Replace single-quoted string contents (no interpolation in single quotes for most langs)
         # BUT skip Python f-strings: f'...{...}...'
         if lang == Language.PYTHON:
             # Skip f-strings with single quotes
-            line = re.sub(r"(?<!f)'([^'{\\]|\\.)*'", "''", line)
+            line = SINGLE_QUOTED_PY_PATTERN.sub("''", line)
         else:
-            line = re.sub(r"'([^'\\]|\\.)*'", "''", line)
+            line = SINGLE_QUOTED_PATTERN.sub("''", line)
 
         # For JavaScript/TypeScript: handle template literals
         if lang in (Language.JAVASCRIPT, Language.TYPESCRIPT):
             # Only strip simple template literals WITHOUT interpolation
             # Template literals with ${...} contain real code, so keep them
             # Pattern: backtick strings that don't contain ${
-            line = re.sub(r'`[^`$]*`', '``', line)
+            line = TEMPLATE_LITERAL_PATTERN.sub('``', line)
 
         # For PHP: handle heredoc/nowdoc markers but not full content
         # (multi-line heredocs are handled by _find_docstring_lines)
@@ -383,19 +424,9 @@ class ConfidenceCalculator:
 
     def _has_many_imports(self, content: str, lang: Language) -> bool:
         """Check if file has many imports (suggests external dependencies)."""
-        import_patterns = {
-            Language.PHP: r'use\s+\w+',
-            Language.JAVASCRIPT: r'(?:import|require)\s*\(?',
-            Language.TYPESCRIPT: r'(?:import|require)\s*\(?',
-            Language.PYTHON: r'(?:import|from)\s+\w+',
-            Language.CSHARP: r'using\s+\w+',
-            Language.GO: r'import\s+',
-            Language.RUST: r'use\s+\w+',
-        }
-
-        pattern = import_patterns.get(lang)
+        pattern = IMPORT_COUNT_PATTERNS.get(lang)
         if pattern:
-            matches = re.findall(pattern, content)
+            matches = pattern.findall(content)
             return len(matches) > 5
 
         return False
@@ -403,40 +434,18 @@ class ConfidenceCalculator:
     def _looks_like_external(self, name: str, lang: Language) -> bool:
         """Check if name looks like an external library method."""
         # Common external prefixes/suffixes
-        external_patterns = [
-            r'^get[A-Z]', r'^set[A-Z]', r'^is[A-Z]', r'^has[A-Z]',
-            r'^on[A-Z]', r'^handle[A-Z]', r'^fetch[A-Z]',
-            r'Async$', r'Sync$', r'Callback$', r'Handler$',
-        ]
-
-        for pattern in external_patterns:
-            if re.match(pattern, name):
-                return True
-
-        return False
+        return EXTERNAL_NAME_PATTERN.match(name) is not None
 
     def _is_common_pattern(self, name: str) -> bool:
         """Check if name follows common method naming patterns."""
-        common_patterns = [
-            r'^(get|set|is|has|can|should|will|did|on|before|after)',
-            r'^(create|update|delete|find|fetch|load|save|store)',
-            r'^(handle|process|execute|perform|run|start|stop)',
-            r'^(init|setup|configure|validate|transform|convert)',
-            r'^(add|remove|clear|reset|enable|disable)',
-        ]
-
-        for pattern in common_patterns:
-            if re.match(pattern, name, re.IGNORECASE):
-                return True
-
-        return False
+        return COMMON_METHOD_PATTERN.match(name) is not None
 
     def _naming_convention_mismatch(self, name: str, lang: Language) -> bool:
         """Check for naming convention mismatch."""
         # Python/Rust use snake_case
         if lang in (Language.PYTHON, Language.RUST, Language.GO):
             # If name is CamelCase in snake_case language
-            if re.match(r'^[a-z]+[A-Z]', name):
+            if CAMEL_CASE_NAME_PATTERN.match(name):
                 return True
 
         # PHP/JS/TS/C# use camelCase/PascalCase
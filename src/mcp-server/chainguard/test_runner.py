@@ -10,16 +10,20 @@ See LICENSE file in the project root for full license information.
 """
 
 import re
+import sys
+import time
 import asyncio
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
 from .config import (
     TEST_RUN_TIMEOUT_SECONDS,
     TEST_OUTPUT_MAX_LENGTH,
     TEST_FAILED_LINES_MAX,
+    DATACLASS_SLOTS,
     logger
 )
 
@@ -28,7 +32,7 @@ from .config import (
 # Data Models
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TestConfig:
     """Configuration for test execution."""
     command: str = ""              # z.B. "./vendor/bin/phpunit"
@@ -37,7 +41,12 @@ class TestConfig:
     working_dir: str = ""          # Optional: Überschreibt project_path
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "command": self.command,
+            "args": self.args,
+            "timeout": self.timeout,
+            "working_dir": self.working_dir,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TestConfig":
@@ -51,7 +60,7 @@ class TestConfig:
         return parts
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TestResult:
     """Result of a test run."""
     success: bool = False
@@ -65,14 +74,36 @@ class TestResult:
     timestamp: str = ""
     exit_code: int = -1
 
+    def __post_init__(self):
+        # Framework names come from a handful of values; share one string
+        # object per name (also for results loaded from JSON)
+        self.framework = sys.intern(self.framework)
+
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "success": self.success,
+            "passed": self.passed,
+            "failed": self.failed,
+            "total": self.total,
+            "duration": self.duration,
+            "framework": self.framework,
+            "output": self.output,
+            "error_lines": list(self.error_lines),
+            "timestamp": self.timestamp,
+            "exit_code": self.exit_code,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TestResult":
         return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
 
 
+@lru_cache(maxsize=64)
+def _iso_to_epoch(value: str) -> float:
+    """Parse a stored ISO timestamp once; status renders reuse the epoch."""
+    return datetime.fromisoformat(value).timestamp()
+
+
 # =============================================================================
 # Output Parser
 # =============================================================================
@@ -86,50 +117,64 @@ class OutputParser:
     # Framework-spezifische Patterns
     PATTERNS = {
         "phpunit": {
-            "success": re.compile(r"OK \((\d+) tests?, (\d+) assertions?\)"),
-            "failure": re.compile(r"FAILURES!\s*Tests: (\d+),.*?Failures: (\d+)", re.DOTALL),
-            "error": re.compile(r"ERRORS!\s*Tests: (\d+),.*?Errors: (\d+)", re.DOTALL),
+            "success": re.compile(r"OK \((?P<passed>\d+) tests?, (?P<assertions>\d+) assertions?\)"),
+            "failure": re.compile(r"FAILURES!\s*Tests: (?P<total>\d+),.*?Failures: (?P<failed>\d+)", re.DOTALL),
+            "error": re.compile(r"ERRORS!\s*Tests: (?P<total>\d+),.*?Errors: (?P<failed>\d+)", re.DOTALL),
             "tests_line": re.compile(r"Tests: (\d+),.*?(?:Failures: (\d+))?", re.DOTALL),
             "indicators": ["PHPUnit", "phpunit", ".phpunit"],
         },
         "jest": {
-            "success": re.compile(r"Tests:\s+(\d+) passed,\s+(\d+) total"),
-            "failure": re.compile(r"Tests:\s+(\d+) failed,\s+(\d+) passed,\s+(\d+) total"),
+            "success": re.compile(r"Tests:\s+(?P<passed>\d+) passed,\s+(?P<total>\d+) total"),
+            "failure": re.compile(r"Tests:\s+(?P<failed>\d+) failed,\s+(?P<passed>\d+) passed,\s+(?P<total>\d+) total"),
             "indicators": ["PASS ", "FAIL ", "jest", "Test Suites:"],  # Space to avoid matching PASSED/FAILED
         },
         "pytest": {
-            "success": re.compile(r"(\d+) passed"),
-            "failure": re.compile(r"(\d+) failed"),
+            "success": re.compile(r"(?P<passed>\d+) passed"),
+            "failure": re.compile(r"(?P<failed>\d+) failed"),
             "total": re.compile(r"(\d+) passed|(\d+) failed|(\d+) error"),
             "indicators": ["pytest", "===", "PASSED", "FAILED"],
         },
         "mocha": {
-            "success": re.compile(r"(\d+) passing"),
-            "failure": re.compile(r"(\d+) failing"),
+            "success": re.compile(r"(?P<passed>\d+) passing"),
+            "failure": re.compile(r"(?P<failed>\d+) failing"),
             "indicators": ["passing", "failing", "mocha"],
         },
         "vitest": {
-            "success": re.compile(r"(\d+) passed"),
-            "failure": re.compile(r"(\d+) failed"),
+            "success": re.compile(r"(?P<passed>\d+) passed"),
+            "failure": re.compile(r"(?P<failed>\d+) failed"),
             "indicators": ["VITEST", "vitest"],
         },
     }
 
-    # Patterns für Fehlerzeilen
-    ERROR_PATTERNS = [
-        re.compile(r"(?:FAILED|FAILURE|ERROR|Error|Failed).*", re.IGNORECASE),
-        re.compile(r"(?:Expected|Actual|AssertionError).*", re.IGNORECASE),
-        re.compile(r"at .*:\d+:\d+"),  # Stack traces
-        re.compile(r"✗.*|✕.*"),  # Unicode failure markers
-    ]
+    # Framework-Indikatoren in Prioritätsreihenfolge (einmal aufgelöst)
+    _INDICATORS = tuple(
+        (indicator, framework)
+        for framework, info in PATTERNS.items()
+        for indicator in info.get("indicators", [])
+    )
+
+    # Fehlerzeilen-Marker, zu einem Pattern verschmolzen (ein search() pro Zeile)
+    ERROR_LINE_PATTERN = re.compile(
+        r"(?i:FAILED|FAILURE|ERROR|Expected|Actual)"
+        r"|at .*:\d+:\d+"  # Stack traces
+        r"|[✗✕]"  # Unicode failure markers
+    )
+
+    # Notwendige Teilstrings für ERROR_LINE_PATTERN: billiger Vorfilter, damit
+    # die Regex nur auf Kandidatenzeilen läuft
+    _ERROR_HINTS_LOWER = ("fail", "error", "expected", "actual")
+    _ERROR_HINTS = ("at ", "✗", "✕")
+
+    # Zusammenfassungen stehen am Ende des Outputs: Zähler werden zuerst nur
+    # in diesem Rest gesucht (ab Zeilenanfang, damit keine Zahl halbiert wird)
+    SUMMARY_TAIL_LENGTH = 4096
 
     @classmethod
     def detect_framework(cls, output: str) -> str:
         """Erkennt das Test-Framework anhand des Outputs."""
-        for framework, info in cls.PATTERNS.items():
-            for indicator in info.get("indicators", []):
-                if indicator in output:
-                    return framework
+        for indicator, framework in cls._INDICATORS:
+            if indicator in output:
+                return framework
         return "generic"
 
     @classmethod
@@ -168,87 +213,105 @@ class OutputParser:
     def _parse_framework(cls, output: str, result: TestResult, framework: str) -> TestResult:
         """Parst Output für ein spezifisches Framework."""
         patterns = cls.PATTERNS[framework]
+        tail = cls._summary_tail(output)
 
         # PHPUnit
         if framework == "phpunit":
-            success_match = patterns["success"].search(output)
+            success_match = cls._search_summary(patterns["success"], output, tail)
             if success_match:
                 result.success = True
-                result.passed = int(success_match.group(1))
+                result.passed = int(success_match["passed"])
                 result.total = result.passed
                 result.failed = 0
                 return result
 
-            failure_match = patterns["failure"].search(output)
+            failure_match = cls._search_summary(patterns["failure"], output, tail)
             if failure_match:
                 result.success = False
-                result.total = int(failure_match.group(1))
-                result.failed = int(failure_match.group(2))
+                result.total = int(failure_match["total"])
+                result.failed = int(failure_match["failed"])
                 result.passed = result.total - result.failed
                 return result
 
         # Jest
         elif framework == "jest":
-            success_match = patterns["success"].search(output)
+            success_match = cls._search_summary(patterns["success"], output, tail)
             if success_match:
                 result.success = True
-                result.passed = int(success_match.group(1))
-                result.total = int(success_match.group(2))
+                result.passed = int(success_match["passed"])
+                result.total = int(success_match["total"])
                 result.failed = result.total - result.passed
                 return result
 
-            failure_match = patterns["failure"].search(output)
+            failure_match = cls._search_summary(patterns["failure"], output, tail)
             if failure_match:
                 result.success = False
-                result.failed = int(failure_match.group(1))
-                result.passed = int(failure_match.group(2))
-                result.total = int(failure_match.group(3))
+                result.failed = int(failure_match["failed"])
+                result.passed = int(failure_match["passed"])
+                result.total = int(failure_match["total"])
                 return result
 
-        # pytest
-        elif framework == "pytest":
-            passed_match = patterns["success"].search(output)
-            failed_match = patterns["failure"].search(output)
+        # pytest/mocha/vitest: getrennte Passed- und Failed-Zähler
+        else:
+            passed_match = cls._search_summary(patterns["success"], output, tail)
+            failed_match = cls._search_summary(patterns["failure"], output, tail)
 
-            result.passed = int(passed_match.group(1)) if passed_match else 0
-            result.failed = int(failed_match.group(1)) if failed_match else 0
+            result.passed = int(passed_match["passed"]) if passed_match else 0
+            result.failed = int(failed_match["failed"]) if failed_match else 0
             result.total = result.passed + result.failed
             result.success = result.failed == 0 and result.passed > 0
 
-        # mocha/vitest
-        elif framework in ["mocha", "vitest"]:
-            passed_match = patterns["success"].search(output)
-            failed_match = patterns["failure"].search(output)
+        return result
 
-            result.passed = int(passed_match.group(1)) if passed_match else 0
-            result.failed = int(failed_match.group(1)) if failed_match else 0
-            result.total = result.passed + result.failed
-            result.success = result.failed == 0 and result.passed > 0
+    @classmethod
+    def _summary_tail(cls, output: str) -> str:
+        """Letzte SUMMARY_TAIL_LENGTH Zeichen, auf einen Zeilenanfang gekürzt."""
+        cut = len(output) - cls.SUMMARY_TAIL_LENGTH
+        if cut <= 0:
+            return output
+        return output[output.rfind('\n', 0, cut) + 1:]
 
-        return result
+    @staticmethod
+    def _search_summary(pattern: "re.Pattern", output: str, tail: str) -> Optional["re.Match"]:
+        """Sucht im Output-Ende, fällt nur ohne Treffer auf den ganzen Output zurück."""
+        match = pattern.search(tail)
+        if match is None and tail is not output:
+            match = pattern.search(output)
+        return match
+
+    @classmethod
+    def _may_be_error_line(cls, line: str) -> bool:
+        """Substring-Vorfilter: False heißt sicher keine Fehlerzeile."""
+        for hint in cls._ERROR_HINTS:
+            if hint in line:
+                return True
+        line_lower = line.lower()
+        for hint in cls._ERROR_HINTS_LOWER:
+            if hint in line_lower:
+                return True
+        return False
 
     @classmethod
     def _extract_error_lines(cls, output: str) -> List[str]:
         """Extrahiert relevante Fehlerzeilen aus dem Output."""
         error_lines = []
-        lines = output.split('\n')
+        seen = set()
 
-        for line in lines:
+        for line in output.split('\n'):
+            if not cls._may_be_error_line(line):
+                continue
             line = line.strip()
-            if not line:
+            if not cls.ERROR_LINE_PATTERN.search(line):
                 continue
 
-            for pattern in cls.ERROR_PATTERNS:
-                if pattern.search(line):
-                    # Zeile bereinigen und kürzen
-                    clean_line = line[:100]
-                    if clean_line not in error_lines:
-                        error_lines.append(clean_line)
+            # Zeile bereinigen und kürzen
+            clean_line = line[:100]
+            if clean_line not in seen:
+                seen.add(clean_line)
+                error_lines.append(clean_line)
+                if len(error_lines) >= TEST_FAILED_LINES_MAX:
                     break
 
-            if len(error_lines) >= TEST_FAILED_LINES_MAX:
-                break
-
         return error_lines
 
 
@@ -294,7 +357,8 @@ class TestRunner:
 
         logger.info(f"Running tests: {' '.join(cmd)} in {cwd}")
 
-        start_time = datetime.now()
+        # Monotonic clock for the duration; the ISO timestamp is only for display
+        start_time = time.perf_counter()
 
         try:
             proc = await asyncio.create_subprocess_exec(
@@ -316,7 +380,6 @@ class TestRunner:
                     output += "\n" + stderr.decode(errors='replace')
 
                 result = OutputParser.parse(output, proc.returncode or 0)
-                result.duration = (datetime.now() - start_time).total_seconds()
 
             except asyncio.TimeoutError:
                 proc.kill()
@@ -338,7 +401,7 @@ class TestRunner:
             result.exit_code = -1
             logger.error(f"Test execution error: {e}")
 
-        result.duration = (datetime.now() - start_time).total_seconds()
+        result.duration = time.perf_counter() - start_time
         return result
 
     @staticmethod
@@ -395,14 +458,13 @@ class TestRunner:
 
         if last_run:
             try:
-                run_time = datetime.fromisoformat(last_run)
-                delta = datetime.now() - run_time
-                if delta.seconds < 60:
-                    time_str = f" ({delta.seconds}s ago)"
-                elif delta.seconds < 3600:
-                    time_str = f" ({delta.seconds // 60}m ago)"
+                seconds = max(0, int(time.time() - _iso_to_epoch(last_run)))
+                if seconds < 60:
+                    time_str = f" ({seconds}s ago)"
+                elif seconds < 3600:
+                    time_str = f" ({seconds // 60}m ago)"
                 else:
-                    time_str = f" ({delta.seconds // 3600}h ago)"
+                    time_str = f" ({seconds // 3600}h ago)"
             except ValueError:
                 pass
 
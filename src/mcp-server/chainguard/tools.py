@@ -755,6 +755,7 @@ Examples:
                     "format": {"type": "string", "enum": ["json", "jsonl"], "description": "Export format (default: json)"},
                     "collections": {"type": "array", "items": {"type": "string"}, "description": "Collections to export (default: all)"},
                     "include_embeddings": {"type": "boolean", "description": "Include vector embeddings (larger file)"},
+                    "quantize_embeddings": {"type": "boolean", "description": "Store embeddings as int8 (~4x smaller, ~1% precision loss)"},
                     "compress": {"type": "boolean", "description": "Compress with gzip"},
                     "working_dir": {"type": "string"}
                 },
@@ -26,6 +26,7 @@ Usage:
     #   user.php,changed,23
 """
 
+import json
 from typing import Any, Dict, List, Optional, Union
 from dataclasses import dataclass
 
@@ -313,8 +314,6 @@ def compare_formats(data: Any, name: str = "") -> Dict[str, Any]:
 
     Returns dict with token counts and savings percentage.
     """
-    import json
-
     json_str = json.dumps(data, separators=(",", ":"))
     toon_str = encode_toon(data, name)
 
@@ -329,3 +328,12 @@ def compare_formats(data: Any, name: str = "") -> Dict[str, Any]:
         "json_chars": len(json_str),
         "toon_chars": len(toon_str)
     }
+
+
+def compare_formats_many(datasets: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    compare_formats() for several named datasets in one call.
+
+    Each entry is encoded under its key as the TOON name.
+    """
+    return {name: compare_formats(data, name) for name, data in datasets.items()}
@@ -37,17 +37,19 @@ def is_path_safe(file_path: str, project_path: str) -> bool:
     if not file_path:
         return True
 
+    # Without '..' there is nothing to resolve: only paths resolve() would
+    # reject (embedded NUL) are unsafe, so skip both realpath walks
+    if '..' not in file_path:
+        return '\x00' not in file_path and '\x00' not in project_path
+
     try:
         file_resolved = Path(file_path).resolve()
         project_resolved = Path(project_path).resolve()
 
-        if '..' in file_path:
-            try:
-                file_resolved.relative_to(project_resolved)
-                return True
-            except ValueError:
-                return False
-
-        return True
+        try:
+            file_resolved.relative_to(project_resolved)
+            return True
+        except ValueError:
+            return False
     except (OSError, ValueError):
         return False
@@ -8,12 +8,19 @@ Licensed under the Polyform Noncommercial License 1.0.0
 See LICENSE file in the project root for full license information.
 """
 
+import os
+import re
 import json
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set, Tuple
 
-from .config import SYNTAX_CHECK_TIMEOUT_SECONDS, PHPSTAN_ENABLED, PHPSTAN_LEVEL, logger
+from .config import (
+    SYNTAX_CHECK_TIMEOUT_SECONDS, SYNTAX_CHECK_MAX_FILE_BYTES,
+    PHPSTAN_ENABLED, PHPSTAN_LEVEL, logger
+)
+from .cache import LRUCache
+from .jsonutil import ORJSON_AVAILABLE, json_loads
 
 # Async file I/O
 try:
@@ -22,6 +29,49 @@ try:
 except ImportError:
     HAS_AIOFILES = False
 
+# Default cap on concurrent validate_file() calls in validate_files()
+VALIDATION_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+# Extension -> SyntaxValidator check method; anything else is valid as-is
+_VALIDATORS_BY_EXTENSION = {
+    ".php": "_validate_php",
+    ".js": "_validate_js",
+    ".mjs": "_validate_js",
+    ".cjs": "_validate_js",
+    ".json": "_validate_json",
+    ".py": "_validate_python",
+    ".ts": "_validate_ts",
+    ".tsx": "_validate_ts",
+}
+
+# Max memoized validate_file() results
+VALIDATION_CACHE_SIZE = 4096
+
+# Marks the line of `php -l` output that carries the error
+_PHP_ERROR_MARKER = re.compile(r"Parse error|Fatal error|syntax error")
+
+# Trailing " in /path/file.php on line 42" of a PHP error (the last " in ")
+_PHP_ERROR_LOCATION = re.compile(r" in (?:(?! in ).)+ on line \d+\s*$")
+
+# `php -l` accepts several files per invocation since PHP 8.3
+PHP_MULTI_LINT_VERSION_ID = 80300
+
+# One line of `php -l a.php b.php ...` output
+_PHP_LINT_LINE = re.compile(
+    r"^(?:No syntax errors detected in (?P<ok>.+)"
+    r"|Errors parsing (?P<bad>.+)"
+    r"|(?P<error>.*?(?:Parse|Fatal) error:.*? in (?P<file>.+?) on line \d+))\s*$",
+    re.MULTILINE
+)
+
+# Start of a `tsc --pretty false` diagnostic: "path/file.ts(12,5): error TS2322: ..."
+_TS_DIAGNOSTIC_FILE = re.compile(r"^(?P<file>.+?)\(\d+,\d+\): error TS(?P<code>\d+)", re.MULTILINE)
+
+# Redeclaration errors that compiling several scripts as one program can
+# produce across files (TS2300 duplicate identifier, TS2393 duplicate
+# function, TS2451 cannot redeclare block-scoped variable)
+_TS_CROSS_FILE_CODES = frozenset({"2300", "2393", "2451"})
+
 
 # =============================================================================
 # Syntax Validation (PHP, JS, JSON, Python, TypeScript)
@@ -34,111 +84,178 @@ class SyntaxValidator:
         - PHP: Uses `php -l` (lint mode)
         - JavaScript: Uses `node --check`
         - JSON: Uses Python's json.load()
-        - Python: Uses `python3 -m py_compile`
+        - Python: Uses compile() in-process (the server's Python version)
         - TypeScript/TSX: Uses `npx tsc --noEmit`
     """
 
+    # Whether `php -l` takes several files (PHP 8.3+); None = not probed yet
+    _php_multi_lint: Optional[bool] = None
+
+    # Executables that failed with "Command not found"; not spawned again
+    _missing_tools: Set[str] = set()
+
+    # (file_path, full_path, st_mtime_ns, st_size) -> validate_file() result
+    _cache = LRUCache(maxsize=VALIDATION_CACHE_SIZE)
+
+    @staticmethod
+    def cache_clear():
+        """Drop all memoized validation results."""
+        SyntaxValidator._cache.clear()
+
     @staticmethod
     async def validate_file(file_path: str, project_path: str) -> Dict[str, Any]:
         """
         Validate a file based on its extension.
         Returns: {"valid": bool, "errors": [...], "checked": str}
+
+        Self-contained syntax checks (php -l without PHPStan, node --check,
+        JSON, Python) are memoized by path, mtime and size, so re-validating
+        an unchanged file skips the read and the linter process.
         """
         full_path = Path(project_path) / file_path if not Path(file_path).is_absolute() else Path(file_path)
-
-        if not full_path.exists():
-            return {"valid": True, "errors": [], "checked": "file not found"}
-
         ext = full_path.suffix.lower()
-        errors = []
+
+        # Nothing to check: skip the stat and the cache entirely
+        if ext not in _VALIDATORS_BY_EXTENSION or ".blade.php" in str(full_path):
+            return SyntaxValidator._build_result([], ext)
 
         try:
-            # === PHP Validation ===
-            phpstan_available = None  # None = not checked, True/False = checked
-            if ext == ".php" and ".blade.php" not in str(full_path):
-                # Step 1: Basic syntax check (php -l)
-                result = await SyntaxValidator._run_command(
-                    ["php", "-l", str(full_path)]
-                )
-                if result["returncode"] != 0:
-                    error_msg = SyntaxValidator._extract_php_error(result["stderr"] or result["stdout"])
-                    errors.append({
-                        "type": "PHP Syntax",
-                        "message": error_msg,
-                        "file": str(file_path)
-                    })
-                # Step 2: Static analysis with PHPStan (if enabled and syntax OK)
-                elif PHPSTAN_ENABLED:
-                    phpstan_result = await SyntaxValidator._run_phpstan(str(full_path))
-                    phpstan_available = phpstan_result["available"]
-                    if phpstan_result["errors"]:
-                        for err in phpstan_result["errors"][:3]:  # Max 3 errors
-                            errors.append({
-                                "type": "PHPStan",
-                                "message": err,
-                                "file": str(file_path)
-                            })
-
-            # === JavaScript/TypeScript Validation ===
-            elif ext in [".js", ".mjs", ".cjs"]:
-                result = await SyntaxValidator._run_command(
-                    ["node", "--check", str(full_path)]
-                )
-                if result["returncode"] != 0:
-                    error_msg = SyntaxValidator._extract_js_error(result["stderr"])
-                    errors.append({
-                        "type": "JS Syntax",
-                        "message": error_msg,
-                        "file": str(file_path)
-                    })
+            stat = full_path.stat()
+        except (OSError, ValueError):
+            return {"valid": True, "errors": [], "checked": "file not found"}
 
-            # === JSON Validation (async) ===
-            elif ext == ".json":
-                try:
-                    if HAS_AIOFILES:
-                        async with aiofiles.open(full_path, 'r', encoding='utf-8') as f:
-                            content = await f.read()
-                            json.loads(content)
-                    else:
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            json.load(f)
-                except json.JSONDecodeError as e:
-                    errors.append({
-                        "type": "JSON",
-                        "message": f"Line {e.lineno}: {e.msg}",
-                        "file": str(file_path)
-                    })
+        # Lockfiles, bundles etc.: not worth a full parse on every call
+        if stat.st_size > SYNTAX_CHECK_MAX_FILE_BYTES:
+            return {"valid": True, "errors": [], "checked": f"{ext} (too large)"}
 
-            # === Python Validation ===
-            elif ext == ".py":
-                result = await SyntaxValidator._run_command(
-                    ["python3", "-m", "py_compile", str(full_path)]
-                )
-                if result["returncode"] != 0:
-                    error_msg = SyntaxValidator._extract_python_error(result["stderr"])
-                    errors.append({
-                        "type": "Python Syntax",
-                        "message": error_msg,
-                        "file": str(file_path)
-                    })
+        cache_key = (file_path, str(full_path), stat.st_mtime_ns, stat.st_size)
+        cached = SyntaxValidator._cache.get(cache_key)
+        if cached is not None:
+            return SyntaxValidator._copy_result(cached)
 
-            # === TypeScript/TSX Validation ===
-            elif ext in [".ts", ".tsx"]:
-                result = await SyntaxValidator._run_command(
-                    ["npx", "--yes", "tsc", "--noEmit", "--skipLibCheck",
-                     "--allowJs", "--target", "ES2020", str(full_path)]
-                )
-                if result["returncode"] != 0 and "error TS" in result["stdout"]:
-                    error_msg = SyntaxValidator._extract_ts_error(result["stdout"])
-                    errors.append({
-                        "type": "TS Syntax",
-                        "message": error_msg,
-                        "file": str(file_path)
-                    })
+        errors: List[Dict[str, str]] = []
+        # Only self-contained syntax checks are cached; timeouts, missing
+        # tools, PHPStan and tsc (which look at other files) are re-run
+        cacheable = True
+        phpstan_available = None  # None = not checked, True/False = checked
 
+        try:
+            validate = getattr(SyntaxValidator, _VALIDATORS_BY_EXTENSION[ext])
+            cacheable, phpstan_available = await validate(full_path, file_path, errors)
         except Exception as e:
             logger.error(f"Validation error for {file_path}: {e}")
+            cacheable = False
+
+        result = SyntaxValidator._build_result(errors, ext, phpstan_available)
+        if cacheable:
+            SyntaxValidator._cache[cache_key] = SyntaxValidator._copy_result(result)
+        return result
+
+    # -------------------------------------------------------------------------
+    # Per-language checks: append to errors, return (cacheable, phpstan_available)
+    # -------------------------------------------------------------------------
+    @staticmethod
+    async def _validate_php(full_path: Path, file_path: str,
+                            errors: List[Dict[str, str]]) -> Tuple[bool, Optional[bool]]:
+        """PHP: `php -l`, then PHPStan if enabled and the syntax is OK."""
+        # Step 1: Basic syntax check (php -l)
+        result = await SyntaxValidator._run_command(
+            ["php", "-l", str(full_path)]
+        )
+        if result["returncode"] != 0:
+            error_msg = SyntaxValidator._extract_php_error(result["stderr"] or result["stdout"])
+            errors.append({
+                "type": "PHP Syntax",
+                "message": error_msg,
+                "file": str(file_path)
+            })
+            return result["returncode"] != -1, None
+        # Step 2: Static analysis with PHPStan (if enabled and syntax OK)
+        if PHPSTAN_ENABLED:
+            phpstan_available = await SyntaxValidator._add_phpstan_errors(
+                full_path, file_path, errors
+            )
+            # PHPStan findings depend on other files and on PHPStan being installed
+            return False, phpstan_available
+        return True, None
+
+    @staticmethod
+    async def _validate_js(full_path: Path, file_path: str,
+                           errors: List[Dict[str, str]]) -> Tuple[bool, Optional[bool]]:
+        """JavaScript: `node --check`."""
+        result = await SyntaxValidator._run_command(
+            ["node", "--check", str(full_path)]
+        )
+        if result["returncode"] != 0:
+            error_msg = SyntaxValidator._extract_js_error(result["stderr"])
+            errors.append({
+                "type": "JS Syntax",
+                "message": error_msg,
+                "file": str(file_path)
+            })
+        return result["returncode"] != -1, None
+
+    @staticmethod
+    async def _validate_json(full_path: Path, file_path: str,
+                             errors: List[Dict[str, str]]) -> Tuple[bool, Optional[bool]]:
+        """JSON: parsed in-process (async read)."""
+        try:
+            if HAS_AIOFILES:
+                async with aiofiles.open(full_path, 'rb') as f:
+                    data = await f.read()
+            else:
+                data = full_path.read_bytes()
+            SyntaxValidator._check_json(data)
+        except json.JSONDecodeError as e:
+            errors.append({
+                "type": "JSON",
+                "message": f"Line {e.lineno}: {e.msg}",
+                "file": str(file_path)
+            })
+        return True, None
 
+    @staticmethod
+    async def _validate_python(full_path: Path, file_path: str,
+                               errors: List[Dict[str, str]]) -> Tuple[bool, Optional[bool]]:
+        """Python: compile() in a worker thread."""
+        error_msg = await asyncio.to_thread(
+            SyntaxValidator._compile_python, full_path
+        )
+        if error_msg:
+            errors.append({
+                "type": "Python Syntax",
+                "message": error_msg,
+                "file": str(file_path)
+            })
+        return True, None
+
+    @staticmethod
+    async def _validate_ts(full_path: Path, file_path: str,
+                           errors: List[Dict[str, str]]) -> Tuple[bool, Optional[bool]]:
+        """TypeScript/TSX: `npx tsc --noEmit`."""
+        result = await SyntaxValidator._run_command(
+            ["npx", "--yes", "tsc", "--noEmit", "--skipLibCheck",
+             "--allowJs", "--target", "ES2020", str(full_path)]
+        )
+        if result["returncode"] != 0 and "error TS" in result["stdout"]:
+            error_msg = SyntaxValidator._extract_ts_error(result["stdout"])
+            errors.append({
+                "type": "TS Syntax",
+                "message": error_msg,
+                "file": str(file_path)
+            })
+        # tsc type-checks imported files too, so the result is never cached
+        return False, None
+
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a result so callers cannot mutate the cached one."""
+        return {**result, "errors": [dict(err) for err in result["errors"]]}
+
+    @staticmethod
+    def _build_result(errors: List[Dict[str, str]], ext: str,
+                      phpstan_available: Optional[bool] = None) -> Dict[str, Any]:
+        """Build the validate_file() result dict."""
         result = {
             "valid": len(errors) == 0,
             "errors": errors,
@@ -149,69 +266,302 @@ class SyntaxValidator:
             result["phpstan_available"] = phpstan_available
         return result
 
+    @staticmethod
+    async def _add_phpstan_errors(full_path: Path, file_path: str,
+                                  errors: List[Dict[str, str]]) -> bool:
+        """Run PHPStan on a syntax-clean PHP file, append its errors, return availability."""
+        phpstan_result = await SyntaxValidator._run_phpstan(str(full_path))
+        for err in phpstan_result["errors"][:3]:  # Max 3 errors
+            errors.append({
+                "type": "PHPStan",
+                "message": err,
+                "file": str(file_path)
+            })
+        return phpstan_result["available"]
+
+    @staticmethod
+    async def validate_files(file_paths: List[str], project_path: str,
+                             concurrency: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate several files at once.
+        Returns: {file_path: validate_file() result}
+
+        PHP files are linted with a single `php -l a.php b.php ...` call on
+        PHP 8.3+, and TypeScript files with a single `tsc` run, which saves
+        one process (and compiler) start per file. Everything else (and PHP
+        on older versions) runs through validate_file() concurrently,
+        at most `concurrency` (default VALIDATION_CONCURRENCY) at a time, so
+        subprocess waits and disk reads overlap.
+        """
+        php_files: Dict[str, Path] = {}
+        ts_files: Dict[str, Path] = {}
+        other_files: List[str] = []
+        for file_path in dict.fromkeys(file_paths):
+            full_path = Path(project_path) / file_path if not Path(file_path).is_absolute() else Path(file_path)
+            ext = full_path.suffix.lower()
+            # Missing and too-large files are handled by validate_file()
+            if ext in (".php", ".ts", ".tsx") and ".blade.php" not in str(full_path):
+                try:
+                    batchable = full_path.stat().st_size <= SYNTAX_CHECK_MAX_FILE_BYTES
+                except (OSError, ValueError):
+                    batchable = False
+            else:
+                batchable = False
+
+            if not batchable:
+                other_files.append(file_path)
+            elif ext == ".php":
+                php_files[file_path] = full_path
+            else:
+                ts_files[file_path] = full_path
+
+        # Batch runs return only the files they could decide; the rest (and
+        # everything after an unexpected failure) goes through validate_file()
+        results: Dict[str, Dict[str, Any]] = {}
+        if len(php_files) > 1:
+            try:
+                if await SyntaxValidator._supports_php_multi_lint():
+                    results.update(await SyntaxValidator._validate_php_batch(php_files))
+            except Exception as e:
+                logger.error(f"Batch PHP lint failed, validating per file: {e}")
+        if len(ts_files) > 1:
+            try:
+                results.update(await SyntaxValidator._validate_ts_batch(ts_files))
+            except Exception as e:
+                logger.error(f"Batch tsc run failed, validating per file: {e}")
+        other_files.extend(f for f in (*php_files, *ts_files) if f not in results)
+
+        semaphore = asyncio.Semaphore(concurrency or VALIDATION_CONCURRENCY)
+
+        async def validate(file_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await SyntaxValidator.validate_file(file_path, project_path)
+
+        validated = await asyncio.gather(*(validate(f) for f in other_files))
+        results.update(zip(other_files, validated))
+        return results
+
+    @staticmethod
+    async def _validate_ts_batch(ts_files: Dict[str, Path]) -> Dict[str, Dict[str, Any]]:
+        """
+        Type-check TypeScript files with one `tsc` run and map diagnostics back per file.
+        Returns {} whenever the combined run can't be mapped back exactly:
+        tsc could not run, reported errors outside the batch files (config
+        or option errors, imported modules) or redeclarations that may only
+        exist because the files were compiled together. The caller then
+        falls back to validate_file() per file.
+        """
+        result = await SyntaxValidator._run_command(
+            ["npx", "--yes", "tsc", "--noEmit", "--skipLibCheck", "--pretty", "false",
+             "--allowJs", "--target", "ES2020", *(str(p) for p in ts_files.values())]
+        )
+        if result["returncode"] == -1:
+            return {}
+
+        # tsc prints paths relative to the current directory
+        first_error: Dict[str, str] = {}
+        if result["returncode"] != 0:
+            output = result["stdout"]
+            batch_paths = {os.path.abspath(p) for p in ts_files.values()}
+            diagnostics = 0
+            for match in _TS_DIAGNOSTIC_FILE.finditer(output):
+                path = os.path.abspath(match.group("file"))
+                if path not in batch_paths or match.group("code") in _TS_CROSS_FILE_CODES:
+                    return {}
+                diagnostics += 1
+                first_error.setdefault(path, SyntaxValidator._line_at(output, match.start()))
+            if diagnostics != output.count("error TS"):
+                return {}  # e.g. "error TS5023: Unknown compiler option" without a file
+
+        results = {}
+        for file_path, full_path in ts_files.items():
+            errors = []
+            line = first_error.get(os.path.abspath(full_path))
+            if line:
+                errors.append({
+                    "type": "TS Syntax",
+                    "message": SyntaxValidator._extract_ts_error(line),
+                    "file": str(file_path)
+                })
+            results[file_path] = SyntaxValidator._build_result(errors, full_path.suffix.lower())
+        return results
+
+    @staticmethod
+    async def _supports_php_multi_lint() -> bool:
+        """Check once whether the installed PHP lints several files per call."""
+        if SyntaxValidator._php_multi_lint is None:
+            result = await SyntaxValidator._run_command(["php", "-r", "echo PHP_VERSION_ID;"])
+            version_id = result["stdout"].strip()
+            SyntaxValidator._php_multi_lint = (
+                result["returncode"] == 0 and version_id.isdigit()
+                and int(version_id) >= PHP_MULTI_LINT_VERSION_ID
+            )
+        return SyntaxValidator._php_multi_lint
+
+    @staticmethod
+    async def _validate_php_batch(php_files: Dict[str, Path]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lint PHP files with one `php -l` call and map the output back per file.
+        Returns only files the output accounts for; the caller re-checks the
+        rest (timeouts, "Could not open input file", unexpected output) per file.
+        """
+        paths = [str(p) for p in php_files.values()]
+        result = await SyntaxValidator._run_command(["php", "-l", *paths])
+        if result["returncode"] == -1:
+            return {}
+
+        failed: Dict[str, str] = {}
+        passed = set(paths) if result["returncode"] == 0 else set()
+        if result["returncode"] != 0:
+            for match in _PHP_LINT_LINE.finditer(result["stdout"] + "\n" + result["stderr"]):
+                if match.group("ok"):
+                    passed.add(match.group("ok"))
+                elif match.group("error"):
+                    failed.setdefault(match.group("file"),
+                                      SyntaxValidator._extract_php_error(match.group("error")))
+                elif match.group("bad"):
+                    failed.setdefault(match.group("bad"), "Syntax error")
+
+        results = {}
+        for file_path, full_path in php_files.items():
+            if str(full_path) not in failed and str(full_path) not in passed:
+                continue
+            errors = []
+            phpstan_available = None
+            try:
+                if str(full_path) in failed:
+                    errors.append({
+                        "type": "PHP Syntax",
+                        "message": failed[str(full_path)],
+                        "file": str(file_path)
+                    })
+                elif PHPSTAN_ENABLED:
+                    phpstan_available = await SyntaxValidator._add_phpstan_errors(
+                        full_path, file_path, errors
+                    )
+            except Exception as e:
+                logger.error(f"Validation error for {file_path}: {e}")
+            results[file_path] = SyntaxValidator._build_result(errors, ".php", phpstan_available)
+        return results
+
+    @staticmethod
+    def _refresh_tools():
+        """Forget missing executables and the PHP version probe (e.g. after PATH changes)."""
+        SyntaxValidator._missing_tools.clear()
+        SyntaxValidator._php_multi_lint = None
+
     @staticmethod
     async def _run_command(cmd: List[str]) -> Dict[str, Any]:
         """Run a command asynchronously."""
+        if cmd[0] in SyntaxValidator._missing_tools:
+            return {"returncode": -1, "stdout": "", "stderr": "Command not found"}
         try:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(),
-                timeout=SYNTAX_CHECK_TIMEOUT_SECONDS
-            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(),
+                    timeout=SYNTAX_CHECK_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Don't leave the linter running in the background
+                proc.kill()
+                await proc.wait()
+                return {"returncode": -1, "stdout": "", "stderr": "Timeout"}
             return {
                 "returncode": proc.returncode,
-                "stdout": stdout.decode() if stdout else "",
-                "stderr": stderr.decode() if stderr else ""
+                "stdout": stdout.decode(errors='replace') if stdout else "",
+                "stderr": stderr.decode(errors='replace') if stderr else ""
             }
-        except asyncio.TimeoutError:
-            return {"returncode": -1, "stdout": "", "stderr": "Timeout"}
         except FileNotFoundError:
+            SyntaxValidator._missing_tools.add(cmd[0])
             return {"returncode": -1, "stdout": "", "stderr": "Command not found"}
+        except OSError as e:  # e.g. permission denied, exec format error
+            return {"returncode": -1, "stdout": "", "stderr": f"Command failed: {e}"[:100]}
+
+    @staticmethod
+    def _check_json(data: bytes) -> None:
+        """Parse UTF-8 JSON, raising json.JSONDecodeError if invalid."""
+        if ORJSON_AVAILABLE:
+            try:
+                # orjson validates UTF-8 itself, no str copy needed
+                json_loads(data)
+                return
+            except json.JSONDecodeError:
+                # orjson is stricter (NaN, >64-bit ints): stdlib has the final
+                # say and provides the familiar error message
+                pass
+        json.loads(data.decode('utf-8'))
+
+    @staticmethod
+    def _compile_python(full_path: Path) -> Optional[str]:
+        """
+        Compile a Python file in this interpreter, return the error or None.
+
+        Same check as `python3 -m py_compile` without starting a new
+        interpreter per file (and without writing .pyc files into the project).
+        Note: this uses the grammar of the Python running the server, not
+        the project's `python3`; syntax newer than the server's version is
+        reported as an error.
+        """
+        try:
+            compile(full_path.read_bytes(), str(full_path), "exec", dont_inherit=True)
+        except SyntaxError as e:
+            output = f"{type(e).__name__}: {e.msg} (line {e.lineno})"
+        except ValueError as e:  # e.g. NUL bytes in source
+            output = f"SyntaxError: {e}"
+        else:
+            return None
+        return SyntaxValidator._extract_python_error(output)
+
+    @staticmethod
+    def _line_at(output: str, pos: int) -> str:
+        """Return the line of output containing index pos (without newline)."""
+        end = output.find('\n', pos)
+        return output[output.rfind('\n', 0, pos) + 1:end if end != -1 else len(output)]
 
     @staticmethod
     def _extract_php_error(output: str) -> str:
         """Extract meaningful error from PHP -l output."""
-        for line in output.split('\n'):
-            if 'Parse error' in line or 'Fatal error' in line or 'syntax error' in line:
-                if ' in ' in line:
-                    parts = line.split(' in ')
-                    return parts[0].strip()
-                return line.strip()[:100]
+        match = _PHP_ERROR_MARKER.search(output)
+        if match:
+            line = SyntaxValidator._line_at(output, match.start())
+            return _PHP_ERROR_LOCATION.sub('', line).strip()[:100]
         return output.strip()[:100]
 
     @staticmethod
     def _extract_js_error(output: str) -> str:
         """Extract meaningful error from Node --check output."""
-        for line in output.split('\n'):
-            if 'SyntaxError' in line or 'Error' in line:
-                return line.strip()[:100]
+        pos = output.find('Error')  # also covers SyntaxError, TypeError, ...
+        if pos != -1:
+            return SyntaxValidator._line_at(output, pos).strip()[:100]
         return output.strip()[:100]
 
     @staticmethod
     def _extract_python_error(output: str) -> str:
-        """Extract meaningful error from py_compile output."""
-        lines = output.strip().split('\n')
-        for i, line in enumerate(lines):
-            if 'SyntaxError' in line or 'IndentationError' in line or 'TabError' in line:
+        """Extract meaningful error from compile() or py_compile output."""
+        stripped = output.strip()
+        for line in stripped.split('\n'):
+            if 'Error' in line and ('SyntaxError' in line or 'IndentationError' in line
+                                    or 'TabError' in line):
                 return line.strip()[:100]
-            if 'line' in line.lower() and 'file' in line.lower():
+            lower = line.lower()
+            if 'line' in lower and 'file' in lower:
                 return line.strip()[:100]
-        return output.strip()[:100] if output else "Syntax error"
+        return stripped[:100] if output else "Syntax error"
 
     @staticmethod
     def _extract_ts_error(output: str) -> str:
         """Extract first TypeScript error from tsc output."""
-        for line in output.split('\n'):
-            if 'error TS' in line:
-                if '): error' in line:
-                    parts = line.split('): error')
-                    if len(parts) > 1:
-                        return f"error{parts[1][:80]}"
-                return line.strip()[:100]
+        pos = output.find('error TS')
+        if pos != -1:
+            line = SyntaxValidator._line_at(output, pos)
+            if '): error' in line:
+                return f"error{line.split('): error')[1][:80]}"
+            return line.strip()[:100]
         return output.strip()[:100] if output else "TypeScript error"
 
     @staticmethod
@@ -344,16 +694,21 @@ class SyntaxValidator:
                 stderr=asyncio.subprocess.PIPE,
                 cwd=str(cwd)
             )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(),
-                timeout=SYNTAX_CHECK_TIMEOUT_SECONDS * 2  # PHPStan needs more time
-            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(),
+                    timeout=SYNTAX_CHECK_TIMEOUT_SECONDS * 2  # PHPStan needs more time
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {"returncode": -1, "stdout": "", "stderr": "PHPStan timeout"}
             return {
                 "returncode": proc.returncode,
-                "stdout": stdout.decode() if stdout else "",
-                "stderr": stderr.decode() if stderr else ""
+                "stdout": stdout.decode(errors='replace') if stdout else "",
+                "stderr": stderr.decode(errors='replace') if stderr else ""
             }
-        except asyncio.TimeoutError:
-            return {"returncode": -1, "stdout": "", "stderr": "PHPStan timeout"}
         except FileNotFoundError:
             return {"returncode": -1, "stdout": "", "stderr": "PHPStan not found"}
+        except OSError as e:
+            return {"returncode": -1, "stdout": "", "stderr": f"PHPStan failed: {e}"[:100]}
@@ -2,18 +2,37 @@
 Pytest fixtures for Chainguard MCP Server tests.
 """
 
-import pytest
-import tempfile
-import shutil
+import sys
 from pathlib import Path
 
+import pytest
+
+# Make the chainguard package importable regardless of the invocation
+# directory (once, not per test module)
+_SERVER_ROOT = str(Path(__file__).resolve().parent.parent)
+if _SERVER_ROOT not in sys.path:
+    sys.path.insert(0, _SERVER_ROOT)
+
+
+@pytest.fixture
+def temp_dir(tmp_path):
+    """
+    Temporary directory for tests.
+
+    Backed by pytest's tmp_path: unique per test (and per xdist worker),
+    and removed in bulk by pytest's basetemp rotation instead of an
+    rmtree after every test.
+    """
+    return tmp_path
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    tmp = tempfile.mkdtemp()
-    yield Path(tmp)
-    shutil.rmtree(tmp, ignore_errors=True)
+def benchmark(request):
+    """pytest-benchmark's fixture, or skip if the plugin isn't installed or enabled."""
+    pytest.importorskip("pytest_benchmark")
+    if not request.config.pluginmanager.hasplugin("benchmark"):
+        pytest.skip("pytest-benchmark plugin disabled")
+    return request.getfixturevalue("benchmark")
 
 
 @pytest.fixture
@@ -25,3 +44,32 @@ def sample_project_path(temp_dir):
     (project / "tests").mkdir()
     (project / "src" / "main.py").write_text("# Main file")
     return project
+
+
+@pytest.fixture(scope="session")
+def memory_manager():
+    """
+    Shared ProjectMemoryManager for the whole test session.
+
+    Instances are namespaced by project_id, so tests only need
+    unique IDs to stay isolated from each other.
+    """
+    import asyncio
+    from chainguard.memory import ProjectMemoryManager
+
+    manager = ProjectMemoryManager()
+    yield manager
+    asyncio.run(manager.close_all())
+
+
+@pytest.fixture(scope="session")
+def package_validator(tmp_path_factory):
+    """
+    Shared PackageValidator over a project without any registry file.
+
+    The registry caches per ecosystem, so one instance serves all
+    "no composer.json / package.json / requirements.txt" tests.
+    """
+    from chainguard.package_validator import PackageValidator
+
+    return PackageValidator(str(tmp_path_factory.mktemp("no_registry")))
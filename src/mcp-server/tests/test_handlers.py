@@ -433,7 +433,9 @@ class TestHandleTrackBatch:
             pm_mock.save_async = AsyncMock()
 
             with patch('chainguard.handlers.SyntaxValidator') as sv_mock:
-                sv_mock.validate_file = AsyncMock(return_value={"valid": True, "errors": []})
+                sv_mock.validate_files = AsyncMock(return_value={
+                    f: {"valid": True, "errors": []} for f in ["a.py", "b.py", "c.py"]
+                })
 
                 result = await handle_track_batch({
                     "working_dir": "/tmp",
@@ -465,10 +467,10 @@ class TestHandleTrackBatch:
 
             with patch('chainguard.handlers.SyntaxValidator') as sv_mock:
                 # First file valid, second invalid
-                sv_mock.validate_file = AsyncMock(side_effect=[
-                    {"valid": True, "errors": []},
-                    {"valid": False, "errors": [{"type": "Syntax", "message": "Error"}]}
-                ])
+                sv_mock.validate_files = AsyncMock(return_value={
+                    "good.py": {"valid": True, "errors": []},
+                    "bad.py": {"valid": False, "errors": [{"type": "Syntax", "message": "Error"}]}
+                })
 
                 result = await handle_track_batch({
                     "working_dir": "/tmp",
@@ -0,0 +1,40 @@
+"""
+Tests for chainguard.jsonutil module.
+
+Tests JSON helpers with orjson and the stdlib json fallback.
+"""
+
+import json
+
+import chainguard.jsonutil as jsonutil
+import pytest
+from chainguard.jsonutil import json_dumps, json_loads
+
+
+@pytest.fixture(params=[
+    pytest.param(True, marks=pytest.mark.skipif(not jsonutil.ORJSON_AVAILABLE, reason="orjson not installed")),
+    False,
+], ids=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    monkeypatch.setattr(jsonutil, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+class TestJsonHelpers:
+    """Tests for json_dumps/json_loads."""
+
+    @pytest.mark.parametrize("indent", [False, True])
+    def test_round_trip(self, json_backend, indent):
+        """Test dumps returns UTF-8 bytes that loads reads back."""
+        data = {"content": "Grüße", "lines": [1, 2], "nested": {"ok": True}}
+        dumped = json_dumps(data, indent=indent)
+        assert isinstance(dumped, bytes)
+        assert "Grüße".encode() in dumped
+        assert (b"\n" in dumped) is indent
+        assert json_loads(dumped) == data
+        assert json_loads(dumped.decode("utf-8")) == data
+
+    def test_invalid_raises_stdlib_error(self, json_backend):
+        """Test both backends raise json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b"{not json")
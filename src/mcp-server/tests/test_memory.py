@@ -8,6 +8,7 @@ Note: Full memory tests require chromadb which may not be installed.
 import pytest
 import tempfile
 import os
+from collections.abc import Mapping
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -52,6 +53,20 @@ class TestGetProjectId:
             project_id = get_project_id(tmpdir)
             assert len(project_id) == 16
 
+    def test_retargeted_symlink_gets_new_id(self, tmp_path):
+        """Test that a symlinked project dir is re-resolved on every call."""
+        from chainguard.memory import get_project_id
+
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        link = tmp_path / "project"
+        link.symlink_to(tmp_path / "a")
+        first = get_project_id(str(link))
+
+        link.unlink()
+        link.symlink_to(tmp_path / "b")
+        assert get_project_id(str(link)) != first
+
 
 class TestValidateProjectIsolation:
     """Tests for validate_project_isolation function."""
@@ -65,18 +80,39 @@ class TestValidateProjectIsolation:
         """Test validation with matching project ID."""
         from chainguard.memory import validate_project_isolation, get_project_id
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            expected_id = get_project_id(tmpdir)
-            result = validate_project_isolation(expected_id, tmpdir)
-            assert result is True
+        # Path need not exist - the ID falls back to hashing the resolved path
+        expected_id = get_project_id("/path/to/isolated_project")
+        result = validate_project_isolation(expected_id, "/path/to/isolated_project")
+        assert result is True
 
     def test_invalid_project_id(self):
         """Test validation with mismatched project ID."""
         from chainguard.memory import validate_project_isolation, SecurityError
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with pytest.raises(SecurityError):
-                validate_project_isolation("wrongprojectid01", tmpdir)
+        with pytest.raises(SecurityError):
+            validate_project_isolation("wrongprojectid01", "/path/to/isolated_project")
+
+    def test_path_traversal_rejected(self):
+        """Test that project IDs escaping MEMORY_HOME are rejected."""
+        from chainguard.memory import _validate_memory_path, SecurityError
+
+        with pytest.raises(SecurityError):
+            _validate_memory_path("../../etc")
+
+    def test_path_check_sees_later_symlinks(self, tmp_path, monkeypatch):
+        """Test that the check is repeated, not answered from a cache."""
+        import chainguard.memory as memory_module
+        from chainguard.memory import _validate_memory_path, SecurityError
+
+        home = tmp_path / "memory"
+        (home / "project").mkdir(parents=True)
+        monkeypatch.setattr(memory_module, "MEMORY_HOME", home)
+        _validate_memory_path("project")
+
+        (home / "project").rmdir()
+        (home / "project").symlink_to(tmp_path)
+        with pytest.raises(SecurityError):
+            _validate_memory_path("project")
 
 
 class TestMemoryDocument:
@@ -220,6 +256,45 @@ class TestRelevanceScorer:
         # Final score depends on recency; with old date it should be low
         assert result.final_score < 0.5  # Allow for recency contribution
 
+    def test_score_uses_epoch_timestamp(self):
+        """Test that updated_at_ts takes precedence over the ISO string."""
+        import time
+        from chainguard.memory import RelevanceScorer, MemoryDocument
+
+        doc = MemoryDocument(
+            id="doc4",
+            content="Recently changed file",
+            metadata={
+                "type": "file",
+                "updated_at": "2020-01-01T10:00:00",
+                "updated_at_ts": int(time.time()) - 3600,
+            }
+        )
+
+        result = RelevanceScorer.score(
+            document=doc,
+            semantic_distance=0.5,
+            keywords=[],
+            collection="code_structure"
+        )
+
+        assert result.recency_score == 1.0
+
+    def test_calculate_recency_buckets(self):
+        """Test recency buckets for epoch timestamps."""
+        import time
+        from chainguard.memory import RelevanceScorer
+
+        now = int(time.time())
+        day = 86400
+
+        assert RelevanceScorer._calculate_recency("", now) == 1.0
+        assert RelevanceScorer._calculate_recency("", now - 3 * day) == 0.8
+        assert RelevanceScorer._calculate_recency("", now - 10 * day) == 0.5
+        assert RelevanceScorer._calculate_recency("", now - 60 * day) == 0.2
+        assert RelevanceScorer._calculate_recency("") == 0.5
+        assert RelevanceScorer._calculate_recency("not-a-date") == 0.5
+
     def test_score_with_type_bonus(self):
         """Test scoring with task-type bonus."""
         from chainguard.memory import RelevanceScorer, MemoryDocument
@@ -279,6 +354,16 @@ class TestContextFormatter:
         assert "Memory" in formatted
         assert "src/auth/handler.py" in formatted
 
+    def test_summary_first_sentence(self):
+        """Test that the summary fallback uses the first sentence only."""
+        from chainguard.memory import ContextFormatter, MemoryDocument
+
+        doc = MemoryDocument(id="d1", content="Handles login. Also logout. And more.")
+        assert ContextFormatter._get_summary(doc) == "Handles login."
+
+        long_doc = MemoryDocument(id="d2", content="x" * 100)
+        assert ContextFormatter._get_summary(long_doc) == "x" * 80 + "..."
+
 
 class TestShouldIndexFile:
     """Tests for should_index_file function."""
@@ -331,26 +416,70 @@ class TestProjectMemoryManager:
         assert memory_manager is not None
 
     @pytest.mark.asyncio
-    async def test_memory_exists_false(self):
+    async def test_memory_exists_false(self, memory_manager):
         """Test memory_exists returns False for new project."""
-        from chainguard.memory import ProjectMemoryManager
         import uuid
 
-        manager = ProjectMemoryManager()
         # Use a truly unique random ID to avoid false positives
         random_id = f"test_{uuid.uuid4().hex[:16]}"
-        exists = await manager.memory_exists(random_id)
+        exists = await memory_manager.memory_exists(random_id)
         assert exists is False
 
     @pytest.mark.asyncio
-    async def test_list_projects_empty(self):
-        """Test list_projects with no projects."""
+    async def test_memory_exists_true_is_cached(self):
+        """Test memory_exists detects the DB file and caches positive results."""
         from chainguard.memory import ProjectMemoryManager
 
         manager = ProjectMemoryManager()
-        projects = await manager.list_projects()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            home = Path(tmpdir)
+            (home / "proj1").mkdir()
+            (home / "proj1" / "chroma.sqlite3").write_text("")
+
+            with patch("chainguard.memory.MEMORY_HOME", home):
+                assert await manager.memory_exists("proj1") is True
+                assert await manager.memory_exists("proj2") is False
+
+                # Cached: still True even though the file is gone
+                (home / "proj1" / "chroma.sqlite3").unlink()
+                assert await manager.memory_exists("proj1") is True
+
+    @pytest.mark.asyncio
+    async def test_memory_exists_negative_not_cached(self):
+        """Test that a memory created later is detected."""
+        from chainguard.memory import ProjectMemoryManager
+
+        manager = ProjectMemoryManager()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            home = Path(tmpdir)
+
+            with patch("chainguard.memory.MEMORY_HOME", home):
+                assert await manager.memory_exists("proj1") is False
+
+                (home / "proj1").mkdir()
+                (home / "proj1" / "chroma.sqlite3").write_text("")
+                assert await manager.memory_exists("proj1") is True
+
+    @pytest.mark.asyncio
+    async def test_list_projects_empty(self, memory_manager):
+        """Test list_projects with no projects."""
+        projects = await memory_manager.list_projects()
         assert isinstance(projects, list)
 
+    @pytest.mark.asyncio
+    async def test_close_all(self):
+        """Test close_all releases all open instances."""
+        from chainguard.memory import ProjectMemoryManager, ProjectMemory
+
+        manager = ProjectMemoryManager()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager._instances["p1"] = ProjectMemory("p1", Path(tmpdir))
+            manager._instances["p2"] = ProjectMemory("p2", Path(tmpdir))
+
+            await manager.close_all()
+
+            assert manager._instances == {}
+
 
 class TestSmartContextInjector:
     """Tests for SmartContextInjector class."""
@@ -390,11 +519,25 @@ class TestMemoryHome:
 class TestCollections:
     """Tests for COLLECTIONS constant."""
 
+    def test_collection_names_interned(self):
+        """Test that scored results share the interned collection names."""
+        from chainguard.memory import COLLECTIONS, RelevanceScorer, MemoryDocument
+
+        name = "".join(["code_", "structure"])  # Fresh, non-interned string
+        result = RelevanceScorer.score(
+            document=MemoryDocument(id="d", content="x"),
+            semantic_distance=1.0,
+            keywords=[],
+            collection=name
+        )
+
+        assert result.collection is COLLECTIONS[0]
+
     def test_collections_defined(self):
-        """Test that COLLECTIONS list is defined."""
+        """Test that COLLECTIONS tuple is defined."""
         from chainguard.memory import COLLECTIONS
 
-        assert isinstance(COLLECTIONS, list)
+        assert isinstance(COLLECTIONS, tuple)
         assert "code_structure" in COLLECTIONS
         assert "functions" in COLLECTIONS
         assert "database_schema" in COLLECTIONS
@@ -409,7 +552,7 @@ class TestScoringWeights:
         """Test that SCORING_WEIGHTS are defined."""
         from chainguard.memory import SCORING_WEIGHTS
 
-        assert isinstance(SCORING_WEIGHTS, dict)
+        assert isinstance(SCORING_WEIGHTS, Mapping)
         assert "semantic" in SCORING_WEIGHTS
         assert "keyword" in SCORING_WEIGHTS
         assert "recency" in SCORING_WEIGHTS
@@ -421,6 +564,13 @@ class TestScoringWeights:
         total = sum(SCORING_WEIGHTS.values())
         assert 0.99 <= total <= 1.01  # Allow small floating point variance
 
+    def test_weights_read_only(self):
+        """Test that SCORING_WEIGHTS cannot be mutated at runtime."""
+        from chainguard.memory import SCORING_WEIGHTS
+
+        with pytest.raises(TypeError):
+            SCORING_WEIGHTS["semantic"] = 1.0
+
 
 # =============================================================================
 # Phase 2 Tests: Auto-Update & Session Consolidation (v5.2)
@@ -626,16 +776,15 @@ class TestProjectMemoryIntegration:
     """Integration tests that require chromadb."""
 
     @pytest.mark.asyncio
-    async def test_create_and_query_memory(self):
+    async def test_create_and_query_memory(self, memory_manager):
         """Test creating memory and querying it."""
-        from chainguard.memory import ProjectMemoryManager, get_project_id
+        from chainguard.memory import get_project_id
         import tempfile
 
         with tempfile.TemporaryDirectory() as tmpdir:
             project_id = get_project_id(tmpdir)
-            manager = ProjectMemoryManager()
 
-            memory = await manager.get_memory(project_id, tmpdir)
+            memory = await memory_manager.get_memory(project_id, tmpdir)
 
             # Add a document
             doc_id = await memory.add(
@@ -660,49 +809,75 @@ class TestProjectMemoryIntegration:
 class TestProjectMemoryMethods:
     """Tests for ProjectMemory methods added for export/import support."""
 
-    def test_get_all_method_exists(self):
-        """Test that get_all method exists on ProjectMemory."""
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def params():
+        """Parameter names of the export/import methods (computed once per class)."""
         from chainguard.memory import ProjectMemory
         import inspect
 
-        assert hasattr(ProjectMemory, 'get_all')
-        sig = inspect.signature(ProjectMemory.get_all)
-        params = list(sig.parameters.keys())
-        assert 'collection' in params
+        names = ("get_all", "get", "clear_collection", "add_with_embedding",
+                 "add_many_with_embeddings")
+        return {
+            name: list(inspect.signature(getattr(ProjectMemory, name)).parameters)
+            for name in names
+            if hasattr(ProjectMemory, name)
+        }
 
-    def test_get_method_exists(self):
-        """Test that get method exists on ProjectMemory."""
-        from chainguard.memory import ProjectMemory
-        import inspect
+    def test_get_all_method_exists(self, params):
+        """Test that get_all method exists on ProjectMemory."""
+        assert 'get_all' in params
+        assert 'collection' in params['get_all']
 
-        assert hasattr(ProjectMemory, 'get')
-        sig = inspect.signature(ProjectMemory.get)
-        params = list(sig.parameters.keys())
-        assert 'doc_id' in params
-        assert 'collection' in params
+    def test_get_method_exists(self, params):
+        """Test that get method exists on ProjectMemory."""
+        assert 'get' in params
+        assert 'doc_id' in params['get']
+        assert 'collection' in params['get']
 
-    def test_clear_collection_method_exists(self):
+    def test_clear_collection_method_exists(self, params):
         """Test that clear_collection method exists on ProjectMemory."""
-        from chainguard.memory import ProjectMemory
-        import inspect
-
-        assert hasattr(ProjectMemory, 'clear_collection')
-        sig = inspect.signature(ProjectMemory.clear_collection)
-        params = list(sig.parameters.keys())
-        assert 'collection' in params
+        assert 'clear_collection' in params
+        assert 'collection' in params['clear_collection']
 
-    def test_add_with_embedding_method_exists(self):
+    def test_add_with_embedding_method_exists(self, params):
         """Test that add_with_embedding method exists on ProjectMemory."""
+        assert 'add_with_embedding' in params
+        assert 'doc_id' in params['add_with_embedding']
+        assert 'content' in params['add_with_embedding']
+        assert 'collection' in params['add_with_embedding']
+        assert 'embedding' in params['add_with_embedding']
+
+    def test_add_many_with_embeddings_method_exists(self, params):
+        """Test that add_many_with_embeddings method exists on ProjectMemory."""
+        assert 'add_many_with_embeddings' in params
+        assert 'batch' in params['add_many_with_embeddings']
+
+    @pytest.mark.asyncio
+    async def test_add_many_with_embeddings_groups_by_collection(self):
+        """Test that bulk add issues one ChromaDB call per collection."""
         from chainguard.memory import ProjectMemory
-        import inspect
 
-        assert hasattr(ProjectMemory, 'add_with_embedding')
-        sig = inspect.signature(ProjectMemory.add_with_embedding)
-        params = list(sig.parameters.keys())
-        assert 'doc_id' in params
-        assert 'content' in params
-        assert 'collection' in params
-        assert 'embedding' in params
+        with tempfile.TemporaryDirectory() as tmpdir:
+            functions, learnings = MagicMock(), MagicMock()
+            memory = ProjectMemory("p1", Path(tmpdir))
+            memory._initialized = True
+            memory._collections = {"functions": functions, "learnings": learnings}
+
+            added = await memory.add_many_with_embeddings([
+                ("f1", "def a()", "functions", {"type": "function"}, [0.1, 0.2]),
+                ("l1", "Session", "learnings", None, [0.3, 0.4]),
+                ("f2", "def b()", "functions", None, [0.5, 0.6]),
+            ])
+            await memory.close()
+
+        assert added == 3
+        functions.add.assert_called_once()
+        learnings.add.assert_called_once()
+        kwargs = functions.add.call_args.kwargs
+        assert kwargs["ids"] == ["f1", "f2"]
+        assert kwargs["embeddings"] == [[0.1, 0.2], [0.5, 0.6]]
+        assert kwargs["metadatas"][0]["collection"] == "functions"
 
     def test_all_export_import_methods_present(self):
         """Verify all methods required for export/import are present."""
@@ -5,9 +5,31 @@ Tests memory export and import functionality.
 """
 
 import pytest
+import sys
 import tempfile
 import json
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from chainguard.config import CHAINGUARD_HOME
+from chainguard.memory_export import (
+    ExportMetadata,
+    ExportDocument,
+    ExportResult,
+    ImportResult,
+    MemoryExporter,
+    MemoryImporter,
+    memory_exporter,
+    memory_importer,
+    list_exports,
+    quantize_embedding,
+    dequantize_embedding,
+    EXPORT_DIR,
+    EXPORT_FORMAT_VERSION,
+    MAX_DOCS_PER_FILE,
+)
+from chainguard.jsonutil import ORJSON_AVAILABLE
+from chainguard.memory import MemoryDocument
 
 
 class TestExportMetadata:
@@ -15,13 +37,10 @@ class TestExportMetadata:
 
     def test_import(self):
         """Test that ExportMetadata can be imported."""
-        from chainguard.memory_export import ExportMetadata
         assert ExportMetadata is not None
 
     def test_create_metadata(self):
         """Test creating ExportMetadata."""
-        from chainguard.memory_export import ExportMetadata
-
         metadata = ExportMetadata(
             project_id="abc123def456gh",
             project_path="/path/to/project",
@@ -37,8 +56,6 @@ class TestExportMetadata:
 
     def test_to_dict(self):
         """Test ExportMetadata.to_dict()."""
-        from chainguard.memory_export import ExportMetadata
-
         metadata = ExportMetadata(
             project_id="test123",
             export_date="2025-01-08",
@@ -53,8 +70,6 @@ class TestExportMetadata:
 
     def test_from_dict(self):
         """Test ExportMetadata.from_dict()."""
-        from chainguard.memory_export import ExportMetadata
-
         data = {
             "project_id": "abc123",
             "project_path": "/test",
@@ -74,13 +89,10 @@ class TestExportDocument:
 
     def test_import(self):
         """Test that ExportDocument can be imported."""
-        from chainguard.memory_export import ExportDocument
         assert ExportDocument is not None
 
     def test_create_document(self):
         """Test creating an ExportDocument."""
-        from chainguard.memory_export import ExportDocument
-
         doc = ExportDocument(
             id="doc123",
             content="Test content here",
@@ -95,8 +107,6 @@ class TestExportDocument:
 
     def test_document_with_embedding(self):
         """Test ExportDocument with embedding."""
-        from chainguard.memory_export import ExportDocument
-
         doc = ExportDocument(
             id="doc456",
             content="Test",
@@ -109,8 +119,6 @@ class TestExportDocument:
 
     def test_to_dict(self):
         """Test ExportDocument.to_dict()."""
-        from chainguard.memory_export import ExportDocument
-
         doc = ExportDocument(
             id="test",
             content="content",
@@ -126,8 +134,6 @@ class TestExportDocument:
 
     def test_to_dict_with_embedding(self):
         """Test ExportDocument.to_dict() with embedding."""
-        from chainguard.memory_export import ExportDocument
-
         doc = ExportDocument(
             id="test",
             content="content",
@@ -141,8 +147,6 @@ class TestExportDocument:
 
     def test_from_dict(self):
         """Test ExportDocument.from_dict()."""
-        from chainguard.memory_export import ExportDocument
-
         data = {
             "id": "doc1",
             "content": "Hello",
@@ -155,19 +159,51 @@ class TestExportDocument:
         assert doc.content == "Hello"
         assert doc.metadata["x"] == 1
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_uses_slots(self):
+        """Test that ExportDocument instances carry no per-instance __dict__."""
+        doc = ExportDocument(id="s", content="c", collection="col")
+        assert not hasattr(doc, "__dict__")
+
+    def test_to_dict_quantized_round_trip(self):
+        """Test quantized embeddings survive a to_dict/from_dict round trip."""
+        embedding = [0.12, -0.5, 0.33, 0.0, 0.98]
+        doc = ExportDocument(id="q", content="c", collection="col", embedding=embedding)
+
+        d = doc.to_dict(quantize=True)
+        assert "embedding" not in d
+        assert all(isinstance(v, int) and -127 <= v <= 127 for v in d["embedding_q8"])
+
+        restored = ExportDocument.from_dict(json.loads(json.dumps(d)))
+        for original, value in zip(embedding, restored.embedding):
+            assert abs(original - value) < 0.01
+
+
+class TestEmbeddingQuantization:
+    """Tests for int8 embedding quantization."""
+
+    def test_quantize_scale(self):
+        """Test that the largest component maps to +/-127."""
+        values, scale = quantize_embedding([0.2, -0.4, 0.1])
+        assert values[1] == -127
+        assert scale == pytest.approx(0.4 / 127)
+
+    def test_quantize_zero_vector(self):
+        """Test that a zero vector does not divide by zero."""
+        values, scale = quantize_embedding([0.0, 0.0])
+        assert values == [0, 0]
+        assert dequantize_embedding(values, scale) == [0.0, 0.0]
+
 
 class TestExportResult:
     """Tests for ExportResult dataclass."""
 
     def test_import(self):
         """Test that ExportResult can be imported."""
-        from chainguard.memory_export import ExportResult
         assert ExportResult is not None
 
     def test_success_result(self):
         """Test creating a successful ExportResult."""
-        from chainguard.memory_export import ExportResult
-
         result = ExportResult(
             success=True,
             file_path="/exports/test.json",
@@ -181,8 +217,6 @@ class TestExportResult:
 
     def test_failure_result(self):
         """Test creating a failed ExportResult."""
-        from chainguard.memory_export import ExportResult
-
         result = ExportResult(
             success=False,
             error="Permission denied"
@@ -193,8 +227,6 @@ class TestExportResult:
 
     def test_to_dict(self):
         """Test ExportResult.to_dict()."""
-        from chainguard.memory_export import ExportResult
-
         result = ExportResult(
             success=True,
             file_path="/test.json",
@@ -212,13 +244,10 @@ class TestImportResult:
 
     def test_import(self):
         """Test that ImportResult can be imported."""
-        from chainguard.memory_export import ImportResult
         assert ImportResult is not None
 
     def test_success_result(self):
         """Test creating a successful ImportResult."""
-        from chainguard.memory_export import ImportResult
-
         result = ImportResult(
             success=True,
             documents_imported=100,
@@ -232,8 +261,6 @@ class TestImportResult:
 
     def test_to_dict(self):
         """Test ImportResult.to_dict()."""
-        from chainguard.memory_export import ImportResult
-
         result = ImportResult(
             success=True,
             documents_imported=50,
@@ -251,16 +278,11 @@ class TestExportDir:
 
     def test_export_dir_exists(self):
         """Test that EXPORT_DIR is defined."""
-        from chainguard.memory_export import EXPORT_DIR
-
         assert EXPORT_DIR is not None
         assert isinstance(EXPORT_DIR, Path)
 
     def test_export_dir_in_chainguard(self):
         """Test that EXPORT_DIR is under CHAINGUARD_HOME."""
-        from chainguard.memory_export import EXPORT_DIR
-        from chainguard.config import CHAINGUARD_HOME
-
         assert EXPORT_DIR.parent == CHAINGUARD_HOME
         assert EXPORT_DIR.name == "exports"
 
@@ -270,21 +292,16 @@ class TestMemoryExporter:
 
     def test_import(self):
         """Test that MemoryExporter can be imported."""
-        from chainguard.memory_export import MemoryExporter
         assert MemoryExporter is not None
 
     def test_create_exporter(self):
         """Test creating a MemoryExporter."""
-        from chainguard.memory_export import MemoryExporter
-
         exporter = MemoryExporter()
         assert exporter is not None
         assert hasattr(exporter, "version")
 
     def test_global_exporter_exists(self):
         """Test that global memory_exporter instance exists."""
-        from chainguard.memory_export import memory_exporter
-
         assert memory_exporter is not None
 
 
@@ -293,42 +310,152 @@ class TestMemoryImporter:
 
     def test_import(self):
         """Test that MemoryImporter can be imported."""
-        from chainguard.memory_export import MemoryImporter
         assert MemoryImporter is not None
 
     def test_create_importer(self):
         """Test creating a MemoryImporter."""
-        from chainguard.memory_export import MemoryImporter
-
         importer = MemoryImporter()
         assert importer is not None
 
     def test_global_importer_exists(self):
         """Test that global memory_importer instance exists."""
-        from chainguard.memory_export import memory_importer
-
         assert memory_importer is not None
 
+    @pytest.mark.asyncio
+    async def test_import_json_batches_embedded_documents(self):
+        """Test that documents with embeddings are imported in one batch."""
+        memory = MagicMock()
+        memory.add_many_with_embeddings = AsyncMock(return_value=2)
+        memory.add_with_embedding = AsyncMock()
+
+        data = {
+            "metadata": {"collections": ["functions"]},
+            "documents": [
+                {"id": "1", "content": "a", "collection": "functions", "embedding": [0.1]},
+                {"id": "2", "content": "b", "collection": "functions", "embedding": [0.2]},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "export.json"
+            path.write_text(json.dumps(data))
+
+            result = await MemoryImporter().import_json(memory, str(path), skip_existing=False)
+
+        assert result.success is True
+        assert result.documents_imported == 2
+        memory.add_many_with_embeddings.assert_awaited_once()
+        memory.add_with_embedding.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_import_json_batch_falls_back_to_single_inserts(self):
+        """Test that a failed batch write falls back to per-document inserts."""
+        memory = MagicMock()
+        memory.add_many_with_embeddings = AsyncMock(side_effect=ValueError("bad batch"))
+        memory.add_with_embedding = AsyncMock(side_effect=[None, ValueError("bad doc")])
+
+        data = {
+            "metadata": {"collections": ["functions"]},
+            "documents": [
+                {"id": "1", "content": "a", "collection": "functions", "embedding": [0.1]},
+                {"id": "2", "content": "b", "collection": "functions", "embedding": [0.2]},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "export.json"
+            path.write_text(json.dumps(data))
+
+            result = await MemoryImporter().import_json(memory, str(path), skip_existing=False)
+
+        assert result.success is True
+        assert result.documents_imported == 1
+        assert result.documents_skipped == 1
+
+    @pytest.mark.asyncio
+    async def test_import_json_progress_follows_batch_writes(self, monkeypatch):
+        """Test that embedded documents count as progress only once stored."""
+        monkeypatch.setattr("chainguard.memory_export.IMPORT_BATCH_SIZE", 2)
+        events = []
+
+        async def add_many(batch):
+            events.append(("write", [doc_id for doc_id, *_ in batch]))
+            return len(batch)
+
+        memory = MagicMock()
+        memory.add = AsyncMock()
+        memory.add_many_with_embeddings = AsyncMock(side_effect=add_many)
+
+        data = {
+            "metadata": {"collections": ["functions"]},
+            "documents": [
+                {"id": "1", "content": "a", "collection": "functions", "embedding": [0.1]},
+                {"id": "2", "content": "b", "collection": "functions"},
+                {"id": "3", "content": "c", "collection": "functions", "embedding": [0.3]},
+                {"id": "4", "content": "d", "collection": "functions", "embedding": [0.4]},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "export.json"
+            path.write_text(json.dumps(data))
+
+            result = await MemoryImporter().import_json(
+                memory, str(path), skip_existing=False,
+                progress_callback=lambda current, total: events.append(("progress", current)),
+            )
+
+        assert result.documents_imported == 4
+        assert events == [
+            ("write", ["1", "3"]),
+            ("progress", 3),
+            ("write", ["4"]),
+            ("progress", 4),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_import_json_fallback_retries_only_failed_collection(self):
+        """Test that documents of a written collection are not re-added."""
+        async def add_many(batch):
+            if batch[0][2] == "patterns":
+                raise ValueError("bad batch")
+            return len(batch)
+
+        memory = MagicMock()
+        memory.add_many_with_embeddings = AsyncMock(side_effect=add_many)
+        memory.add_with_embedding = AsyncMock()
+
+        data = {
+            "metadata": {"collections": ["functions", "patterns"]},
+            "documents": [
+                {"id": "1", "content": "a", "collection": "functions", "embedding": [0.1]},
+                {"id": "2", "content": "b", "collection": "patterns", "embedding": [0.2]},
+                {"id": "3", "content": "c", "collection": "functions", "embedding": [0.3]},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "export.json"
+            path.write_text(json.dumps(data))
+
+            result = await MemoryImporter().import_json(memory, str(path), skip_existing=False)
+
+        assert result.documents_imported == 3
+        assert sorted(result.collections_imported) == ["functions", "patterns"]
+        memory.add_with_embedding.assert_awaited_once()
+        assert memory.add_with_embedding.call_args.kwargs["doc_id"] == "2"
+
 
 class TestListExports:
     """Tests for list_exports function."""
 
     def test_import(self):
         """Test that list_exports can be imported."""
-        from chainguard.memory_export import list_exports
         assert list_exports is not None
 
     def test_list_returns_list(self):
         """Test that list_exports returns a list."""
-        from chainguard.memory_export import list_exports
-
         result = list_exports()
         assert isinstance(result, list)
 
     def test_list_with_project_filter(self):
         """Test list_exports with project filter."""
-        from chainguard.memory_export import list_exports
-
         # Should not raise even with filter
         result = list_exports("abc12345")
         assert isinstance(result, list)
@@ -339,8 +466,6 @@ class TestExportFormatVersion:
 
     def test_format_version_exists(self):
         """Test that EXPORT_FORMAT_VERSION is defined."""
-        from chainguard.memory_export import EXPORT_FORMAT_VERSION
-
         assert EXPORT_FORMAT_VERSION is not None
         assert EXPORT_FORMAT_VERSION == "1.0"
 
@@ -350,8 +475,6 @@ class TestMaxDocsPerFile:
 
     def test_constant_exists(self):
         """Test that MAX_DOCS_PER_FILE is defined."""
-        from chainguard.memory_export import MAX_DOCS_PER_FILE
-
         assert MAX_DOCS_PER_FILE is not None
         assert MAX_DOCS_PER_FILE == 10000
 
@@ -361,8 +484,6 @@ class TestJsonExportFormat:
 
     def test_create_valid_export_structure(self):
         """Test creating a valid export structure."""
-        from chainguard.memory_export import ExportMetadata, ExportDocument
-
         metadata = ExportMetadata(
             project_id="test123",
             export_date="2025-01-08",
@@ -396,8 +517,6 @@ class TestJsonlExportFormat:
 
     def test_create_valid_jsonl_lines(self):
         """Test creating valid JSONL lines."""
-        from chainguard.memory_export import ExportMetadata, ExportDocument
-
         metadata = ExportMetadata(
             project_id="test",
             export_date="2025-01-08",
@@ -417,3 +536,96 @@ class TestJsonlExportFormat:
         for line in lines:
             parsed = json.loads(line)
             assert isinstance(parsed, dict)
+
+    @pytest.mark.asyncio
+    async def test_export_streams_large_collection(self):
+        """Test that export_jsonl streams records instead of buffering them."""
+        import tracemalloc
+
+        docs = [
+            (MemoryDocument(id=str(i), content="x" * 500, metadata={"i": i}), None)
+            for i in range(MAX_DOCS_PER_FILE)
+        ]
+        memory = MagicMock()
+        memory.project_id = "abcdef1234567890"
+        memory.get_all = AsyncMock(return_value=docs)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "large.jsonl"
+            tracemalloc.start()
+            try:
+                result = await MemoryExporter().export_jsonl(
+                    memory, output_path=str(path), collections=["functions"]
+                )
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            file_size = path.stat().st_size
+
+        assert result.success is True
+        assert result.documents_exported == MAX_DOCS_PER_FILE
+        # Peak stays well below the ~5 MB of serialized output
+        assert peak < file_size / 2
+
+
+class TestJsonBackends:
+    """Tests for export/import round trips with orjson and stdlib json."""
+
+    @pytest.fixture(params=[
+        pytest.param(True, marks=pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")),
+        False,
+    ], ids=["orjson", "stdlib"])
+    def json_backend(self, request, monkeypatch):
+        monkeypatch.setattr("chainguard.jsonutil.ORJSON_AVAILABLE", request.param)
+        return request.param
+
+    @staticmethod
+    def _source_memory():
+        memory = MagicMock()
+        memory.project_id = "abcdef1234567890"
+        memory.project_path = "/test"
+        memory.get_all = AsyncMock(return_value=[
+            (MemoryDocument(id="1", content="Grüße", metadata={"type": "file"}), [0.25, -0.5]),
+        ])
+        return memory
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compress", [False, True])
+    async def test_json_round_trip(self, json_backend, compress):
+        """Test export_json output is readable by import_json."""
+        target = MagicMock()
+        target.add_many_with_embeddings = AsyncMock(return_value=1)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / ("export.json.gz" if compress else "export.json"))
+            exported = await MemoryExporter().export_json(
+                self._source_memory(), output_path=path, collections=["functions"],
+                include_embeddings=True, compress=compress,
+            )
+            result = await MemoryImporter().import_json(target, path, skip_existing=False)
+
+        assert exported.success is True
+        assert result.documents_imported == 1
+        (batch,), _ = target.add_many_with_embeddings.call_args
+        assert batch[0][1] == "Grüße"
+        assert batch[0][4] == [0.25, -0.5]
+
+    @pytest.mark.asyncio
+    async def test_jsonl_round_trip(self, json_backend):
+        """Test export_jsonl output is readable by import_jsonl."""
+        target = MagicMock()
+        target.add_with_embedding = AsyncMock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "export.jsonl")
+            exported = await MemoryExporter().export_jsonl(
+                self._source_memory(), output_path=path, collections=["functions"],
+                include_embeddings=True,
+            )
+            lines = Path(path).read_text(encoding="utf-8").splitlines()
+            result = await MemoryImporter().import_jsonl(target, path, skip_existing=False)
+
+        assert exported.success is True
+        assert "_metadata" in json.loads(lines[0])
+        assert result.documents_imported == 1
+        assert target.add_with_embedding.call_args.kwargs["content"] == "Grüße"
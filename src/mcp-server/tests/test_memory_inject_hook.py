@@ -18,6 +18,19 @@ HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
 sys.path.insert(0, str(HOOKS_DIR))
 
 
+@pytest.fixture(autouse=True)
+def isolate_hook_paths(tmp_path, monkeypatch):
+    """Point the hook's MEMORY_HOME and cache files into a per-test tmp_path."""
+    import chainguard_memory_inject
+
+    memory_home = tmp_path / "memory"
+    memory_home.mkdir()
+    monkeypatch.setattr(chainguard_memory_inject, "MEMORY_HOME", memory_home)
+    monkeypatch.setattr(chainguard_memory_inject, "CACHE_FILE", tmp_path / "memory_inject_cache.db")
+    monkeypatch.setattr(chainguard_memory_inject, "LEGACY_CACHE_FILE", tmp_path / "memory_inject_cache.json")
+    return memory_home
+
+
 class TestGetProjectId:
     """Tests for get_project_id function."""
 
@@ -47,6 +60,13 @@ class TestGetProjectId:
         id2 = get_project_id("/path/to/project2")
         assert id1 != id2
 
+    def test_matches_server_project_id(self, tmp_path):
+        """Test that the hook computes the same ID as the MCP server."""
+        from chainguard_memory_inject import get_project_id
+        from chainguard.memory import get_project_id as server_project_id
+
+        assert get_project_id(str(tmp_path)) == server_project_id(str(tmp_path))
+
 
 class TestExtractKeywords:
     """Tests for extract_keywords function."""
@@ -95,6 +115,13 @@ class TestExtractKeywords:
         keywords = extract_keywords(long_text)
         assert len(keywords) <= 10
 
+    def test_keeps_first_occurrence_order(self):
+        """Test that duplicates are removed and prompt order is kept."""
+        from chainguard_memory_inject import extract_keywords
+
+        keywords = extract_keywords("fix login, then test login and fix logout")
+        assert keywords == ["fix", "login", "then", "test", "logout"]
+
 
 class TestMemoryExists:
     """Tests for memory_exists function."""
@@ -111,15 +138,20 @@ class TestMemoryExists:
         from chainguard_memory_inject import memory_exists, MEMORY_HOME
 
         # Create directory without chroma.sqlite3
-        test_dir = MEMORY_HOME / "test_project_1234"
-        test_dir.mkdir(parents=True, exist_ok=True)
+        (MEMORY_HOME / "test_project_1234").mkdir()
+
+        result = memory_exists("test_project_1234")
+        assert result is False
 
-        try:
-            result = memory_exists("test_project_1234")
-            assert result is False
-        finally:
-            # Cleanup
-            test_dir.rmdir()
+    def test_returns_true_with_chroma_sqlite(self):
+        """Test returns True when chroma.sqlite3 exists."""
+        from chainguard_memory_inject import memory_exists, MEMORY_HOME
+
+        (MEMORY_HOME / "abc123").mkdir()
+        (MEMORY_HOME / "abc123" / "chroma.sqlite3").touch()
+
+        assert memory_exists("abc123") is True
+        assert memory_exists("def456") is False
 
 
 class TestCaching:
@@ -129,9 +161,7 @@ class TestCaching:
         """Test cache save and load."""
         from chainguard_memory_inject import (
             get_cached_context,
-            set_cached_context,
-            load_cache,
-            CACHE_FILE
+            set_cached_context
         )
 
         # Save to cache
@@ -143,38 +173,72 @@ class TestCaching:
         cached = get_cached_context(test_key)
         assert cached == test_context
 
-        # Cleanup
-        if CACHE_FILE.exists():
-            CACHE_FILE.unlink()
-
     def test_cache_expiration(self):
         """Test that cached context expires after TTL."""
         import time
         from chainguard_memory_inject import (
             get_cached_context,
-            CACHE_FILE,
+            set_cached_context,
             CACHE_TTL
         )
 
         # Create expired cache entry
-        cache_data = {
-            "expired_key": {
-                "context": "old content",
-                "timestamp": time.time() - CACHE_TTL - 100  # Expired
-            }
-        }
-
-        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache_data, f)
+        expired_at = time.time() - CACHE_TTL - 100
+        with patch("chainguard_memory_inject.time.time", return_value=expired_at):
+            set_cached_context("expired_key", "old content")
 
         # Should return None for expired entry
         cached = get_cached_context("expired_key")
         assert cached is None
 
-        # Cleanup
-        if CACHE_FILE.exists():
-            CACHE_FILE.unlink()
+    def test_cache_prunes_oldest_entries(self):
+        """Test that the cache is pruned to the newest entries."""
+        import sqlite3
+        from contextlib import closing
+        from chainguard_memory_inject import (
+            get_cached_context,
+            set_cached_context,
+            CACHE_FILE,
+            CACHE_MAX_ENTRIES
+        )
+
+        for i in range(CACHE_MAX_ENTRIES + 1):
+            set_cached_context(f"prune_{i}", f"context_{i}")
+
+        with closing(sqlite3.connect(str(CACHE_FILE))) as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        assert count == CACHE_MAX_ENTRIES // 2
+        assert get_cached_context(f"prune_{CACHE_MAX_ENTRIES}") == f"context_{CACHE_MAX_ENTRIES}"
+
+    def test_cache_read_does_not_set_up_db(self):
+        """Test that a lookup opens a plain connection without schema/PRAGMA setup."""
+        import chainguard_memory_inject
+        from chainguard_memory_inject import get_cached_context, set_cached_context
+
+        set_cached_context("read_key", "context")
+        with patch.object(chainguard_memory_inject, "open_cache") as mock_open:
+            assert get_cached_context("read_key") == "context"
+        mock_open.assert_not_called()
+
+    def test_cache_read_without_db_creates_nothing(self):
+        """Test that a lookup before the first write leaves no cache file."""
+        from chainguard_memory_inject import CACHE_FILE, get_cached_context
+
+        assert get_cached_context("missing") is None
+        assert not CACHE_FILE.exists()
+
+    def test_legacy_json_cache_removed_on_db_creation(self):
+        """Test that the old JSON cache is deleted once the DB is created."""
+        from chainguard_memory_inject import LEGACY_CACHE_FILE, set_cached_context
+
+        LEGACY_CACHE_FILE.write_text("{}")
+        set_cached_context("key", "context")
+        assert not LEGACY_CACHE_FILE.exists()
+
+        # Only on creation: a later file is left alone
+        LEGACY_CACHE_FILE.write_text("{}")
+        set_cached_context("key2", "context")
+        assert LEGACY_CACHE_FILE.exists()
 
 
 class TestFormatContext:
@@ -260,6 +324,23 @@ class TestHookInput:
 
             assert exc_info.value.code == 0
 
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_parse_hook_input(self, orjson_available):
+        """Test hook input parsing with orjson and stdlib json."""
+        import chainguard_memory_inject
+        from chainguard_memory_inject import parse_hook_input
+
+        if orjson_available and not chainguard_memory_inject.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+
+        with patch("chainguard_memory_inject.ORJSON_AVAILABLE", orjson_available):
+            assert parse_hook_input('{"prompt": "Grüße", "cwd": "/tmp"}') == {
+                "prompt": "Grüße", "cwd": "/tmp"
+            }
+            assert parse_hook_input("") == {}
+            assert parse_hook_input("{broken") == {}
+            assert parse_hook_input("[1, 2]") == {}
+
 
 class TestQueryMemorySync:
     """Tests for query_memory_sync function."""
@@ -285,44 +366,32 @@ class TestQueryMemorySync:
 
 
 class TestPerformance:
-    """Performance-related tests."""
+    """Performance-related tests (timed with pytest-benchmark)."""
 
-    def test_keyword_extraction_fast(self):
-        """Test that keyword extraction is fast."""
-        import time
+    @pytest.mark.benchmark(max_time=0.5)
+    def test_keyword_extraction_fast(self, benchmark):
+        """Benchmark keyword extraction on a 1000-word prompt."""
         from chainguard_memory_inject import extract_keywords
 
         long_text = " ".join(["word" + str(i) for i in range(1000)])
 
-        start = time.time()
-        for _ in range(100):
-            extract_keywords(long_text)
-        elapsed = time.time() - start
-
-        # Should complete 100 extractions in < 1 second
-        assert elapsed < 1.0
+        keywords = benchmark(extract_keywords, long_text)
+        assert len(keywords) == 10
 
-    def test_cache_operations_fast(self):
-        """Test that cache operations are fast."""
-        import time
+    def test_cache_operations_fast(self, benchmark):
+        """Benchmark 100 cache writes and reads."""
         from chainguard_memory_inject import (
             set_cached_context,
-            get_cached_context,
-            CACHE_FILE
+            get_cached_context
         )
 
-        start = time.time()
-        for i in range(100):
-            set_cached_context(f"key_{i}", f"context_{i}")
-            get_cached_context(f"key_{i}")
-        elapsed = time.time() - start
-
-        # Should complete 200 operations in < 1 second
-        assert elapsed < 1.0
+        def cache_roundtrips():
+            for i in range(100):
+                set_cached_context(f"key_{i}", f"context_{i}")
+                get_cached_context(f"key_{i}")
 
-        # Cleanup
-        if CACHE_FILE.exists():
-            CACHE_FILE.unlink()
+        benchmark.pedantic(cache_roundtrips, rounds=5, iterations=1)
+        assert get_cached_context("key_99") == "context_99"
 
 
 class TestConstants:
@@ -344,6 +344,24 @@ class TestProjectState:
         assert restored.scope.description == original.scope.description
 
 
+    def test_mode_log_accepts_null_values(self):
+        """Test that null tool arguments are stored as before, not interned."""
+        state = ProjectState(
+            project_id="test123",
+            project_name="TestProject",
+            project_path="/tmp/test"
+        )
+        state.add_command("make", result=None)
+        state.add_source("https://example.com", relevance=None)
+        state.add_fact("fact", confidence=None)
+        state.set_chapter_status("intro", None)
+
+        assert state.command_history[-1]["result"] is None
+        assert state.sources[-1]["relevance"] is None
+        assert state.facts[-1]["confidence"] is None
+        assert state.chapter_status["intro"] is None
+
+
 class TestHTTPTestWarning:
     """Tests for v4.15 HTTP test BLOCKING in get_completion_status."""
 
@@ -432,6 +450,24 @@ class TestHTTPTestWarning:
         http_issues = [i for i in status["issues"] if i.get("type") == "http_test"]
         assert len(http_issues) == 0
 
+    def test_web_file_detection_sources(self):
+        """Web files are found case-insensitively and via scope modules."""
+        state = ProjectState(
+            project_id="test",
+            project_name="Test",
+            project_path="/tmp"
+        )
+        state.changed_files = ["README.md", "views/Index.HTML", "Page.Blade.PHP"]
+        issue = state._check_http_test_needed()
+        assert issue["details"] == ["views/Index.HTML", "Page.Blade.PHP"]
+
+        state.changed_files = []
+        state.files_changed = 1
+        state.scope = ScopeDefinition(description="Test", modules=["src/*php", "docs/", "app.vue"])
+        issue = state._check_http_test_needed()
+        assert issue["blocking"] is False
+        assert issue["details"] == ["src/*php", "app.vue"]
+
     def test_http_tests_performed_default(self):
         """Test that http_tests_performed defaults to 0."""
         state = ProjectState(
@@ -2110,6 +2110,16 @@ import f from 'f';
         )
         assert conf < 1.0
 
+    def test_name_heuristics(self):
+        """Prefix heuristics match at the start; suffix names match exactly."""
+        calc = ConfidenceCalculator()
+        assert calc._looks_like_external("getUser", Language.PHP)
+        assert calc._looks_like_external("Handler", Language.PHP)
+        assert not calc._looks_like_external("userHandler", Language.PHP)
+        assert not calc._looks_like_external("getuser", Language.PHP)
+        assert calc._is_common_pattern("ValidateInput")
+        assert not calc._is_common_pattern("computeTotal")
+
 
 # =============================================================================
 # ADAPTIVE VALIDATION TESTS
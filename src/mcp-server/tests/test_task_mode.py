@@ -14,8 +14,8 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from chainguard.config import (
-    TaskMode, ModeFeatures, TASK_MODE_CONFIG, TASK_MODE_CONTEXT,
-    detect_task_mode, get_mode_features, get_mode_context, should_validate_syntax,
+    TaskMode, ModeFeatures, TASK_MODE_CONFIG, TASK_MODE_CONTEXT, TASK_MODE_EMOJI,
+    detect_task_mode, detect_task_mode_batch, get_mode_features, get_mode_context, should_validate_syntax,
     MODE_DETECTION_KEYWORDS
 )
 from chainguard.models import ProjectState, ScopeDefinition
@@ -47,6 +47,11 @@ class TestTaskModeEnum:
         assert TaskMode.from_string("invalid") == TaskMode.PROGRAMMING
         assert TaskMode.from_string("") == TaskMode.PROGRAMMING
 
+    def test_from_string_returns_members(self):
+        """from_string returns the enum singletons, so `is` checks hold."""
+        assert TaskMode.from_string("CONTENT") is TaskMode.CONTENT
+        assert TaskMode.from_string("invalid") is TaskMode.PROGRAMMING
+
     def test_str_conversion(self):
         """Test string conversion."""
         assert str(TaskMode.PROGRAMMING) == "programming"
@@ -81,7 +86,7 @@ class TestModeFeatures:
     def test_devops_mode_features(self):
         """DevOps mode should validate only config files."""
         features = TASK_MODE_CONFIG[TaskMode.DEVOPS]
-        assert isinstance(features.syntax_validation, set)
+        assert isinstance(features.syntax_validation, frozenset)
         assert ".yaml" in features.syntax_validation
         assert ".json" in features.syntax_validation
         assert ".conf" in features.syntax_validation
@@ -103,6 +108,14 @@ class TestModeFeatures:
         assert features.http_testing is False
         assert features.scope_enforcement is False
 
+    def test_shared_config_is_read_only(self):
+        """Shared mode features and the mode table can't be mutated."""
+        from dataclasses import FrozenInstanceError
+        with pytest.raises(FrozenInstanceError):
+            TASK_MODE_CONFIG[TaskMode.CONTENT].word_count = False
+        with pytest.raises(TypeError):
+            TASK_MODE_CONFIG[TaskMode.CONTENT] = ModeFeatures()
+
 
 # =============================================================================
 # Auto-Detection Tests
@@ -137,6 +150,36 @@ class TestAutoDetection:
         assert detect_task_mode("Fix bug in user controller") == TaskMode.PROGRAMMING
         assert detect_task_mode("Random task description") == TaskMode.PROGRAMMING
 
+    def test_detect_mode_priority_and_substrings(self):
+        """Earlier modes win, and keywords match inside longer words."""
+        assert detect_task_mode("Write docs for the nginx server") == TaskMode.CONTENT
+        assert detect_task_mode("Deploy and analyse the setup") == TaskMode.DEVOPS
+        assert detect_task_mode("Konfiguriere den Proxy") == TaskMode.DEVOPS
+
+    def test_detect_content_from_markdown_dir(self, tmp_path):
+        """A markdown-heavy directory without code is a content project."""
+        for i in range(3):
+            (tmp_path / f"kapitel{i}.md").write_text("# Kapitel")
+        assert detect_task_mode("Fix it", str(tmp_path)) == TaskMode.CONTENT
+
+        for name in ("a.py", "b.js", "c.ts"):
+            (tmp_path / name).write_text("")
+        assert detect_task_mode("Fix it", str(tmp_path)) == TaskMode.PROGRAMMING
+
+    def test_detect_batch_matches_single(self, tmp_path):
+        """Batch detection agrees with per-description detection."""
+        for i in range(3):
+            (tmp_path / f"kapitel{i}.md").write_text("# Kapitel")
+        descriptions = ["Setup nginx server", "Fix it", "Market research", "Tidy up"]
+
+        assert detect_task_mode_batch(descriptions, str(tmp_path)) == [
+            detect_task_mode(d, str(tmp_path)) for d in descriptions
+        ]
+        assert detect_task_mode_batch(descriptions) == [
+            TaskMode.DEVOPS, TaskMode.PROGRAMMING, TaskMode.RESEARCH, TaskMode.PROGRAMMING
+        ]
+        assert detect_task_mode_batch([]) == []
+
 
 # =============================================================================
 # Syntax Validation Tests
@@ -171,6 +214,13 @@ class TestShouldValidateSyntax:
         assert should_validate_syntax(TaskMode.GENERIC, "anything.php") is False
         assert should_validate_syntax(TaskMode.GENERIC, "config.yaml") is False
 
+    def test_extension_lookup_edge_cases(self):
+        """Extensions match case-insensitively; dotfiles have no extension."""
+        assert should_validate_syntax(TaskMode.DEVOPS, "deploy/CONFIG.YAML") is True
+        assert should_validate_syntax(TaskMode.DEVOPS, "conf.d/site") is False
+        assert should_validate_syntax(TaskMode.DEVOPS, ".env") is False
+        assert should_validate_syntax("devops", "app.toml") is True
+
 
 # =============================================================================
 # Context Injection Tests
@@ -202,6 +252,13 @@ class TestContextInjection:
         assert "source" in context.lower() or "Quellen" in context
         assert "fact" in context.lower() or "Fakt" in context
 
+    def test_context_is_shared_constant(self):
+        """Repeated lookups return the same read-only module-level text."""
+        assert get_mode_context(TaskMode.CONTENT) is get_mode_context(TaskMode.CONTENT)
+        with pytest.raises(TypeError):
+            TASK_MODE_CONTEXT[TaskMode.CONTENT] = ""
+        assert set(TASK_MODE_EMOJI) == set(TaskMode)
+
 
 # =============================================================================
 # ProjectState Task Mode Tests
@@ -232,6 +289,18 @@ class TestProjectStateTaskMode:
         assert features.word_count is True
         assert features.syntax_validation is False
 
+    def test_get_features_shares_mode_instances(self):
+        """get_features hands out the per-mode singletons, no copies."""
+        states = [
+            ProjectState(project_id=str(i), project_name="t", project_path="/tmp/t",
+                         task_mode=mode)
+            for i, mode in enumerate(("content", "CONTENT", "devops", "unknown"))
+        ]
+        features = [state.get_features() for state in states]
+        assert features[0] is features[1] is TASK_MODE_CONFIG[TaskMode.CONTENT]
+        assert features[2] is TASK_MODE_CONFIG[TaskMode.DEVOPS]
+        assert features[3] is TASK_MODE_CONFIG[TaskMode.PROGRAMMING]
+
     def test_content_mode_methods(self):
         """Test content mode specific methods."""
         state = ProjectState(
@@ -289,6 +358,23 @@ class TestProjectStateTaskMode:
         assert len(state.facts) == 1
         assert state.facts[0]["confidence"] == "verified"
 
+    def test_mode_logs_are_trimmed_in_place(self):
+        """Logs keep only the newest entries without replacing the list."""
+        state = ProjectState(
+            project_id="test",
+            project_name="test",
+            project_path="/tmp/test",
+            task_mode="devops"
+        )
+        history = state.command_history
+        for i in range(60):
+            state.add_command(f"cmd {i}")
+
+        assert state.command_history is history
+        assert len(history) == 50
+        assert history[0]["cmd"] == "cmd 10"
+        assert history[-1]["cmd"] == "cmd 59"
+
     def test_mode_status_line(self):
         """Test mode-specific status line generation."""
         # Content mode
@@ -355,6 +441,16 @@ class TestStateMigration:
         assert state.sources == []
         assert state.facts == []
 
+    def test_migrated_states_do_not_share_containers(self):
+        """Defaults filled in on load are fresh per state, not a shared template."""
+        first = ProjectState.from_dict({"project_id": "a", "project_name": "a", "project_path": "/a"})
+        second = ProjectState.from_dict({"project_id": "b", "project_name": "b", "project_path": "/b"})
+
+        first.add_source("https://example.com")
+        first.set_chapter_status("Ch1", "done")
+        assert second.sources == []
+        assert second.chapter_status == {}
+
 
 # =============================================================================
 # HTTP Test Requirement Tests
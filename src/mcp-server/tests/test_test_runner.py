@@ -122,6 +122,21 @@ class TestTestResult:
         assert result.failed == 2
         assert result.framework == "jest"
 
+    def test_framework_is_interned(self):
+        """Loaded framework names share the interned string object."""
+        name = "".join(["ph", "punit"])
+        result = TestResult.from_dict({"framework": name})
+        assert result.framework is TestResult(framework="phpunit").framework
+
+    def test_dict_round_trip_covers_all_fields(self):
+        """to_dict lists every field and survives from_dict unchanged."""
+        from dataclasses import asdict
+        for obj in (TestConfig(command="pytest", timeout=30),
+                    TestResult(passed=2, error_lines=["FAILED x"])):
+            data = obj.to_dict()
+            assert data == asdict(obj)
+            assert type(obj).from_dict(data) == obj
+
 
 class TestOutputParser:
     """Tests for OutputParser."""
@@ -244,12 +259,41 @@ FAILED tests/test_main.py::test_something
         assert result.failed == 1
         assert result.framework == "pytest"
 
+    def test_parse_large_output_reads_summary_at_end(self):
+        """Counts come from the trailing summary of long output."""
+        output = "\n".join(
+            ["collected 120 items", "note: 7 passed in a previous run"]
+            + [f"tests/test_x.py::test_{i} PASSED" for i in range(500)]
+            + ["======= 2 failed, 498 passed in 3.21s ======="]
+        )
+        assert len(output) > OutputParser.SUMMARY_TAIL_LENGTH
+
+        result = OutputParser.parse(output, exit_code=1)
+
+        assert result.framework == "pytest"
+        assert result.passed == 498
+        assert result.failed == 2
+
+    def test_summary_tail_starts_at_line(self):
+        """The tail never starts in the middle of a line."""
+        output = "x" * 10 + "\n" + "1234 passed\n" * 1000
+        tail = OutputParser._summary_tail(output)
+        assert tail.startswith("1234 passed")
+        assert len(tail) <= OutputParser.SUMMARY_TAIL_LENGTH + len("1234 passed\n")
+
     # mocha tests
     def test_detect_mocha(self):
         """Test mocha detection."""
         output = "  3 passing (15ms)"
         assert OutputParser.detect_framework(output) == "mocha"
 
+    def test_detect_framework_priority(self):
+        """Earlier frameworks win when several indicators are present."""
+        output = "PHPUnit 10.0\n  3 passing (15ms)\n1 passed"
+        assert OutputParser.detect_framework(output) == "phpunit"
+        assert OutputParser.detect_framework("3 passing\n1 passed") == "mocha"
+        assert OutputParser.detect_framework("all good") == "generic"
+
     def test_parse_mocha_success(self):
         """Test parsing mocha success output."""
         output = """
@@ -314,6 +358,19 @@ AssertionError: Expected 200, got 401
         assert any("FAILED" in line or "AssertionError" in line
                    for line in result.error_lines)
 
+    def test_extract_error_lines_dedupes_and_caps(self):
+        """Error lines are unique, in order and capped."""
+        from chainguard.config import TEST_FAILED_LINES_MAX
+        output = "\n".join(
+            ["ok", "✗ broken", "✗ broken", "  at run (app.js:10:5)", "passed"]
+            + [f"FAILED test_{i}" for i in range(TEST_FAILED_LINES_MAX * 2)]
+        )
+        lines = OutputParser._extract_error_lines(output)
+
+        assert lines[:2] == ["✗ broken", "at run (app.js:10:5)"]
+        assert len(lines) == TEST_FAILED_LINES_MAX
+        assert len(set(lines)) == len(lines)
+
 
 class TestTestRunnerFormat:
     """Tests for TestRunner formatting methods."""
@@ -382,3 +439,39 @@ class TestTestRunnerFormat:
         assert "5/5" in status
         # Should include time indicator
         assert "s ago" in status or "m ago" in status or "h ago" in status
+
+
+class TestTestRunnerRun:
+    """Tests for executing test commands."""
+
+    def test_run_parses_output_and_times_run(self, tmp_path):
+        """A real command is parsed and gets a duration and timestamp."""
+        import sys
+        script = tmp_path / "fake_tests.py"
+        script.write_text("print('===== 3 passed in 0.01s =====')")
+        config = TestConfig(command=sys.executable, args=str(script))
+
+        result = TestRunner.run(config, str(tmp_path))
+
+        assert result.framework == "pytest"
+        assert result.passed == 3
+        assert result.success is True
+        assert result.duration >= 0
+        assert result.timestamp
+
+
+class TestFormatStatusAge:
+    """Tests for the run age shown by format_status."""
+
+    def test_age_counts_whole_days(self):
+        """Runs older than a day report total hours, not the remainder."""
+        from datetime import datetime, timedelta
+        result = TestResult(success=True, passed=1, total=1)
+        last_run = (datetime.now() - timedelta(days=1, minutes=5)).isoformat()
+
+        assert TestRunner.format_status(result, last_run) == "✓ 1/1 (24h ago)"
+
+    def test_invalid_timestamp_is_ignored(self):
+        """Unparseable timestamps leave out the age."""
+        result = TestResult(success=False, passed=0, total=2)
+        assert TestRunner.format_status(result, "not-a-date") == "✗ 0/2"
@@ -25,12 +25,22 @@ from chainguard.toon import (
     toon_alerts,
     estimate_tokens,
     compare_formats,
+    compare_formats_many,
     _needs_quoting,
     _escape_value,
     _inline_value,
 )
 
 
+_LONG_VALUE = "x" * 200
+
+
+@pytest.fixture(scope="session")
+def tabs_config():
+    """Tab-delimited TOONConfig (shared, read-only)."""
+    return TOONConfig(use_tabs=True)
+
+
 class TestTOONConfig:
     """Tests for TOONConfig dataclass."""
 
@@ -56,60 +66,43 @@ class TestTOONConfig:
 class TestHelperFunctions:
     """Tests for internal helper functions."""
 
-    def test_needs_quoting_empty(self):
-        assert _needs_quoting("") is False
-
-    def test_needs_quoting_simple(self):
-        assert _needs_quoting("hello") is False
-        assert _needs_quoting("Hello World") is False
-
-    def test_needs_quoting_with_comma(self):
-        assert _needs_quoting("hello, world") is True
-
-    def test_needs_quoting_with_newline(self):
-        assert _needs_quoting("hello\nworld") is True
-
-    def test_needs_quoting_with_whitespace(self):
-        assert _needs_quoting(" hello") is True
-        assert _needs_quoting("hello ") is True
-
-    def test_needs_quoting_custom_delimiter(self):
-        assert _needs_quoting("hello;world", ";") is True
-        assert _needs_quoting("hello,world", ";") is False
-
-    def test_escape_value_none(self):
-        assert _escape_value(None) == ""
-
-    def test_escape_value_bool(self):
-        assert _escape_value(True) == "true"
-        assert _escape_value(False) == "false"
-
-    def test_escape_value_numbers(self):
-        assert _escape_value(42) == "42"
-        assert _escape_value(3.14) == "3.14"
-        assert _escape_value(-5) == "-5"
-
-    def test_escape_value_string(self):
-        assert _escape_value("hello") == "hello"
-        assert _escape_value("hello, world") == '"hello, world"'
-
-    def test_escape_value_with_quotes(self):
+    @pytest.mark.parametrize("value,delimiter,expected", [
+        pytest.param("", ",", False, id="empty"),
+        pytest.param("hello", ",", False, id="simple"),
+        pytest.param("Hello World", ",", False, id="inner-space"),
+        pytest.param("hello, world", ",", True, id="comma"),
+        pytest.param("hello\nworld", ",", True, id="newline"),
+        pytest.param(" hello", ",", True, id="leading-space"),
+        pytest.param("hello ", ",", True, id="trailing-space"),
+        pytest.param("hello;world", ";", True, id="custom-delimiter"),
+        pytest.param("hello,world", ";", False, id="comma-with-custom-delimiter"),
+    ])
+    def test_needs_quoting(self, value, delimiter, expected):
+        assert _needs_quoting(value, delimiter) is expected
+
+    @pytest.mark.parametrize("value,expected", [
+        pytest.param(None, "", id="none"),
+        pytest.param(True, "true", id="true"),
+        pytest.param(False, "false", id="false"),
+        pytest.param(42, "42", id="int"),
+        pytest.param(3.14, "3.14", id="float"),
+        pytest.param(-5, "-5", id="negative"),
+        pytest.param("hello", "hello", id="string"),
+        pytest.param("hello, world", '"hello, world"', id="comma"),
         # Quotes alone don't trigger quoting, only commas/newlines do
-        result = _escape_value('say "hello"')
-        assert result == 'say "hello"'  # No quoting needed
-        # But with comma, it gets quoted
-        result2 = _escape_value('say, "hello"')
-        assert result2 == '"say, ""hello"""'
-
-    def test_inline_value_list(self):
-        assert _inline_value([1, 2, 3]) == "[1,2,3]"
+        pytest.param('say "hello"', 'say "hello"', id="quotes"),
+        pytest.param('say, "hello"', '"say, ""hello"""', id="quotes-and-comma"),
+    ])
+    def test_escape_value(self, value, expected):
+        assert _escape_value(value) == expected
 
-    def test_inline_value_dict(self):
-        assert _inline_value({"a": 1}) == "{a:1}"
-
-    def test_inline_value_nested(self):
-        result = _inline_value({"items": [1, 2]})
-        assert result == "{items:[1,2]}"
+    @pytest.mark.parametrize("value,expected", [
+        pytest.param([1, 2, 3], "[1,2,3]", id="list"),
+        pytest.param({"a": 1}, "{a:1}", id="dict"),
+        pytest.param({"items": [1, 2]}, "{items:[1,2]}", id="nested"),
+    ])
+    def test_inline_value(self, value, expected):
+        assert _inline_value(value) == expected
 
 
 class TestToonArray:
@@ -157,10 +150,9 @@ class TestToonArray:
         result = toon_array("flags", data)
         assert "true,false" in result
 
-    def test_array_with_tabs_config(self):
-        config = TOONConfig(use_tabs=True)
+    def test_array_with_tabs_config(self, tabs_config):
         data = [{"a": 1, "b": 2}]
-        result = toon_array("items", data, config=config)
+        result = toon_array("items", data, config=tabs_config)
         assert "\t" in result
 
 
@@ -239,8 +231,16 @@ class TestEncodeToon:
 class TestConvenienceFunctions:
     """Tests for Chainguard-specific convenience functions."""
 
-    def test_toon_files_empty(self):
-        assert toon_files([]) == "files[0]{}:"
+    @pytest.mark.parametrize("encode,expected", [
+        pytest.param(toon_files, "files[0]{}:", id="files"),
+        pytest.param(toon_tables, "tables[0]{}:", id="tables"),
+        pytest.param(toon_history, "history[0]{}:", id="history"),
+        pytest.param(toon_projects, "projects[0]{}:", id="projects"),
+        pytest.param(toon_criteria, "criteria[0]{}:", id="criteria"),
+        pytest.param(toon_alerts, "alerts: []", id="alerts"),
+    ])
+    def test_empty(self, encode, expected):
+        assert encode([]) == expected
 
     def test_toon_files(self):
         files = [
@@ -251,9 +251,6 @@ class TestConvenienceFunctions:
         assert "files[2]{name,status,action}:" in result
         assert "auth.php,changed,edit" in result
 
-    def test_toon_tables_empty(self):
-        assert toon_tables([]) == "tables[0]{}:"
-
     def test_toon_tables(self):
         tables = [
             {"name": "users", "columns": 5, "rows": 100},
@@ -263,9 +260,6 @@ class TestConvenienceFunctions:
         assert "tables[2]{name,columns,rows}:" in result
         assert "users,5,100" in result
 
-    def test_toon_history_empty(self):
-        assert toon_history([]) == "history[0]{}:"
-
     def test_toon_history(self):
         entries = [
             {"time": "10:00", "file": "auth.php", "action": "edit", "status": "ok"},
@@ -273,9 +267,6 @@ class TestConvenienceFunctions:
         result = toon_history(entries)
         assert "history[1]{time,file,action,status}:" in result
 
-    def test_toon_projects_empty(self):
-        assert toon_projects([]) == "projects[0]{}:"
-
     def test_toon_projects(self):
         projects = [
             {"id": "abc123", "path": "/app", "phase": "impl", "files": 5},
@@ -283,9 +274,6 @@ class TestConvenienceFunctions:
         result = toon_projects(projects)
         assert "projects[1]{id,path,phase,files}:" in result
 
-    def test_toon_criteria_empty(self):
-        assert toon_criteria([]) == "criteria[0]{}:"
-
     def test_toon_criteria(self):
         criteria = [
             {"criterion": "Tests pass", "fulfilled": True},
@@ -296,9 +284,6 @@ class TestConvenienceFunctions:
         assert "Tests pass,true" in result
         assert "Docs updated,false" in result
 
-    def test_toon_alerts_empty(self):
-        assert toon_alerts([]) == "alerts: []"
-
     def test_toon_alerts(self):
         alerts = ["Error 1", "Warning 2"]
         result = toon_alerts(alerts)
@@ -338,6 +323,16 @@ class TestTokenUtilities:
         # TOON should save at least 30% on uniform arrays
         assert result["savings_percent"] >= 30
 
+    def test_compare_formats_many(self):
+        users = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+        tables = [{"name": "users", "rows": 10}, {"name": "posts", "rows": 20}]
+        results = compare_formats_many({"users": users, "tables": tables})
+
+        assert list(results) == ["users", "tables"]
+        assert results["users"] == compare_formats(users, "users")
+        assert results["tables"] == compare_formats(tables, "tables")
+        assert compare_formats_many({}) == {}
+
 
 class TestEdgeCases:
     """Tests for edge cases and special scenarios."""
@@ -359,10 +354,9 @@ class TestEdgeCases:
         assert "123,test" in result
 
     def test_very_long_values(self):
-        long_value = "x" * 200
-        data = [{"desc": long_value}]
+        data = [{"desc": _LONG_VALUE}]
         result = toon_array("items", data)
-        assert long_value in result
+        assert _LONG_VALUE in result
 
     def test_special_characters_in_values(self):
         data = [{"formula": "a + b = c", "regex": ".*"}]
@@ -390,58 +384,89 @@ class TestEdgeCases:
         assert "host: localhost" in result
 
 
+# Real-world datasets, built once at import and shared by the scenario
+# tests. The encoders only read their input (see test_encoders_do_not_mutate),
+# and they need plain lists/dicts, so these are not frozen further.
+_DB_TABLES = [
+    {"name": "users", "columns": 5, "rows": 1000},
+    {"name": "posts", "columns": 8, "rows": 5000},
+    {"name": "comments", "columns": 4, "rows": 15000},
+]
+
+_EDIT_HISTORY = [
+    {"time": "10:00:01", "file": "Controller.php", "action": "edit", "status": "ok"},
+    {"time": "10:00:15", "file": "Model.php", "action": "edit", "status": "ok"},
+    {"time": "10:00:30", "file": "View.php", "action": "create", "status": "ok"},
+    {"time": "10:00:45", "file": "Routes.php", "action": "edit", "status": "error"},
+]
+
+_CONTEXT = {
+    "project": "myapp",
+    "phase": "implementation",
+    "scope": {
+        "description": "Build user authentication",
+        "modules": ["auth", "users"],
+    },
+    "files": [
+        {"name": "auth.php", "status": "changed", "action": "edit"},
+        {"name": "login.php", "status": "new", "action": "create"},
+    ],
+    "criteria": [
+        {"criterion": "Login works", "fulfilled": True},
+        {"criterion": "Logout works", "fulfilled": False},
+    ]
+}
+
+
 class TestRealWorldScenarios:
     """Tests simulating real Chainguard use cases."""
 
     def test_db_schema_output(self):
         """Simulate chainguard_db_schema output."""
-        tables = [
-            {"name": "users", "columns": 5, "rows": 1000},
-            {"name": "posts", "columns": 8, "rows": 5000},
-            {"name": "comments", "columns": 4, "rows": 15000},
-        ]
-        result = toon_tables(tables)
-        comparison = compare_formats(tables, "tables")
+        result = toon_tables(_DB_TABLES)
+        comparison = compare_formats(_DB_TABLES, "tables")
 
         assert "tables[3]" in result
         assert comparison["savings_percent"] >= 35  # ~39% typical
 
     def test_history_output(self):
         """Simulate chainguard_history output."""
-        history = [
-            {"time": "10:00:01", "file": "Controller.php", "action": "edit", "status": "ok"},
-            {"time": "10:00:15", "file": "Model.php", "action": "edit", "status": "ok"},
-            {"time": "10:00:30", "file": "View.php", "action": "create", "status": "ok"},
-            {"time": "10:00:45", "file": "Routes.php", "action": "edit", "status": "error"},
-        ]
-        result = toon_history(history)
-        comparison = compare_formats(history, "history")
+        result = toon_history(_EDIT_HISTORY)
+        comparison = compare_formats(_EDIT_HISTORY, "history")
 
         assert "history[4]" in result
         assert comparison["savings_percent"] > 40
 
     def test_context_output(self):
         """Simulate chainguard_context output."""
-        context = {
-            "project": "myapp",
-            "phase": "implementation",
-            "scope": {
-                "description": "Build user authentication",
-                "modules": ["auth", "users"],
-            },
-            "files": [
-                {"name": "auth.php", "status": "changed", "action": "edit"},
-                {"name": "login.php", "status": "new", "action": "create"},
-            ],
-            "criteria": [
-                {"criterion": "Login works", "fulfilled": True},
-                {"criterion": "Logout works", "fulfilled": False},
-            ]
-        }
-        result = encode_toon(context, "context")
+        result = encode_toon(_CONTEXT, "context")
 
         assert "project: myapp" in result
         assert "phase: implementation" in result
         # Arrays should be in tabular format
         assert "files[2]" in result
         assert "criteria[2]" in result
+
+    def test_encoders_do_not_mutate(self):
+        """The shared datasets survive encoding unchanged."""
+        import copy
+        snapshot = copy.deepcopy((_DB_TABLES, _EDIT_HISTORY, _CONTEXT))
+
+        toon_tables(_DB_TABLES)
+        toon_history(_EDIT_HISTORY)
+        encode_toon(_CONTEXT, "context")
+        compare_formats(_CONTEXT, "context")
+
+        assert (_DB_TABLES, _EDIT_HISTORY, _CONTEXT) == snapshot
+
+
+class TestPerformance:
+    """Encoder throughput (timed with pytest-benchmark)."""
+
+    @pytest.mark.benchmark(max_time=0.5)
+    def test_encode_long_values_fast(self, benchmark):
+        """Benchmark a 100-row table with long cell values."""
+        rows = [{"id": i, "desc": _LONG_VALUE, "status": "ok"} for i in range(100)]
+
+        result = benchmark(toon_array, "items", rows)
+        assert result.startswith("items[100]{id,desc,status}:")
@@ -8,6 +8,18 @@ import pytest
 from pathlib import Path
 from chainguard.utils import sanitize_path, is_path_safe
 
+# NUL character in path is invalid on most systems
+_BAD_PATH = "\x00invalid"
+
+
+@pytest.mark.parametrize("fn,expected", [
+    (sanitize_path, None),
+    (is_path_safe, False),
+], ids=["sanitize_path", "is_path_safe"])
+def test_bad_path(fn, expected, temp_dir):
+    """Test that paths raising OSError/ValueError are rejected."""
+    assert fn(_BAD_PATH, str(temp_dir)) is expected
+
 
 class TestSanitizePath:
     """Tests for sanitize_path function."""
@@ -68,13 +80,6 @@ class TestSanitizePath:
         assert result is not None
         assert result == str(outside_file.resolve())
 
-    def test_invalid_path(self):
-        """Test that invalid paths return None."""
-        # Use a path that will cause an OSError or ValueError
-        # NUL character in path is invalid on most systems
-        result = sanitize_path("\x00invalid", "/some/project")
-        assert result is None
-
     def test_path_with_traversal_resolved(self, temp_dir):
         """Test that path traversal is resolved correctly."""
         project_path = str(temp_dir)
@@ -159,8 +164,8 @@ class TestIsPathSafe:
         project_path = str(temp_dir)
 
         # NUL character should cause exception and return False
-        result = is_path_safe("\x00invalid/path", project_path)
-        assert result is False
+        assert is_path_safe("../" + _BAD_PATH, project_path) is False
+        assert is_path_safe("file.py", project_path + "\x00") is False
 
     def test_relative_path_without_traversal(self, temp_dir):
         """Test relative path without traversal."""
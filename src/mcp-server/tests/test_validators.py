@@ -7,17 +7,14 @@ Tests cover:
 - Command execution including timeout handling
 """
 
+import os
 import pytest
 import json
 import tempfile
 import asyncio
-from pathlib import Path
 from unittest.mock import patch, AsyncMock, MagicMock
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from chainguard.validators import SyntaxValidator
+from chainguard.validators import SyntaxValidator, _VALIDATORS_BY_EXTENSION
 
 
 # =============================================================================
@@ -95,6 +92,36 @@ class TestSyntaxValidator:
         assert result["errors"] == []
         assert result["checked"] == ".xyz"
 
+    @pytest.mark.asyncio
+    async def test_validate_file_skipped_without_stat(self, tmp_path):
+        """Test that unchecked file types return before touching the disk."""
+        with patch.object(SyntaxValidator, '_cache') as cache_mock, \
+                patch('chainguard.validators.Path.stat') as stat_mock:
+            for name in ("notes.xyz", "view.blade.php"):
+                result = await SyntaxValidator.validate_file(name, str(tmp_path))
+                assert result["valid"] is True
+            stat_mock.assert_not_called()
+            cache_mock.get.assert_not_called()
+
+    def test_validator_table_points_to_methods(self):
+        """Test that every dispatched extension has a check method."""
+        for ext, name in _VALIDATORS_BY_EXTENSION.items():
+            assert ext == ext.lower()
+            assert callable(getattr(SyntaxValidator, name))
+
+    @pytest.mark.asyncio
+    async def test_validate_file_too_large_skipped(self, tmp_path):
+        """Test that files above the size limit are not parsed."""
+        json_file = tmp_path / "package-lock.json"
+        json_file.write_text('{"broken": ' + " " * 64)
+
+        with patch('chainguard.validators.SYNTAX_CHECK_MAX_FILE_BYTES', 32):
+            result = await SyntaxValidator.validate_file(str(json_file), str(tmp_path))
+            batch = await SyntaxValidator.validate_files(["package-lock.json"], str(tmp_path))
+
+        assert result == {"valid": True, "errors": [], "checked": ".json (too large)"}
+        assert batch["package-lock.json"] == result
+
     @pytest.mark.asyncio
     async def test_validate_file_no_extension(self, tmp_path):
         """Test file without extension."""
@@ -180,6 +207,271 @@ class TestSyntaxValidator:
             mock_cmd.assert_not_called()
             assert result["valid"] is True
 
+    @pytest.mark.asyncio
+    async def test_validate_files_batch_php(self, tmp_path):
+        """Test that PHP 8.3+ lints all PHP files with one php -l call."""
+        good = tmp_path / "good.php"
+        bad = tmp_path / "bad.php"
+        good.write_text("<?php\necho 'hello';\n")
+        bad.write_text("<?php\necho 'hello'\n")
+        (tmp_path / "data.json").write_text('{"key": "value"}')
+
+        with patch.object(SyntaxValidator, '_php_multi_lint', True), \
+                patch('chainguard.validators.PHPSTAN_ENABLED', False), \
+                patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {
+                "returncode": 255,
+                "stdout": (
+                    f"No syntax errors detected in {good}\n"
+                    f"PHP Parse error:  syntax error, unexpected end of file in {bad} on line 3\n"
+                    f"Errors parsing {bad}\n"
+                ),
+                "stderr": ""
+            }
+
+            results = await SyntaxValidator.validate_files(
+                ["good.php", "bad.php", "data.json"],
+                str(tmp_path)
+            )
+
+            mock_cmd.assert_called_once_with(["php", "-l", str(good), str(bad)])
+            assert results["good.php"]["valid"] is True
+            assert results["bad.php"]["valid"] is False
+            assert results["bad.php"]["errors"][0]["type"] == "PHP Syntax"
+            assert "Parse error" in results["bad.php"]["errors"][0]["message"]
+            assert results["data.json"]["valid"] is True
+
+    @pytest.mark.asyncio
+    async def test_validate_files_php_non_utf8_output(self, tmp_path, monkeypatch):
+        """Test that non-UTF-8 linter output does not crash the batch run."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        fake_php = bin_dir / "php"
+        fake_php.write_text(
+            "#!/bin/sh\n"
+            'if [ "$1" = "-r" ]; then echo 80300; exit 0; fi\n'
+            "printf 'No syntax errors detected in %s\\n' \"$2\"\n"
+            "printf 'PHP Parse error:  unexpected \\351 in %s on line 2\\n' \"$3\"\n"
+            "printf 'Errors parsing %s\\n' \"$3\"\n"
+            "exit 255\n"
+        )
+        fake_php.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        for name in ("a.php", "b.php"):
+            (tmp_path / name).write_text("<?php\n")
+
+        SyntaxValidator._refresh_tools()
+        try:
+            with patch('chainguard.validators.PHPSTAN_ENABLED', False):
+                results = await SyntaxValidator.validate_files(["a.php", "b.php"], str(tmp_path))
+        finally:
+            SyntaxValidator._refresh_tools()
+
+        assert results["a.php"]["valid"] is True
+        assert results["b.php"]["valid"] is False
+        assert "\ufffd" in results["b.php"]["errors"][0]["message"]
+
+    @pytest.mark.asyncio
+    async def test_validate_files_php_unmatched_output_rechecked(self, tmp_path):
+        """Test that files the batch output does not mention are linted per file."""
+        for name in ("a.php", "b.php"):
+            (tmp_path / name).write_text("<?php\n")
+
+        with patch.object(SyntaxValidator, '_php_multi_lint', True), \
+                patch('chainguard.validators.PHPSTAN_ENABLED', False), \
+                patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.side_effect = [
+                {"returncode": 1, "stdout": "Could not open input file: a.php", "stderr": ""},
+                {"returncode": 0, "stdout": "No syntax errors", "stderr": ""},
+                {"returncode": 255, "stdout": "", "stderr": "Parse error: oops in b.php on line 1"},
+            ]
+
+            results = await SyntaxValidator.validate_files(["a.php", "b.php"], str(tmp_path))
+
+            assert mock_cmd.call_count == 3
+            assert results["a.php"]["valid"] is True
+            assert results["b.php"]["errors"][0]["message"] == "Parse error: oops"
+
+    @pytest.mark.asyncio
+    async def test_validate_files_batch_error_falls_back(self, tmp_path):
+        """Test that an unexpected batch failure falls back to per-file checks."""
+        for name in ("a.php", "b.php"):
+            (tmp_path / name).write_text("<?php\n")
+
+        with patch.object(SyntaxValidator, '_php_multi_lint', True), \
+                patch('chainguard.validators.PHPSTAN_ENABLED', False), \
+                patch.object(SyntaxValidator, '_validate_php_batch',
+                             AsyncMock(side_effect=UnicodeDecodeError("utf-8", b"", 0, 1, "bad"))), \
+                patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {"returncode": 0, "stdout": "", "stderr": ""}
+
+            results = await SyntaxValidator.validate_files(["a.php", "b.php"], str(tmp_path))
+
+            assert mock_cmd.call_count == 2
+            assert all(r["valid"] for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_validate_files_bounded_concurrency(self, tmp_path):
+        """Test that validate_files fans out but respects the concurrency cap."""
+        names = [f"f{i}.js" for i in range(100)]
+        for name in names:
+            (tmp_path / name).write_text("const x = 1;")
+
+        running = peak = 0
+
+        async def fake_run(cmd):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return {"returncode": 0, "stdout": "", "stderr": ""}
+
+        with patch.object(SyntaxValidator, '_run_command', side_effect=fake_run):
+            results = await SyntaxValidator.validate_files(names, str(tmp_path), concurrency=8)
+
+        assert list(results) == names
+        assert all(r["valid"] for r in results.values())
+        assert 1 < peak <= 8
+
+    @pytest.mark.asyncio
+    async def test_validate_files_batch_typescript(self, tmp_path):
+        """Test that TypeScript files are checked with a single tsc run."""
+        for name in ("a.ts", "b.ts", "c.tsx"):
+            (tmp_path / name).write_text("let x = 1;")
+        a_rel = os.path.relpath(tmp_path / "a.ts")
+
+        with patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {
+                "returncode": 2,
+                "stdout": (
+                    f"{a_rel}(1,5): error TS2322: Type 'string' is not assignable to type 'number'.\n"
+                    f"{a_rel}(2,1): error TS1005: ';' expected.\n"
+                    f"{tmp_path / 'c.tsx'}(3,7): error TS1109: Expression expected.\n"
+                ),
+                "stderr": ""
+            }
+
+            results = await SyntaxValidator.validate_files(["a.ts", "b.ts", "c.tsx"], str(tmp_path))
+
+            assert mock_cmd.call_count == 1
+            assert results["a.ts"]["errors"][0]["message"].startswith("error TS2322")
+            assert results["b.ts"]["valid"] is True
+            assert results["c.tsx"]["errors"][0]["message"] == "error TS1109: Expression expected."
+            assert results["c.tsx"]["checked"] == ".tsx"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stdout", [
+        "error TS5023: Unknown compiler option '--foo'.\n",
+        "lib/other.ts(1,1): error TS2304: Cannot find name 'y'.\n",
+        "{b}(1,5): error TS2451: Cannot redeclare block-scoped variable 'x'.\n",
+    ], ids=["no-file", "outside-batch", "cross-file-redeclare"])
+    async def test_validate_files_typescript_unmappable_falls_back(self, tmp_path, stdout):
+        """Test that batch tsc errors not attributable per file trigger per-file runs."""
+        for name in ("a.ts", "b.ts"):
+            (tmp_path / name).write_text("let x = 1;")
+
+        with patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.side_effect = [
+                {"returncode": 2, "stdout": stdout.format(b=tmp_path / "b.ts"), "stderr": ""},
+                {"returncode": 0, "stdout": "", "stderr": ""},
+                {"returncode": 0, "stdout": "", "stderr": ""},
+            ]
+
+            results = await SyntaxValidator.validate_files(["a.ts", "b.ts"], str(tmp_path))
+
+            assert mock_cmd.call_count == 3
+            assert all(r["valid"] for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_validate_files_typescript_falls_back_without_tsc(self, tmp_path):
+        """Test that a failed batch tsc run falls back to per-file checks."""
+        for name in ("a.ts", "b.ts"):
+            (tmp_path / name).write_text("let x = 1;")
+
+        with patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {"returncode": -1, "stdout": "", "stderr": "Command not found"}
+
+            results = await SyntaxValidator.validate_files(["a.ts", "b.ts"], str(tmp_path))
+
+            assert mock_cmd.call_count == 3
+            assert all(r["valid"] for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_validate_files_php_fallback(self, tmp_path):
+        """Test that older PHP versions lint each file separately."""
+        for name in ("a.php", "b.php"):
+            (tmp_path / name).write_text("<?php\necho 'hello';\n")
+
+        with patch.object(SyntaxValidator, '_php_multi_lint', False), \
+                patch('chainguard.validators.PHPSTAN_ENABLED', False), \
+                patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {"returncode": 0, "stdout": "No syntax errors", "stderr": ""}
+
+            results = await SyntaxValidator.validate_files(["a.php", "b.php"], str(tmp_path))
+
+            assert mock_cmd.call_count == 2
+            assert all(r["valid"] for r in results.values())
+            assert set(results) == {"a.php", "b.php"}
+
+    @pytest.mark.asyncio
+    async def test_validate_file_cached_until_changed(self, tmp_path):
+        """Test that unchanged files are served from the validation cache."""
+        js_file = tmp_path / "app.js"
+        js_file.write_text("const x = 1;")
+
+        with patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {"returncode": 0, "stdout": "", "stderr": ""}
+
+            first = await SyntaxValidator.validate_file(str(js_file), str(tmp_path))
+            first["errors"].append({"type": "X", "message": "mutated"})
+            second = await SyntaxValidator.validate_file(str(js_file), str(tmp_path))
+            assert mock_cmd.call_count == 1
+            assert second == {"valid": True, "errors": [], "checked": ".js"}
+
+            js_file.write_text("const x = 1; const y = 2;")
+            await SyntaxValidator.validate_file(str(js_file), str(tmp_path))
+            assert mock_cmd.call_count == 2
+
+            SyntaxValidator.cache_clear()
+            await SyntaxValidator.validate_file(str(js_file), str(tmp_path))
+            assert mock_cmd.call_count == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name,content,phpstan", [
+        ("app.ts", "let x = 1;", False),
+        ("clean.php", "<?php\necho 1;\n", True),
+    ])
+    async def test_validate_file_cross_file_checks_not_cached(self, tmp_path, name, content, phpstan):
+        """Test that tsc and PHPStan results (which depend on other files) are re-run."""
+        source = tmp_path / name
+        source.write_text(content)
+
+        with patch('chainguard.validators.PHPSTAN_ENABLED', phpstan), \
+                patch.object(SyntaxValidator, '_run_phpstan',
+                             AsyncMock(return_value={"available": False, "errors": []})) as stan_mock, \
+                patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {"returncode": 0, "stdout": "", "stderr": ""}
+
+            await SyntaxValidator.validate_file(str(source), str(tmp_path))
+            await SyntaxValidator.validate_file(str(source), str(tmp_path))
+
+            assert mock_cmd.call_count == 2
+            assert stan_mock.await_count == (2 if phpstan else 0)
+
+    @pytest.mark.asyncio
+    async def test_validate_file_timeout_not_cached(self, tmp_path):
+        """Test that timeouts are re-checked instead of cached."""
+        js_file = tmp_path / "slow.js"
+        js_file.write_text("const x = 1;")
+
+        with patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            mock_cmd.return_value = {"returncode": -1, "stdout": "", "stderr": "Timeout"}
+
+            await SyntaxValidator.validate_file(str(js_file), str(tmp_path))
+            await SyntaxValidator.validate_file(str(js_file), str(tmp_path))
+            assert mock_cmd.call_count == 2
+
     @pytest.mark.asyncio
     async def test_validate_js_valid(self, tmp_path):
         """Test validation of valid JavaScript file."""
@@ -270,6 +562,40 @@ class TestSyntaxValidator:
             assert len(result["errors"]) == 1
             assert result["errors"][0]["type"] == "Python Syntax"
 
+    @pytest.mark.asyncio
+    async def test_validate_python_in_process(self, tmp_path):
+        """Test that Python files are compiled without spawning a process."""
+        py_file = tmp_path / "broken.py"
+        py_file.write_text("x = 1\nif x\n    pass\n")
+
+        with patch.object(SyntaxValidator, '_run_command', new_callable=AsyncMock) as mock_cmd:
+            result = await SyntaxValidator.validate_file(str(py_file), str(tmp_path))
+
+            mock_cmd.assert_not_called()
+            assert result["valid"] is False
+            assert "SyntaxError" in result["errors"][0]["message"]
+            assert "line 2" in result["errors"][0]["message"]
+            assert not (tmp_path / "__pycache__").exists()
+
+    @pytest.mark.parametrize("source,error_type", [
+        ("def f():\nreturn 1\n", "IndentationError"),
+        ("x = 1\0\n", "SyntaxError"),
+    ], ids=["indentation", "nul-byte"])
+    def test_compile_python_error_through_extractor(self, tmp_path, source, error_type):
+        """Test that compile() errors are formatted by _extract_python_error."""
+        py_file = tmp_path / "bad.py"
+        py_file.write_text(source)
+
+        with patch.object(
+            SyntaxValidator, '_extract_python_error',
+            wraps=SyntaxValidator._extract_python_error
+        ) as mock_extract:
+            error = SyntaxValidator._compile_python(py_file)
+
+        mock_extract.assert_called_once()
+        assert error.startswith(error_type)
+        assert len(error) <= 100
+
     @pytest.mark.asyncio
     async def test_validate_typescript_valid(self, tmp_path):
         """Test validation of valid TypeScript file."""
@@ -370,6 +696,13 @@ class TestExtractErrors:
         assert "Fatal error" in result
         assert "/path/to/file.php" not in result
 
+    def test_extract_php_error_keeps_inner_in(self):
+        """Test that only the trailing file location is stripped."""
+        output = ("Fatal error: Cannot redeclare foo() (previously declared in /a.php:3) "
+                  "in /path/to/b.php on line 10")
+        result = SyntaxValidator._extract_php_error(output)
+        assert result == "Fatal error: Cannot redeclare foo() (previously declared in /a.php:3)"
+
     def test_extract_php_error_syntax_error(self):
         """Test extraction of generic syntax error."""
         output = "syntax error, unexpected T_STRING in /path/file.php on line 5"
@@ -477,6 +810,18 @@ SyntaxError: unexpected EOF while parsing"""
         result = SyntaxValidator._extract_python_error(output)
         assert result == output.strip()[:100]
 
+    def test_extract_python_error_after_long_preamble(self):
+        """Test that errors after many leading lines are still found."""
+        output = "\n".join(["DeprecationWarning: old API"] * 50 + ["SyntaxError: invalid syntax"])
+        result = SyntaxValidator._extract_python_error(output)
+        assert result == "SyntaxError: invalid syntax"
+
+    def test_extract_python_error_file_line_case_insensitive(self):
+        """Test that mixed-case File/Line markers are matched."""
+        output = "warning\n  FILE \"x.py\", LINE 3\n"
+        result = SyntaxValidator._extract_python_error(output)
+        assert result == 'FILE "x.py", LINE 3'
+
     def test_extract_ts_error_basic(self):
         """Test extraction of TypeScript error."""
         output = "file.ts(1,10): error TS1109: Expression expected."
@@ -539,6 +884,33 @@ class TestRunCommand:
         assert result["stderr"] == "Command not found"
         assert result["stdout"] == ""
 
+    @pytest.mark.asyncio
+    async def test_run_command_not_executable(self, tmp_path):
+        """Test that other OS errors (permission denied) are reported, not raised."""
+        script = tmp_path / "linter"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o644)
+
+        result = await SyntaxValidator._run_command([str(script)])
+        assert result["returncode"] == -1
+        assert result["stderr"].startswith("Command failed:")
+
+    @pytest.mark.asyncio
+    async def test_run_command_remembers_missing_tool(self):
+        """Test that a missing executable is not spawned again until refreshed."""
+        SyntaxValidator._refresh_tools()
+        with patch('asyncio.create_subprocess_exec',
+                   AsyncMock(side_effect=FileNotFoundError)) as exec_mock:
+            first = await SyntaxValidator._run_command(["no_such_linter", "a.php"])
+            second = await SyntaxValidator._run_command(["no_such_linter", "b.php"])
+            assert first == second == {"returncode": -1, "stdout": "", "stderr": "Command not found"}
+            assert exec_mock.call_count == 1
+
+            SyntaxValidator._refresh_tools()
+            await SyntaxValidator._run_command(["no_such_linter", "c.php"])
+            assert exec_mock.call_count == 2
+        SyntaxValidator._refresh_tools()
+
     @pytest.mark.asyncio
     async def test_run_command_timeout(self):
         """Test timeout handling."""
@@ -551,6 +923,21 @@ class TestRunCommand:
             assert result["returncode"] == -1
             assert result["stderr"] == "Timeout"
 
+    @pytest.mark.asyncio
+    async def test_run_command_timeout_kills_process(self):
+        """Test that a timed-out command is killed and reaped."""
+        proc = MagicMock()
+        proc.communicate = MagicMock(return_value=asyncio.sleep(10))
+        proc.wait = AsyncMock()
+
+        with patch('chainguard.validators.SYNTAX_CHECK_TIMEOUT_SECONDS', 0.01), \
+                patch('asyncio.create_subprocess_exec', AsyncMock(return_value=proc)):
+            result = await SyntaxValidator._run_command(["sleep", "10"])
+
+        assert result["stderr"] == "Timeout"
+        proc.kill.assert_called_once()
+        proc.wait.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_run_command_success(self):
         """Test successful command execution."""
@@ -631,6 +1018,31 @@ class TestValidationIntegration:
         )
         assert result["valid"] is False
 
+    @pytest.mark.asyncio
+    async def test_json_accepted_by_stdlib_only(self, tmp_path):
+        """Test that JSON the stdlib accepts stays valid with orjson installed."""
+        json_file = tmp_path / "big.json"
+        json_file.write_text('{"big": 123456789012345678901234567890, "n": NaN}')
+
+        result = await SyntaxValidator.validate_file(
+            str(json_file),
+            str(tmp_path)
+        )
+        assert result["valid"] is True
+
+    @pytest.mark.asyncio
+    async def test_json_with_utf8_bom_fails(self, tmp_path):
+        """Test that a UTF-8 BOM is still reported when reading raw bytes."""
+        json_file = tmp_path / "bom.json"
+        json_file.write_bytes(b'\xef\xbb\xbf{"key": "value"}')
+
+        result = await SyntaxValidator.validate_file(
+            str(json_file),
+            str(tmp_path)
+        )
+        assert result["valid"] is False
+        assert "BOM" in result["errors"][0]["message"]
+
     @pytest.mark.asyncio
     async def test_json_array(self, tmp_path):
         """Test JSON array is valid."""